@@ -9,8 +9,16 @@ https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "it_company_task_manager.settings")
+# Read by the database settings; see DATABASE_POOL.
+os.environ.setdefault("DJANGO_SERVER", "asgi")
 
 application = get_asgi_application()
+
+if settings.TEMPLATE_PREWARM:
+    from task_manager.templating import warm_templates
+
+    warm_templates()
@@ -40,17 +40,21 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "task_manager.apps.TaskManagerConfig",
     "debug_toolbar",
 ]
 
 MIDDLEWARE = [
+    "task_manager.middleware.QueryMetricsMiddleware",
+    "task_manager.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "task_manager.middleware.TaskEventMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
@@ -74,24 +78,135 @@ TEMPLATES = [
     },
 ]
 
+# "production" parses each template once per process with the cached
+# loader and compiles them all when a worker boots (see wsgi.py/asgi.py);
+# "development" picks up edits to templates on the next request.
+TEMPLATE_MODE = os.getenv(
+    "DJANGO_TEMPLATE_MODE", "development" if DEBUG else "production"
+)
+TEMPLATE_PREWARM = TEMPLATE_MODE == "production"
+
+if TEMPLATE_MODE == "production":
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 WSGI_APPLICATION = "it_company_task_manager.wsgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+#
+# Connections are kept open between requests (CONN_MAX_AGE) and checked
+# before reuse, so most requests skip the TCP and TLS handshakes. With
+# DATABASE_POOL=True each worker process keeps a psycopg pool instead;
+# size it to the threads that can query at once: gunicorn --threads, or
+# the thread-sensitive ORM thread (plus headroom) under uvicorn.
+# processes * DATABASE_POOL_MAX_SIZE * aliases must stay under the
+# server's max_connections.
+#
+# Under ASGI, persistent connections must stay off: sync ORM calls run
+# in per-request threads whose connections are never reused, so they
+# leak until max_connections is hit. asgi.py sets DJANGO_SERVER=asgi,
+# which turns the pool on by default; with DATABASE_POOL=False there,
+# every request opens its own connection (CONN_MAX_AGE=0).
+SERVING_ASGI = os.getenv("DJANGO_SERVER") == "asgi"
+DATABASE_POOL = os.getenv("DATABASE_POOL", str(SERVING_ASGI)) == "True"
+
+
+def database(host):
+    options = {"sslmode": os.getenv("PGSSLMODE", "require")}
+    if DATABASE_POOL:
+        options["pool"] = {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", 1)),
+            "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", 4)),
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", 10)),
+        }
+    return {
         "ENGINE": "django.db.backends.postgresql",
         "NAME": os.getenv("PGDATABASE"),
         "USER": os.getenv("PGUSER"),
         "PASSWORD": os.getenv("PGPASSWORD"),
-        "HOST": os.getenv("PGHOST"),
+        "HOST": host,
         "PORT": os.getenv("PGPORT", 5432),
-        "OPTIONS": {
-            "sslmode": "require",
+        # Pooled connections are returned to the pool, never kept.
+        "CONN_MAX_AGE": 0 if DATABASE_POOL or SERVING_ASGI else int(
+            os.getenv("DATABASE_CONN_MAX_AGE", 600)
+        ),
+        "CONN_HEALTH_CHECKS": not (DATABASE_POOL or SERVING_ASGI),
+        "OPTIONS": options,
+    }
+
+
+DATABASES = {
+    "default": database(os.getenv("PGHOST")),
+}
+
+# A streaming replica of the primary. GET and HEAD requests read from it;
+# writes, and the requests of a client that wrote in the last
+# REPLICA_PIN_SECONDS, go to the primary.
+if os.getenv("PGREPLICAHOST"):
+    DATABASES["replica"] = {
+        **database(os.getenv("PGREPLICAHOST")),
+        "TEST": {"MIRROR": "default"},
+    }
+
+# Local stand-ins for the primary and the replica: two SQLite files. Copy
+# the primary over the replica to "replicate"; until then it lags.
+if os.getenv("SQLITE_PRIMARY"):
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / os.getenv("SQLITE_PRIMARY"),
         }
     }
+    if os.getenv("SQLITE_REPLICA"):
+        DATABASES["replica"] = {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / os.getenv("SQLITE_REPLICA"),
+            "TEST": {"MIRROR": "default"},
+        }
+
+# Longer than the replica usually lags behind the primary.
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 15))
+REPLICA_PIN_COOKIE = "pin_primary"
+
+DATABASE_ROUTERS = ["task_manager.routers.ReplicaRouter"]
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+#
+# Local memory by default. CACHE_BACKEND=file shares rendered task cards
+# and the dashboard between the worker processes of one host.
+
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+}
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION",
+            str(BASE_DIR / ".cache") if CACHE_BACKEND == "file"
+            else "it-company-task-manager"
+        ),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", 86400)),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", 10000)),
+        },
+    }
 }
 
 
@@ -149,3 +264,43 @@ LOGOUT_REDIRECT_URL = 'task-manager:index'
 INTERNAL_IPS = [
     "127.0.0.1",
  ]
+
+# Upper bound on how long the cached Index dashboard and calendar months
+# may lag behind writes made in other processes; local writes update them
+# immediately.
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_CACHE_TIMEOUT", 300))
+
+# Views declare a query_budget; going over it logs a warning, or raises
+# when strict, which task_manager.runner.TestRunner turns on for the
+# test suite.
+QUERY_BUDGET_STRICT = os.getenv("QUERY_BUDGET_STRICT", "") == "True"
+
+TEST_RUNNER = "task_manager.runner.TestRunner"
+
+# Clients allowed to scrape the /metrics/ endpoint.
+METRICS_ALLOWED_IPS = os.getenv(
+    "METRICS_ALLOWED_IPS", "127.0.0.1,::1"
+).split(",")
+
+# Background jobs run from the database by "manage.py run_jobs"; failed
+# jobs are retried after JOB_RETRY_DELAY seconds, doubling every attempt.
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", 1))
+JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", 10))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+JOB_RETRY_DELAY = int(os.getenv("JOB_RETRY_DELAY", 30))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 5))
+JOB_LOCK_TIMEOUT = int(os.getenv("JOB_LOCK_TIMEOUT", 600))
+JOB_RETENTION = int(os.getenv("JOB_RETENTION", 86400))
+
+# Overdue/due-soon digests shown on each worker's task list.
+DIGEST_INTERVAL = int(os.getenv("DIGEST_INTERVAL", 900))
+DIGEST_BATCH_SIZE = int(os.getenv("DIGEST_BATCH_SIZE", 500))
+DIGEST_DUE_SOON_DAYS = int(os.getenv("DIGEST_DUE_SOON_DAYS", 3))
+DIGEST_ITEMS = int(os.getenv("DIGEST_ITEMS", 5))
+
+# Workload analytics rollup, refreshed by the job worker. Each refresh
+# rereads the last ANALYTICS_CHECKPOINT_OVERLAP seconds of changes.
+ANALYTICS_INTERVAL = int(os.getenv("ANALYTICS_INTERVAL", 300))
+ANALYTICS_CHECKPOINT_OVERLAP = int(
+    os.getenv("ANALYTICS_CHECKPOINT_OVERLAP", 60)
+)
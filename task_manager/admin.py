@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import TaskType, Position, Worker, Task
+from . import bulk
+from .models import ApiToken, Job, TaskType, Position, Worker, Task
+from .search import search_tasks
 
 
 @admin.register(TaskType)
@@ -32,6 +34,18 @@ class WorkerAdmin(UserAdmin):
     )
 
 
+def set_priority_action(priority, label):
+    @admin.action(description=f"Set priority to {label}")
+    def set_priority(modeladmin, request, queryset):
+        updated = bulk.set_priority(
+            list(queryset.values_list("pk", flat=True)), priority
+        )
+        modeladmin.message_user(request, f"Updated {updated} tasks.")
+
+    set_priority.__name__ = f"set_priority_{priority}"
+    return set_priority
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     list_display = (
@@ -47,3 +61,41 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ("is_completed", "priority", "task_type")
     ordering = ("-deadline",)
     autocomplete_fields = ("assignees",)
+    actions = ["mark_completed"] + [
+        set_priority_action(priority, label)
+        for priority, label in Task.PRIORITY_CHOICES
+    ]
+
+    @admin.action(description="Mark selected tasks as completed")
+    def mark_completed(self, request, queryset):
+        updated = bulk.complete_tasks(
+            list(queryset.values_list("pk", flat=True))
+        )
+        self.message_user(request, f"Completed {updated} tasks.")
+
+    def delete_queryset(self, request, queryset):
+        bulk.delete_tasks(list(queryset.values_list("pk", flat=True)))
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        matches = search_tasks(search_term, queryset).values("pk")
+        return queryset.filter(pk__in=matches), False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "finished_at", "locked_at", "locked_by")
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    # Keys are issued with "manage.py create_api_token" and shown once.
+    list_display = ("id", "worker", "name", "created_at")
+    search_fields = ("worker__username", "name")
+    readonly_fields = ("worker", "created_at")
+
+    def has_add_permission(self, request):
+        return False
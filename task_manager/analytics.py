@@ -0,0 +1,169 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf
+from django.utils import timezone
+
+from task_manager import jobs
+from task_manager.models import (
+    Position,
+    PositionWorkload,
+    Task,
+    TaskType,
+    TaskTypeWorkload,
+    WorkloadCheckpoint
+)
+
+
+def _counts(prefix, today):
+    is_completed = f"{prefix}is_completed"
+    return {
+        "total": Count("pk"),
+        "open": Count("pk", filter=Q(**{is_completed: False})),
+        "completed": Count("pk", filter=Q(**{is_completed: True})),
+        "overdue": Count(
+            "pk",
+            filter=Q(
+                **{is_completed: False, f"{prefix}deadline__lt": today}
+            )
+        ),
+    }
+
+
+def count_task_types(today, task_type_ids=None):
+    # One GROUP BY task type and priority with FILTER aggregates.
+    tasks = Task.objects.all()
+    if task_type_ids is not None:
+        tasks = tasks.filter(task_type__in=task_type_ids)
+    return [
+        TaskTypeWorkload(**row)
+        for row in tasks.values("task_type_id", "priority")
+        .annotate(**_counts("", today))
+        .order_by()
+    ]
+
+
+def count_positions(today, position_ids=None, unassigned=True):
+    links = Task.assignees.through.objects.all()
+    if position_ids is not None:
+        in_scope = Q(worker__position__in=position_ids)
+        if unassigned:
+            in_scope |= Q(worker__position__isnull=True)
+        links = links.filter(in_scope)
+    return [
+        PositionWorkload(**row)
+        for row in links.values(position_id=F("worker__position"))
+        .annotate(**_counts("task__", today))
+        .order_by()
+    ]
+
+
+def _replace(model, scope, rows):
+    model.objects.filter(scope).delete()
+    model.objects.bulk_create(rows)
+
+
+def refresh(full=False, today=None):
+    # Overdue counts depend on the day, so the first refresh of a day
+    # recounts everything. Later ones recount only the task types and
+    # positions of tasks changed since the last refresh started, plus the
+    # ones touched by tasks or workers leaving them (see
+    # versions.touch_task_listings). The overlap covers transactions that
+    # were still open back then.
+    today = today or timezone.localdate()
+    started = timezone.now()
+    checkpoint = WorkloadCheckpoint.objects.first()
+    full = full or checkpoint is None or checkpoint.day != today
+    with transaction.atomic():
+        if full:
+            task_types, positions = Q(), Q()
+            task_type_rows = count_task_types(today)
+            position_rows = count_positions(today)
+        else:
+            since = checkpoint.refreshed_at - timedelta(
+                seconds=settings.ANALYTICS_CHECKPOINT_OVERLAP
+            )
+            changed = Task.objects.filter(updated_at__gte=since)
+            task_type_ids = set(
+                TaskType.objects.filter(updated_at__gte=since)
+                .values_list("pk", flat=True)
+            ) | set(
+                changed.order_by()
+                .values_list("task_type", flat=True)
+                .distinct()
+            )
+            workers = get_user_model().objects.filter(
+                Q(updated_at__gte=since)
+                | Q(
+                    pk__in=Task.assignees.through.objects.filter(
+                        task__in=changed
+                    ).values("worker_id")
+                )
+            )
+            position_ids = set(
+                Position.objects.filter(updated_at__gte=since)
+                .values_list("pk", flat=True)
+            ) | set(
+                workers.exclude(position=None)
+                .values_list("position", flat=True)
+            )
+            unassigned = workers.filter(position=None).exists()
+            task_types = Q(task_type__in=task_type_ids)
+            positions = Q(position__in=position_ids)
+            if unassigned:
+                positions |= Q(position=None)
+            task_type_rows = count_task_types(today, task_type_ids)
+            position_rows = count_positions(today, position_ids, unassigned)
+        _replace(TaskTypeWorkload, task_types, task_type_rows)
+        _replace(PositionWorkload, positions, position_rows)
+        WorkloadCheckpoint.objects.all().delete()
+        WorkloadCheckpoint.objects.create(day=today, refreshed_at=started)
+    return full, len(task_type_rows) + len(position_rows)
+
+
+def invalidate():
+    # The next refresh recounts everything.
+    WorkloadCheckpoint.objects.all().delete()
+
+
+@jobs.register("refresh_workload", every="ANALYTICS_INTERVAL")
+def refresh_workload():
+    refresh()
+
+
+def _report(rows, *group_by, **labels):
+    # Sums over the rollup rows, never over tasks.
+    return rows.values(*group_by, **labels).annotate(
+        tasks=Sum("total"),
+        open_tasks=Sum("open"),
+        completed_tasks=Sum("completed"),
+        overdue_tasks=Sum("overdue"),
+    ).annotate(
+        completion_percent=Cast("completed_tasks", FloatField()) * 100
+        / NullIf(F("tasks"), 0),
+        overdue_percent=Cast("overdue_tasks", FloatField()) * 100
+        / NullIf(F("open_tasks"), 0)
+    ).order_by("-open_tasks", *group_by)
+
+
+def by_position():
+    return _report(
+        PositionWorkload.objects.all(),
+        "position_id",
+        label=F("position__name")
+    )
+
+
+def by_task_type():
+    return _report(
+        TaskTypeWorkload.objects.all(),
+        "task_type_id",
+        label=F("task_type__name")
+    )
+
+
+def by_priority():
+    return _report(TaskTypeWorkload.objects.all(), "priority")
@@ -0,0 +1,380 @@
+import hashlib
+import json
+
+from django.db.models import Prefetch
+from django.forms.models import model_to_dict
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views import generic
+
+from task_manager import counters, versions
+from task_manager.forms import (
+    PositionForm,
+    TaskForm,
+    TaskTypeForm,
+    WorkerUpdateForm
+)
+from task_manager.models import ApiToken, Position, Task, TaskType, Worker
+from task_manager.pagination import CursorPaginator
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Resource:
+    model = None
+    form_class = None
+    fields = []
+    relations = {}
+    # Fields computed when read: name -> function returning the expression.
+    annotations = {}
+    default_fields = []
+    ordering = None
+    depends_on = []
+    writable = False
+
+    def parse_fields(self, value):
+        requested = value.split(",") if value else self.default_fields
+        columns, relations = ["id"], {}
+        for name in (name.strip() for name in requested if name.strip()):
+            relation, _, subfield = name.partition(".")
+            if relation in self.relations:
+                if subfield and subfield not in self.relations[relation]:
+                    raise ApiError(400, f"Unknown field: {name}")
+                subfields = relations.setdefault(relation, [])
+                if subfield and subfield not in subfields:
+                    subfields.append(subfield)
+            elif name in self.fields and not subfield:
+                if name not in columns:
+                    columns.append(name)
+            else:
+                raise ApiError(400, f"Unknown field: {name}")
+        return columns, relations
+
+    def get_queryset(self, columns, relations):
+        queryset = self.model._default_manager.all()
+        ordering = self.ordering or self.model._meta.ordering
+        annotated = [name for name in columns if name in self.annotations]
+        if annotated:
+            queryset = queryset.annotate(**{
+                name: self.annotations[name]() for name in annotated
+            })
+            columns = [name for name in columns if name not in annotated]
+        only = {*columns, *(field.lstrip("-") for field in ordering)}
+        for relation, subfields in relations.items():
+            field = self.model._meta.get_field(relation)
+            related = field.related_model
+            if field.many_to_many:
+                queryset = queryset.prefetch_related(
+                    Prefetch(
+                        relation,
+                        queryset=related._default_manager.only(
+                            "pk", *subfields
+                        )
+                    )
+                )
+                continue
+            if subfields:
+                queryset = queryset.select_related(relation)
+                only.update(f"{relation}__{name}" for name in subfields)
+            only.add(relation)
+        return queryset.only(*only)
+
+    def serialize(self, obj, columns, relations):
+        data = {name: getattr(obj, name) for name in columns}
+        for relation, subfields in relations.items():
+            field = self.model._meta.get_field(relation)
+            if field.many_to_many:
+                related = getattr(obj, relation).all()
+                data[relation] = [
+                    self.serialize_related(item, subfields)
+                    for item in related
+                ] if subfields else [item.pk for item in related]
+            elif subfields:
+                item = getattr(obj, relation)
+                data[relation] = (
+                    self.serialize_related(item, subfields) if item else None
+                )
+            else:
+                data[relation] = getattr(obj, field.attname)
+        return data
+
+    def serialize_related(self, item, subfields):
+        return {"id": item.pk, **{
+            name: getattr(item, name) for name in subfields
+        }}
+
+    def has_write_permission(self, request, obj=None):
+        return self.writable and request.user.is_staff
+
+    def initial_data(self, obj):
+        return model_to_dict(obj, fields=self.form_class._meta.fields)
+
+    def save_form(self, request, form):
+        return form.save()
+
+
+class TaskResource(Resource):
+    model = Task
+    form_class = TaskForm
+    fields = ["name", "description", "deadline", "is_completed", "priority"]
+    relations = {
+        "task_type": ["name"],
+        "created_by": ["username", "first_name", "last_name"],
+        "assignees": ["username", "first_name", "last_name"],
+    }
+    default_fields = ["name", "deadline", "is_completed", "priority"]
+    depends_on = ["task", "tasktype", "worker"]
+    writable = True
+
+    def has_write_permission(self, request, obj=None):
+        return obj is None or request.user.is_superuser or (
+            obj.created_by_id == request.user.pk
+        )
+
+    def initial_data(self, obj):
+        return {**super().initial_data(obj), "priority": obj.priority}
+
+    def save_form(self, request, form):
+        return form.save(
+            user=request.user if form.instance.pk is None else None
+        )
+
+
+class TaskTypeResource(Resource):
+    model = TaskType
+    form_class = TaskTypeForm
+    fields = ["name"]
+    default_fields = ["name"]
+    depends_on = ["tasktype"]
+    writable = True
+
+
+class PositionResource(Resource):
+    model = Position
+    form_class = PositionForm
+    fields = ["name"]
+    default_fields = ["name"]
+    depends_on = ["position"]
+    writable = True
+
+
+class WorkerResource(Resource):
+    model = Worker
+    form_class = WorkerUpdateForm
+    fields = [
+        "username",
+        "first_name",
+        "last_name",
+        "email",
+        "open_task_count",
+        "completed_task_count",
+        "overdue_task_count",
+    ]
+    relations = {"position": ["name"]}
+    annotations = {"overdue_task_count": counters.overdue_count}
+    default_fields = ["username", "first_name", "last_name"]
+    ordering = ["username"]
+    depends_on = ["worker", "position"]
+
+    def has_write_permission(self, request, obj=None):
+        # Workers register through the sign-up form, never through the API.
+        return obj is not None and (
+            request.user.is_superuser or obj.pk == request.user.pk
+        )
+
+
+def _unauthorized(detail):
+    response = JsonResponse({"detail": detail}, status=401)
+    response["WWW-Authenticate"] = "Token"
+    return response
+
+
+# Clients authenticate with "Authorization: Token <key>" (see ApiToken),
+# which carries no ambient credentials and so needs no CSRF check, or
+# with the session, whose writes are checked for CSRF here so that a
+# failure is answered in JSON like every other error.
+@method_decorator(csrf_exempt, name="dispatch")
+class ApiView(generic.View):
+    resource = None
+    max_limit = 200
+    default_limit = 50
+    query_budget = 8
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def dispatch(self, request, *args, **kwargs):
+        scheme, _, key = request.headers.get("Authorization", "").partition(
+            " "
+        )
+        if scheme.lower() == "token":
+            token = ApiToken.objects.select_related("worker").filter(
+                key_digest=ApiToken.digest(key.strip()),
+                worker__is_active=True
+            ).first()
+            if token is None:
+                return _unauthorized("Invalid token.")
+            request.user = token.worker
+        elif not request.user.is_authenticated:
+            return _unauthorized("Authentication required.")
+        elif request.method not in self.safe_methods and (
+            CsrfViewMiddleware(HttpResponse).process_view(
+                request, None, (), {}
+            ) is not None
+        ):
+            return JsonResponse(
+                {"detail": "CSRF verification failed."}, status=403
+            )
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except ApiError as error:
+            return JsonResponse({"detail": error.message}, status=error.status)
+        except Http404:
+            return JsonResponse({"detail": "Not found."}, status=404)
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        return JsonResponse({"detail": "Method not allowed."}, status=405)
+
+    def json_response(self, data, status=200):
+        return JsonResponse(data, status=status)
+
+    def conditional_response(self, request):
+        # Versions change on every write, so an unchanged collection can be
+        # answered before it is queried or serialized.
+        state = (
+            versions.current(*self.resource.depends_on),
+            request.get_full_path(),
+        )
+        if self.resource.annotations:
+            # Overdue counts move with the date alone.
+            state += (timezone.localdate(),)
+        etag = '"%s"' % hashlib.sha1(repr(state).encode()).hexdigest()
+        return etag, get_conditional_response(request, etag=etag)
+
+    def read_fields(self, request):
+        return self.resource.parse_fields(request.GET.get("fields", ""))
+
+    def read_body(self, request):
+        try:
+            body = json.loads(request.body or b"{}")
+        except ValueError:
+            raise ApiError(400, "Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise ApiError(400, "Request body must be a JSON object.")
+        return body
+
+    def save(self, request, data, obj=None):
+        if not self.resource.has_write_permission(request, obj):
+            raise ApiError(403, "You don't have permission to do this.")
+        created = obj is None
+        form = self.resource.form_class(data=data, instance=obj)
+        if not form.is_valid():
+            return self.json_response(
+                {"errors": form.errors.get_json_data()}, status=400
+            )
+        obj = self.resource.save_form(request, form)
+        columns, relations = self.read_fields(request)
+        obj = self.resource.get_queryset(columns, relations).get(pk=obj.pk)
+        return self.json_response(
+            self.resource.serialize(obj, columns, relations),
+            status=201 if created else 200
+        )
+
+
+class ApiCollectionView(ApiView):
+    def get(self, request):
+        etag, not_modified = self.conditional_response(request)
+        if not_modified is not None:
+            return not_modified
+
+        columns, relations = self.read_fields(request)
+        try:
+            limit = min(
+                int(request.GET.get("limit", self.default_limit)),
+                self.max_limit
+            )
+        except ValueError:
+            raise ApiError(400, "limit must be an integer.")
+        paginator = CursorPaginator(
+            self.resource.get_queryset(columns, relations),
+            max(limit, 1),
+            ordering=self.resource.ordering
+        )
+        page = paginator.get_page(request.GET.get("cursor"))
+        query = request.GET.copy()
+
+        def page_url(cursor):
+            if cursor is None:
+                return None
+            query["cursor"] = cursor
+            return request.build_absolute_uri(
+                f"{request.path}?{query.urlencode()}"
+            )
+
+        response = self.json_response({
+            "results": [
+                self.resource.serialize(obj, columns, relations)
+                for obj in page
+            ],
+            "next": page_url(page.next_cursor),
+            "previous": page_url(page.previous_cursor),
+        })
+        response["ETag"] = etag
+        return response
+
+    def post(self, request):
+        return self.save(request, self.read_body(request))
+
+
+class ApiDetailView(ApiView):
+    http_method_names = ["get", "put", "patch", "delete"]
+
+    def get_object(self, pk):
+        return get_object_or_404(self.resource.model, pk=pk)
+
+    def get(self, request, pk):
+        etag, not_modified = self.conditional_response(request)
+        if not_modified is not None:
+            return not_modified
+        columns, relations = self.read_fields(request)
+        obj = get_object_or_404(
+            self.resource.get_queryset(columns, relations), pk=pk
+        )
+        response = self.json_response(
+            self.resource.serialize(obj, columns, relations)
+        )
+        response["ETag"] = etag
+        return response
+
+    def put(self, request, pk):
+        if self.resource.form_class is None:
+            raise ApiError(405, "Method not allowed.")
+        obj = self.get_object(pk)
+        return self.save(request, self.read_body(request), obj)
+
+    def patch(self, request, pk):
+        if self.resource.form_class is None:
+            raise ApiError(405, "Method not allowed.")
+        obj = self.get_object(pk)
+        data = {
+            **self.resource.initial_data(obj),
+            **self.read_body(request),
+        }
+        return self.save(request, data, obj)
+
+    def delete(self, request, pk):
+        obj = self.get_object(pk)
+        if not self.resource.writable or (
+            not self.resource.has_write_permission(request, obj)
+        ):
+            raise ApiError(403, "You don't have permission to do this.")
+        obj.delete()
+        return HttpResponse(status=204)
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class TaskManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "task_manager"
+
+    def ready(self):
+        from task_manager import (  # noqa: F401
+            analytics,
+            checks,
+            digests,
+            signals
+        )
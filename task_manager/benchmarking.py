@@ -0,0 +1,240 @@
+import asyncio
+import sys
+import threading
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager import metrics
+from task_manager.models import Position, Task
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Routes that only accept writes.
+SKIPPED = {"task-bulk-action"}
+ROUTE_ARGS = {
+    "task-board-column": ["open", "medium"],
+    # The current month, week and day, which are never cached.
+    "task-calendar-month": lambda today: [today.year, today.month],
+    "task-calendar-week": lambda today: list(today.isocalendar()[:2]),
+    "task-calendar-day": lambda today: [today.year, today.month, today.day],
+}
+QUERY_STRINGS = {"task-search": {"q": "report"}}
+# Which object a route's <pk> points at, by the first match in its name.
+TARGETS = [
+    ("task-type", "task_type"),
+    ("position", "position"),
+    ("worker", "worker"),
+    ("task", "task"),
+]
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def default_host():
+    host = next(iter(settings.ALLOWED_HOSTS), "*").lstrip(".")
+    return "localhost" if host in ("", "*") else host
+
+
+def get_worker(username=None):
+    workers = get_user_model().objects
+    if username:
+        try:
+            return workers.get(username=username)
+        except workers.model.DoesNotExist:
+            raise BenchmarkError(f"Unknown worker: {username}")
+    worker = workers.order_by("-open_task_count", "pk").first()
+    if worker is None:
+        raise BenchmarkError("There are no workers to log in as.")
+    return worker
+
+
+def route_targets(worker):
+    task = Task.objects.filter(assignees=worker).first()
+    if task is None:
+        raise BenchmarkError(f"{worker.username} has no tasks to show.")
+    position_id = worker.position_id or (
+        Position.objects.values_list("pk", flat=True).first()
+    )
+    return {
+        "task": task.pk,
+        "task_type": task.task_type_id,
+        "worker": worker.pk,
+        "position": position_id,
+    }
+
+
+def routes(targets, names=None):
+    from task_manager.urls import app_name, urlpatterns
+
+    for pattern in urlpatterns:
+        name = pattern.name
+        if name in SKIPPED or names and name not in names:
+            continue
+        args = ROUTE_ARGS.get(name, [])
+        if callable(args):
+            args = args(timezone.localdate())
+        if "pk" in pattern.pattern.converters:
+            target = next(
+                target for prefix, target in TARGETS if prefix in name
+            )
+            if targets[target] is None:
+                continue
+            args = [targets[target]]
+        yield name, reverse(f"{app_name}:{name}", args=args)
+
+
+# Sends `requests` GETs to one URL from `concurrency` clients and times
+# each response. WSGI clients are threads, each with its own connection;
+# ASGI clients are tasks on one event loop, like uvicorn's.
+class RouteBenchmark:
+    def __init__(self, worker, requests, concurrency, host=None):
+        self.worker = worker
+        self.requests = max(requests, 1)
+        self.concurrency = max(concurrency, 1)
+        self.host = host or default_host()
+
+    def measure(self, interface, name, url, data=None):
+        run = self.run_wsgi if interface == "wsgi" else self.run_asgi
+        view = f"task-manager:{name}"
+        metrics.reset()
+        latencies, errors, elapsed = run(url, data or {})
+        counts, total_queries = metrics.QUERIES.series.get(view, ([0], 0))
+        served = sum(counts)
+        return {
+            "requests": len(latencies),
+            "errors": errors,
+            "rps": len(latencies) / elapsed,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "queries": total_queries / served if served else 0,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def wsgi_client(self):
+        client = Client(headers={"host": self.host})
+        client.force_login(self.worker)
+        return client
+
+    def run_wsgi(self, url, data):
+        latencies, errors = [], []
+        pending = iter(range(self.requests))
+        lock = threading.Lock()
+
+        def send(client):
+            while True:
+                with lock:
+                    if next(pending, None) is None:
+                        return
+                started = time.perf_counter()
+                response = client.get(url, data)
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        def send_in_thread(client):
+            try:
+                send(client)
+            finally:
+                connections.close_all()
+
+        client = self.wsgi_client()
+        # Warm the caches and the connection before timing.
+        client.get(url, data)
+        if self.concurrency == 1:
+            started = time.perf_counter()
+            send(client)
+        else:
+            clients = [self.wsgi_client() for _ in range(self.concurrency)]
+            threads = [
+                threading.Thread(target=send_in_thread, args=[client])
+                for client in clients
+            ]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        return latencies, len(errors), time.perf_counter() - started
+
+    def run_asgi(self, url, data):
+        return async_to_sync(self.arun_asgi)(url, data)
+
+    async def arun_asgi(self, url, data):
+        client = AsyncClient(headers={"host": self.host})
+        await client.aforce_login(self.worker)
+        await client.get(url, data)
+        latencies, errors = [], []
+        pending = iter(range(self.requests))
+
+        async def send():
+            for _ in pending:
+                started = time.perf_counter()
+                response = await client.get(url, data)
+                if response.streaming and response.is_async:
+                    async for _chunk in response.streaming_content:
+                        pass
+                elif response.streaming:
+                    # The ASGI handler iterates sync bodies in a thread.
+                    await sync_to_async(b"".join)(
+                        response.streaming_content
+                    )
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send() for _ in range(self.concurrency)))
+        return latencies, len(errors), time.perf_counter() - started
+
+
+def compare(results, baseline, tolerance):
+    # Slower p95 or lower throughput beyond the tolerance, or any extra
+    # query per request, counts as a regression.
+    regressions = []
+    for key, result in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if result["p95"] > before["p95"] * (1 + tolerance):
+            regressions.append(
+                f"{key}: p95 {before['p95'] * 1000:.1f} -> "
+                f"{result['p95'] * 1000:.1f} ms"
+            )
+        if result["rps"] < before["rps"] * (1 - tolerance):
+            regressions.append(
+                f"{key}: {before['rps']:.1f} -> {result['rps']:.1f} req/s"
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{key}: {before['queries']:g} -> {result['queries']:g} "
+                "queries per request"
+            )
+    return regressions
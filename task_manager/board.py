@@ -0,0 +1,56 @@
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from task_manager.models import Task
+from task_manager.pagination import CursorPaginator
+
+STATES = {"open": False, "completed": True}
+ORDERING = ["deadline", "id"]
+
+
+class Column:
+    def __init__(self, state, priority, label, cards, next_cursor):
+        self.state = state
+        self.priority = priority
+        self.label = label
+        self.cards = cards
+        self.next_cursor = next_cursor
+
+
+def column_queryset(queryset, state, priority):
+    return queryset.filter(is_completed=STATES[state], priority=priority)
+
+
+def columns(queryset, per_column):
+    # One query for the whole board: every column's first cards ranked by
+    # a window function, plus one more to tell whether it continues. The
+    # rest of a column is paged by the same ordering from its cursor.
+    ranked = queryset.annotate(
+        column_position=Window(
+            RowNumber(),
+            partition_by=[F("is_completed"), F("priority")],
+            order_by=[F(field).asc() for field in ORDERING]
+        )
+    ).filter(column_position__lte=per_column + 1).order_by(*ORDERING)
+    cards = {}
+    for task in ranked:
+        cards.setdefault((task.is_completed, task.priority), []).append(task)
+
+    board = []
+    for state, is_completed in STATES.items():
+        for priority, label in Task.PRIORITY_CHOICES:
+            column = cards.get((is_completed, priority), [])
+            paginator = CursorPaginator(
+                column_queryset(queryset, state, priority),
+                per_column,
+                ordering=ORDERING
+            )
+            board.append(Column(
+                state,
+                priority,
+                label,
+                column[:per_column],
+                paginator.encode_cursor(column[per_column - 1], "next")
+                if len(column) > per_column else None
+            ))
+    return board
@@ -0,0 +1,205 @@
+from django.contrib.auth import get_user_model
+from django.db import connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from task_manager import (
+    counters,
+    dashboard,
+    deadlines,
+    events,
+    search,
+    versions
+)
+from task_manager.models import Task
+
+ACTIONS = {
+    "complete": "Mark as completed",
+    "set_priority": "Change priority",
+    "add_assignees": "Add assignees",
+    "remove_assignees": "Remove assignees",
+    "delete": "Delete",
+}
+
+
+def permitted_task_ids(user, task_ids, action):
+    if user.is_superuser:
+        rule = Q()
+    elif action == "complete":
+        rule = Q(assignees=user)
+    else:
+        rule = Q(created_by=user)
+    return set(
+        Task.objects.filter(rule, pk__in=task_ids)
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def _assignee_ids(task_ids):
+    return set(
+        Task.assignees.through.objects.filter(task_id__in=task_ids)
+        .values_list("worker_id", flat=True)
+    )
+
+
+def _refresh_derived(worker_ids):
+    # Set-based writes bypass the model signals.
+    versions.bump("task")
+    if worker_ids:
+        counters.recount(worker_ids)
+    transaction.on_commit(dashboard.invalidate)
+
+
+def _workers_by_task(links):
+    workers = {}
+    for task_id, worker_id in sorted(links):
+        workers.setdefault(task_id, []).append(worker_id)
+    return workers
+
+
+def complete_tasks(task_ids):
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().filter(
+            pk__in=task_ids, is_completed=False
+        )
+        completed = list(tasks.values_list("pk", flat=True))
+        updated = Task.objects.filter(pk__in=completed).update(
+            is_completed=True,
+            version=F("version") + 1,
+            updated_at=timezone.now()
+        )
+        if updated:
+            deadlines.invalidate_tasks(completed)
+            _refresh_derived(_assignee_ids(task_ids))
+            events.record_many(
+                (task_id, "completed", {"is_completed": [False, True]})
+                for task_id in completed
+            )
+    return updated
+
+
+def set_priority(task_ids, priority):
+    with transaction.atomic():
+        tasks = Task.objects.select_for_update().filter(
+            pk__in=task_ids
+        ).exclude(priority=priority)
+        previous = list(tasks.values_list("pk", "priority"))
+        updated = Task.objects.filter(
+            pk__in=[task_id for task_id, _ in previous]
+        ).update(
+            priority=priority,
+            version=F("version") + 1,
+            updated_at=timezone.now()
+        )
+        if updated:
+            versions.bump("task")
+            deadlines.invalidate_tasks(
+                [task_id for task_id, _ in previous]
+            )
+            events.record_many(
+                (task_id, "updated", {"priority": [old, priority]})
+                for task_id, old in previous
+            )
+    return updated
+
+
+def add_assignees(task_ids, worker_ids):
+    through = Task.assignees.through
+    with transaction.atomic():
+        existing = set(
+            through.objects.filter(
+                task_id__in=task_ids, worker_id__in=worker_ids
+            ).values_list("task_id", "worker_id")
+        )
+        added = {
+            (task_id, worker_id)
+            for task_id in task_ids
+            for worker_id in worker_ids
+        } - existing
+        if added:
+            through.objects.bulk_create(
+                [
+                    through(task_id=task_id, worker_id=worker_id)
+                    for task_id, worker_id in sorted(added)
+                ],
+                ignore_conflicts=True
+            )
+            added_workers = {worker_id for _, worker_id in added}
+            versions.bump_tasks({task_id for task_id, _ in added})
+            _refresh_derived(added_workers)
+            events.record_many(
+                (task_id, "assigned", {"workers": workers})
+                for task_id, workers in _workers_by_task(added).items()
+            )
+    return len(added)
+
+
+def remove_assignees(task_ids, worker_ids):
+    with transaction.atomic():
+        links = Task.assignees.through.objects.filter(
+            task_id__in=task_ids, worker_id__in=worker_ids
+        )
+        removed_links = list(links.values_list("task_id", "worker_id"))
+        removed, _ = links.delete()
+        if removed:
+            versions.bump_tasks(task_ids)
+            versions.touch(get_user_model(), worker_ids)
+            _refresh_derived(set(worker_ids))
+            events.record_many(
+                (task_id, "unassigned", {"workers": workers})
+                for task_id, workers in _workers_by_task(
+                    removed_links
+                ).items()
+            )
+    return removed
+
+
+def delete_tasks(task_ids):
+    with transaction.atomic():
+        worker_ids = _assignee_ids(task_ids)
+        versions.touch_task_listings(task_ids)
+        deadlines.invalidate_tasks(task_ids)
+        events.record_many(
+            (task_id, "deleted", None)
+            for task_id in Task.objects.filter(pk__in=task_ids)
+            .values_list("pk", flat=True)
+        )
+        Task.assignees.through.objects.filter(task_id__in=task_ids).delete()
+        using = router.db_for_write(Task)
+        deleted = _delete_rows(using, task_ids)
+        search.get_backend(using).remove(task_ids)
+        _refresh_derived(worker_ids)
+    return deleted
+
+
+def _delete_rows(using, task_ids):
+    # QuerySet.delete() loads every task to send the per-row delete
+    # signals, whose work is done above in bulk; the assignee links are
+    # gone and the event log has no constraint, so a plain DELETE is safe.
+    task_ids = list(task_ids)
+    deleted = 0
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(task_ids), 500):
+            chunk = task_ids[start:start + 500]
+            cursor.execute(
+                f"DELETE FROM {Task._meta.db_table} "
+                f"WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                chunk
+            )
+            deleted += cursor.rowcount
+    return deleted
+
+
+def run(action, task_ids, priority=None, worker_ids=()):
+    if action == "complete":
+        return complete_tasks(task_ids)
+    if action == "set_priority":
+        return set_priority(task_ids, priority)
+    if action == "add_assignees":
+        return add_assignees(task_ids, worker_ids)
+    if action == "remove_assignees":
+        return remove_assignees(task_ids, worker_ids)
+    if action == "delete":
+        return delete_tasks(task_ids)
+    raise ValueError(f"Unknown bulk action: {action}")
@@ -0,0 +1,28 @@
+from django.core import checks
+from django.urls import URLResolver, get_resolver
+
+from task_manager.mixins import QuerySetOptimizeMixin
+
+
+def _view_classes(patterns):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from _view_classes(pattern.url_patterns)
+        else:
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is not None:
+                yield view_class
+
+
+@checks.register(checks.Tags.urls)
+def check_query_shapes(app_configs, **kwargs):
+    errors = []
+    seen = set()
+    for view_class in _view_classes(get_resolver().url_patterns):
+        if view_class in seen or not issubclass(
+            view_class, QuerySetOptimizeMixin
+        ):
+            continue
+        seen.add(view_class)
+        errors += view_class.check_query_shape()
+    return errors
@@ -0,0 +1,120 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from task_manager import versions
+from task_manager.models import Task
+
+# Overdue is not among them: tasks become overdue without any write, so
+# it is counted when read; see overdue_count().
+COUNTER_FIELDS = (
+    "open_task_count",
+    "completed_task_count",
+)
+
+
+def negate(state):
+    return {field: -value for field, value in state.items()}
+
+
+def apply_delta(worker_ids, delta):
+    delta = {field: value for field, value in delta.items() if value}
+    if not delta or isinstance(worker_ids, (list, set)) and not worker_ids:
+        return
+    get_user_model().objects.filter(pk__in=worker_ids).update(**{
+        field: F(field) + value for field, value in delta.items()
+    })
+    versions.bump("worker")
+
+
+def tasks_delta(task_ids, sign=1):
+    totals = Task.objects.filter(pk__in=task_ids).aggregate(
+        open_task_count=Count("pk", filter=Q(is_completed=False)),
+        completed_task_count=Count("pk", filter=Q(is_completed=True)),
+    )
+    return {field: sign * value for field, value in totals.items()}
+
+
+def stored_state(task):
+    state = getattr(task, "_loaded_state", None)
+    return state if state is not None else tasks_delta([task.pk])
+
+
+def task_changed(task):
+    old_state = getattr(task, "_loaded_state", None)
+    new_state = task.counter_state()
+    if old_state is None or new_state is None or old_state == new_state:
+        return
+    apply_delta(
+        Task.assignees.through.objects.filter(task=task).values("worker"),
+        {field: new_state[field] - old_state[field] for field in new_state}
+    )
+
+
+def _assigned_count(**filters):
+    return Coalesce(
+        Subquery(
+            Task.assignees.through.objects.filter(
+                worker=OuterRef("pk"), **filters
+            )
+            .values("worker")
+            .annotate(count=Count("*"))
+            .values("count")
+        ),
+        0
+    )
+
+
+def overdue_count(today=None):
+    # Annotate workers with it; one subquery per row, answered from the
+    # (worker_id, task_id) index of the assignee links.
+    return _assigned_count(
+        task__is_completed=False,
+        task__deadline__lt=today or timezone.localdate()
+    )
+
+
+def counter_expressions():
+    return {
+        "open_task_count": _assigned_count(task__is_completed=False),
+        "completed_task_count": _assigned_count(task__is_completed=True),
+    }
+
+
+def recount(worker_ids=None, batch_size=1000):
+    workers = get_user_model().objects.order_by("pk")
+    if worker_ids is not None:
+        workers = workers.filter(pk__in=worker_ids)
+    expressions = counter_expressions()
+    stale = Q()
+    for field in COUNTER_FIELDS:
+        stale |= ~Q(**{field: F(f"actual_{field}")})
+
+    repaired = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            workers.filter(pk__gt=last_pk)
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not batch:
+            if repaired:
+                versions.bump("worker")
+            return repaired
+        last_pk = batch[-1]
+        with transaction.atomic():
+            stale_pks = list(
+                workers.filter(pk__in=batch)
+                .annotate(**{
+                    f"actual_{field}": expression
+                    for field, expression in expressions.items()
+                })
+                .filter(stale)
+                .values_list("pk", flat=True)
+            )
+            if stale_pks:
+                repaired += workers.filter(pk__in=stale_pks).update(
+                    **expressions
+                )
@@ -0,0 +1,171 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+
+from task_manager.models import Task
+
+WORKERS_KEY = "task_manager:dashboard:workers"
+NEAREST_KEY = "task_manager:dashboard:nearest"
+DASHBOARD_SIZE = 10
+
+
+def _timeout():
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+
+
+def _worker_name(worker):
+    return worker.get_full_name() or worker.username
+
+
+def _task_entry(task):
+    return {
+        "pk": task.pk,
+        "name": task.name,
+        "deadline": Task._meta.get_field("deadline").to_python(
+            task.deadline
+        ),
+        "is_completed": task.is_completed,
+    }
+
+
+def _task_total():
+    return F("open_task_count") + F("completed_task_count")
+
+
+def _workers_queryset():
+    # Only the top of the ranking is cached. The ordering repeats the
+    # expression of worker_task_total_idx so the index answers it.
+    return (
+        get_user_model().objects
+        .only("pk", "username", "first_name", "last_name")
+        .annotate(task_count=_task_total())
+        .order_by(_task_total().desc(), "id")[:DASHBOARD_SIZE]
+    )
+
+
+def _worker_entry(worker):
+    return {
+        "pk": worker.pk,
+        "name": _worker_name(worker),
+        "task_count": worker.task_count,
+    }
+
+
+def _nearest_queryset():
+    return (
+        Task.objects
+        .only("pk", "name", "deadline", "is_completed")
+        .order_by("deadline", "id")[:DASHBOARD_SIZE]
+    )
+
+
+def _load_workers():
+    workers = [_worker_entry(worker) for worker in _workers_queryset()]
+    cache.set(WORKERS_KEY, workers, _timeout())
+    return workers
+
+
+def _load_nearest():
+    nearest = [_task_entry(task) for task in _nearest_queryset()]
+    cache.set(NEAREST_KEY, nearest, _timeout())
+    return nearest
+
+
+def team_members():
+    workers = cache.get(WORKERS_KEY)
+    if workers is None:
+        workers = _load_workers()
+    return workers
+
+
+def nearest_tasks():
+    nearest = cache.get(NEAREST_KEY)
+    if nearest is None:
+        nearest = _load_nearest()
+    return nearest
+
+
+async def ateam_members():
+    workers = await cache.aget(WORKERS_KEY)
+    if workers is None:
+        workers = [
+            _worker_entry(worker) async for worker in _workers_queryset()
+        ]
+        await cache.aset(WORKERS_KEY, workers, _timeout())
+    return workers
+
+
+async def anearest_tasks():
+    nearest = await cache.aget(NEAREST_KEY)
+    if nearest is None:
+        nearest = [_task_entry(task) async for task in _nearest_queryset()]
+        await cache.aset(NEAREST_KEY, nearest, _timeout())
+    return nearest
+
+
+# Cached lists are dropped for the next read to rebuild rather than
+# patched: patching means a read, modify and write that concurrent
+# commits would overwrite.
+def _drop_if(key, affected):
+    def apply():
+        cached = cache.get(key)
+        if cached is not None and affected(cached):
+            cache.delete(key)
+
+    transaction.on_commit(apply)
+
+
+def _drop_workers():
+    # Any count change can reorder the ranking or move a worker into it.
+    transaction.on_commit(lambda: cache.delete(WORKERS_KEY))
+
+
+def change_task_counts(worker_ids):
+    if worker_ids:
+        _drop_workers()
+
+
+def worker_saved(worker):
+    # Logins save the worker too; only listed workers and short lists,
+    # which a new worker joins, are affected.
+    _drop_if(
+        WORKERS_KEY,
+        lambda workers: len(workers) < DASHBOARD_SIZE
+        or any(entry["pk"] == worker.pk for entry in workers)
+    )
+
+
+def worker_deleted(worker_id):
+    _drop_if(
+        WORKERS_KEY,
+        lambda workers: any(entry["pk"] == worker_id for entry in workers)
+    )
+
+
+def task_saved(task):
+    entry = _task_entry(task)
+    key = (entry["deadline"], entry["pk"])
+
+    def could_change(nearest):
+        # Listed tasks can move or leave; others can enter a short list
+        # or one whose last deadline is later.
+        return (
+            any(cached["pk"] == task.pk for cached in nearest)
+            or len(nearest) < DASHBOARD_SIZE
+            or key < (nearest[-1]["deadline"], nearest[-1]["pk"])
+        )
+
+    _drop_if(NEAREST_KEY, could_change)
+
+
+def task_deleted(task_id):
+    _drop_if(
+        NEAREST_KEY,
+        lambda nearest: any(entry["pk"] == task_id for entry in nearest)
+    )
+
+
+def invalidate():
+    cache.delete_many([WORKERS_KEY, NEAREST_KEY])
@@ -0,0 +1,118 @@
+import calendar
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from task_manager.models import Task
+
+MONTH_KEY = "task_manager:calendar:{year}-{month:02d}"
+PRIORITIES = [priority for priority, _ in Task.PRIORITY_CHOICES]
+DAY_ORDERING = ["is_completed", "id"]
+
+
+def _timeout():
+    return getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 300)
+
+
+class Day:
+    def __init__(self, day, counts, outside=False):
+        self.date = day
+        self.counts = counts
+        # Days of the neighbouring months that pad the month's first and
+        # last weeks; they are shown without counts.
+        self.outside = outside
+
+    @property
+    def open(self):
+        return sum(self.counts.get(priority, 0) for priority in PRIORITIES)
+
+    @property
+    def completed(self):
+        return self.counts.get("completed", 0)
+
+    @property
+    def total(self):
+        return self.open + self.completed
+
+    def by_priority(self):
+        return [
+            (priority, label, self.counts[priority])
+            for priority, label in Task.PRIORITY_CHOICES
+            if self.counts.get(priority)
+        ]
+
+
+def counts(first, last):
+    # One GROUP BY deadline query over the range, answered from the
+    # deadline index: open tasks per priority and completed ones per day.
+    rows = Task.objects.filter(deadline__range=(first, last)).values(
+        "deadline"
+    ).annotate(
+        completed=Count("pk", filter=Q(is_completed=True)),
+        **{
+            priority: Count(
+                "pk", filter=Q(is_completed=False, priority=priority)
+            )
+            for priority in PRIORITIES
+        }
+    ).order_by("deadline")
+    return {row.pop("deadline"): row for row in rows}
+
+
+def is_closed(year, month, today=None):
+    today = today or timezone.localdate()
+    return (year, month) < (today.year, today.month)
+
+
+def month_counts(year, month, today=None):
+    # Months that have ended rarely change, so their counts are cached.
+    # invalidate() only clears this process's cache when the backend is
+    # local memory, so entries also expire after DASHBOARD_CACHE_TIMEOUT.
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    if not is_closed(year, month, today):
+        return counts(first, last)
+    key = MONTH_KEY.format(year=year, month=month)
+    cached = cache.get(key)
+    if cached is None:
+        cached = counts(first, last)
+        cache.set(key, cached, _timeout())
+    return cached
+
+
+def month(year, month, today=None):
+    found = month_counts(year, month, today)
+    return [
+        [
+            Day(day, found.get(day, {}), outside=day.month != month)
+            for day in week
+        ]
+        for week in calendar.Calendar().monthdatescalendar(year, month)
+    ]
+
+
+def week(year, number):
+    first = date.fromisocalendar(year, number, 1)
+    days = [first + timedelta(days=offset) for offset in range(7)]
+    found = counts(days[0], days[-1])
+    return [[Day(day, found.get(day, {})) for day in days]]
+
+
+def invalidate(deadlines):
+    field = Task._meta.get_field("deadline")
+    keys = {
+        MONTH_KEY.format(year=deadline.year, month=deadline.month)
+        for deadline in map(field.to_python, deadlines)
+        if deadline is not None
+    }
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_tasks(task_ids):
+    # Call it before deleting the tasks.
+    invalidate(Task.objects.filter(pk__in=task_ids).dates("deadline", "month"))
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    BooleanField,
+    Count,
+    ExpressionWrapper,
+    F,
+    Q,
+    Window
+)
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from task_manager import jobs
+from task_manager.models import Task, TaskDigest
+
+
+@jobs.register("refresh_digests", every="DIGEST_INTERVAL")
+def refresh_digests():
+    # Fans out one job per range of workers so several job workers can
+    # share the refresh and a failure only retries its own range.
+    worker_ids = get_user_model().objects.order_by("pk").values_list(
+        "pk", flat=True
+    )
+    batch_size = settings.DIGEST_BATCH_SIZE
+    payloads, batch = [], []
+    for worker_id in worker_ids.iterator(chunk_size=batch_size):
+        batch.append(worker_id)
+        if len(batch) == batch_size:
+            payloads.append({"first": batch[0], "last": batch[-1]})
+            batch = []
+    if batch:
+        payloads.append({"first": batch[0], "last": batch[-1]})
+    jobs.enqueue_many("refresh_digest_batch", payloads)
+
+
+@jobs.register("refresh_digest_batch")
+def refresh_digest_batch(first, last):
+    worker_ids = list(
+        get_user_model().objects.filter(pk__range=(first, last))
+        .values_list("pk", flat=True)
+    )
+    compute_digests(worker_ids)
+
+
+def compute_digests(worker_ids, today=None):
+    # Two set-based queries for the whole batch: the counts, and the first
+    # few tasks of each worker ranked by a window function.
+    today = today or timezone.localdate()
+    due_soon_until = today + timedelta(
+        days=settings.DIGEST_DUE_SOON_DAYS
+    )
+    is_overdue = Q(task__deadline__lt=today)
+    is_due_soon = Q(
+        task__deadline__gte=today, task__deadline__lte=due_soon_until
+    )
+    links = Task.assignees.through.objects.filter(
+        worker_id__in=worker_ids, task__is_completed=False
+    )
+    counts = {
+        row["worker_id"]: row
+        for row in links.values("worker_id").annotate(
+            overdue=Count("pk", filter=is_overdue),
+            due_soon=Count("pk", filter=is_due_soon)
+        )
+    }
+    items = {worker_id: ([], []) for worker_id in worker_ids}
+    ranked = links.filter(task__deadline__lte=due_soon_until).annotate(
+        is_overdue=ExpressionWrapper(is_overdue, output_field=BooleanField()),
+        position=Window(
+            RowNumber(),
+            partition_by=[F("worker_id"), F("is_overdue")],
+            order_by=[F("task__deadline").asc(), F("task_id").asc()]
+        )
+    ).filter(
+        position__lte=settings.DIGEST_ITEMS
+    ).order_by(
+        "worker_id", "task__deadline", "task_id"
+    ).values_list(
+        "worker_id", "is_overdue", "task_id", "task__name", "task__deadline"
+    )
+    for worker_id, overdue, task_id, name, deadline in ranked:
+        items[worker_id][0 if overdue else 1].append(
+            {"id": task_id, "name": name, "deadline": deadline.isoformat()}
+        )
+
+    now = timezone.now()
+    digests = [
+        TaskDigest(
+            worker_id=worker_id,
+            overdue_count=counts.get(worker_id, {}).get("overdue", 0),
+            due_soon_count=counts.get(worker_id, {}).get("due_soon", 0),
+            overdue=overdue,
+            due_soon=due_soon,
+            computed_at=now
+        )
+        for worker_id, (overdue, due_soon) in items.items()
+    ]
+    return TaskDigest.objects.bulk_create(
+        digests,
+        update_conflicts=True,
+        unique_fields=["worker"],
+        update_fields=[
+            "overdue_count",
+            "due_soon_count",
+            "overdue",
+            "due_soon",
+            "computed_at",
+        ]
+    )
@@ -0,0 +1,106 @@
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from task_manager.models import TaskEvent
+
+# Events of the current request, written with one INSERT when it ends.
+# Outside a request (commands, jobs) each event is written on commit.
+_pending = ContextVar("task_events", default=None)
+
+
+def record(task_id, kind, changes=None):
+    record_many([(task_id, kind, changes)])
+
+
+def record_many(entries):
+    now = timezone.now()
+    events = [
+        TaskEvent(
+            task_id=task_id,
+            kind=kind,
+            changes=changes or {},
+            created_at=now
+        )
+        for task_id, kind, changes in entries
+    ]
+    if not events:
+        return
+
+    def keep():
+        pending = _pending.get()
+        if pending is None:
+            TaskEvent.objects.bulk_create(events)
+        else:
+            pending.extend(events)
+
+    # Events of a rolled back transaction are dropped with it.
+    transaction.on_commit(keep)
+
+
+def collect():
+    return _pending.set([])
+
+
+def release(token):
+    events = _pending.get()
+    _pending.reset(token)
+    return events
+
+
+def save(events, actor_id):
+    for event in events:
+        event.actor_id = actor_id
+    TaskEvent.objects.bulk_create(events)
+
+
+async def asave(events, actor_id):
+    for event in events:
+        event.actor_id = actor_id
+    await TaskEvent.objects.abulk_create(events)
+
+
+def task_saved(task, created):
+    if created:
+        record(task.pk, "created")
+        return
+    before = getattr(task, "_logged_state", None)
+    if before is None:
+        return
+    after = task.logged_state()
+    changes = {
+        name: [before[name], after[name]]
+        for name in before.keys() & after.keys()
+        if before[name] != after[name]
+    }
+    if not changes:
+        return
+    kind = "updated"
+    if "is_completed" in changes:
+        kind = "completed" if task.is_completed else "reopened"
+    record(task.pk, kind, changes)
+
+
+def attach_workers(task_events):
+    # Names the workers of the assignee events on a page in one query.
+    worker_ids = {
+        worker_id
+        for event in task_events
+        for worker_id in event.changes.get("workers", [])
+    }
+    names = {}
+    if worker_ids:
+        names = {
+            worker.pk: worker.get_full_name() or worker.username
+            for worker in get_user_model().objects.filter(
+                pk__in=worker_ids
+            ).only("username", "first_name", "last_name")
+        }
+    for event in task_events:
+        event.workers = [
+            names.get(worker_id, f"#{worker_id}")
+            for worker_id in event.changes.get("workers", [])
+        ]
+    return task_events
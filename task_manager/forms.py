@@ -1,9 +1,11 @@
 from django import forms
+from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm, UserChangeForm
 from django.utils import timezone
 from django_select2.forms import Select2MultipleWidget
 
-from task_manager.models import Worker, Task, TaskType
+from task_manager import bulk
+from task_manager.models import Position, Worker, Task, TaskType
 
 
 class TaskForm(forms.ModelForm):
@@ -92,3 +94,48 @@ class TaskTypeForm(forms.ModelForm):
     class Meta:
         model = TaskType
         fields = ["name"]
+
+
+class PositionForm(forms.ModelForm):
+    class Meta:
+        model = Position
+        fields = ["name"]
+
+
+class IdListField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        try:
+            return sorted({int(item) for item in value or []})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Enter a list of task ids.")
+
+
+class TaskBulkActionForm(forms.Form):
+    action = forms.ChoiceField(
+        choices=bulk.ACTIONS.items(),
+        widget=forms.Select(attrs={"class": "form-select"})
+    )
+    tasks = IdListField()
+    priority = forms.ChoiceField(
+        choices=Task.PRIORITY_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={"class": "form-select"})
+    )
+    workers = forms.ModelMultipleChoiceField(
+        queryset=get_user_model().objects.all(),
+        required=False,
+        widget=Select2MultipleWidget(attrs={"class": "form-control"})
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        if action == "set_priority" and not cleaned_data.get("priority"):
+            self.add_error("priority", "Choose the new priority.")
+        if action in ("add_assignees", "remove_assignees") and not (
+            cleaned_data.get("workers")
+        ):
+            self.add_error("workers", "Choose at least one worker.")
+        return cleaned_data
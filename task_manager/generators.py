@@ -0,0 +1,186 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_manager import counters, dashboard, deadlines, search, versions
+from task_manager.models import Position, Task, TaskType
+
+PRIORITY_WEIGHTS = {"urgent": 10, "high": 25, "medium": 45, "low": 20}
+# Most tasks have one or two assignees; a few have a crowd.
+ASSIGNEE_WEIGHTS = {1: 50, 2: 28, 3: 12, 4: 6, 5: 3, 8: 1}
+WORDS = [
+    "api", "billing", "cache", "client", "dashboard", "database", "deploy",
+    "docs", "export", "fix", "import", "invoice", "login", "migration",
+    "mobile", "onboarding", "payment", "report", "search", "security",
+    "signup", "sync", "test", "upgrade",
+]
+# Generated workers can log in with this password.
+PASSWORD = "generated-password"
+
+
+# Builds a deterministic dataset: the same seed and sizes always produce
+# the same rows. Rows are written batch by batch, so memory stays flat
+# however many tasks are generated; only worker ids are kept around.
+class DatasetGenerator:
+    def __init__(self, seed=0, batch_size=5000, progress=None):
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.progress = progress or (lambda label, done, total: None)
+        self.today = timezone.localdate()
+        self.prefix = f"g{seed}"
+
+    def exists(self):
+        # Names are unique, so a seed can only be generated once.
+        return any(
+            queryset.exists()
+            for queryset in [
+                Position.objects.filter(name__startswith=f"{self.prefix} "),
+                TaskType.objects.filter(name__startswith=f"{self.prefix} "),
+                get_user_model().objects.filter(
+                    username__startswith=f"{self.prefix}-"
+                ),
+            ]
+        )
+
+    def generate(self, positions, task_types, workers, tasks):
+        position_ids = self.positions(positions)
+        task_type_ids = self.task_types(task_types)
+        worker_ids = self.workers(workers, position_ids)
+        self.tasks(tasks, task_type_ids, worker_ids)
+        self.refresh_derived()
+
+    def create(self, label, model, total, build):
+        ids = []
+        for start in range(0, total, self.batch_size):
+            objects = model.objects.bulk_create(
+                build(index)
+                for index in range(start, min(start + self.batch_size, total))
+            )
+            ids.extend(obj.pk for obj in objects)
+            self.progress(label, len(ids), total)
+        return ids
+
+    def positions(self, total):
+        return self.create(
+            "positions",
+            Position,
+            total,
+            lambda index: Position(name=f"{self.prefix} Position {index}")
+        )
+
+    def task_types(self, total):
+        return self.create(
+            "task types",
+            TaskType,
+            total,
+            lambda index: TaskType(name=f"{self.prefix} Type {index}")
+        )
+
+    def workers(self, total, position_ids):
+        # Hashing is slow by design, so every worker shares one hash.
+        password = make_password(PASSWORD)
+        return self.create(
+            "workers",
+            get_user_model(),
+            total,
+            lambda index: get_user_model()(
+                username=f"{self.prefix}-worker{index}",
+                first_name=self.random.choice(WORDS).capitalize(),
+                last_name=f"Worker{index}",
+                password=password,
+                position_id=self.random.choice(position_ids)
+                if position_ids else None
+            )
+        )
+
+    def task(self, index, task_type_ids, worker_ids, workload):
+        # Deadlines cluster around the next two weeks, with a tail of
+        # overdue work, most of which is done.
+        deadline = self.today + timedelta(
+            days=int(self.random.triangular(-90, 180, 14))
+        )
+        done_chance = 0.8 if deadline < self.today else 0.15
+        return Task(
+            name=f"{self.prefix} Task {index}",
+            description=" ".join(self.random.choices(WORDS, k=12)),
+            deadline=deadline,
+            is_completed=self.random.random() < done_chance,
+            priority=self.random.choices(
+                list(PRIORITY_WEIGHTS), weights=PRIORITY_WEIGHTS.values()
+            )[0],
+            task_type_id=self.random.choice(task_type_ids),
+            created_by_id=self.random.choices(
+                worker_ids, cum_weights=workload
+            )[0]
+        )
+
+    def assignees(self, worker_ids, workload):
+        count = self.random.choices(
+            list(ASSIGNEE_WEIGHTS), weights=ASSIGNEE_WEIGHTS.values()
+        )[0]
+        return set(
+            self.random.choices(worker_ids, cum_weights=workload, k=count)
+        )
+
+    def workload(self, worker_ids):
+        # A few busy workers carry much of the load (Zipf-like).
+        total, cumulative = 0, []
+        for rank in range(len(worker_ids)):
+            total += 1 / (rank + 1) ** 0.8
+            cumulative.append(total)
+        return cumulative
+
+    def link_statement(self):
+        through = Task.assignees.through
+        quote = connection.ops.quote_name
+        return (
+            f"INSERT INTO {quote(through._meta.db_table)} "
+            f"({quote(through._meta.get_field('task').column)}, "
+            f"{quote(through._meta.get_field('worker').column)}) "
+            "VALUES (%s, %s)"
+        )
+
+    def tasks(self, total, task_type_ids, worker_ids):
+        # Assignee links go in through executemany rather than through
+        # model instances: there are more of them than tasks, and nothing
+        # needs their ids back.
+        workload = self.workload(worker_ids)
+        statement = self.link_statement()
+        created = 0
+        for start in range(0, total, self.batch_size):
+            end = min(start + self.batch_size, total)
+            # Each task draws its assignees right after its own fields, so
+            # the batch size does not change which rows a seed produces.
+            tasks, links = [], []
+            for index in range(start, end):
+                tasks.append(
+                    self.task(index, task_type_ids, worker_ids, workload)
+                )
+                links.append(self.assignees(worker_ids, workload))
+            with transaction.atomic():
+                tasks = Task.objects.bulk_create(tasks)
+                with connection.cursor() as cursor:
+                    cursor.executemany(
+                        statement,
+                        [
+                            (task.pk, worker_id)
+                            for task, assigned in zip(tasks, links)
+                            for worker_id in sorted(assigned)
+                        ]
+                    )
+                search.get_backend().index([task.pk for task in tasks])
+                deadlines.invalidate(task.deadline for task in tasks)
+            created += len(tasks)
+            self.progress("tasks", created, total)
+        return created
+
+    def refresh_derived(self):
+        # bulk_create skips the signals that maintain derived state.
+        counters.recount()
+        versions.bump("position", "tasktype", "worker", "task")
+        dashboard.invalidate()
@@ -0,0 +1,218 @@
+import logging
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from task_manager.models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+# Jobs the worker enqueues by itself, with the name of the setting giving
+# the seconds between the end of one run and the start of the next.
+PERIODIC = {}
+ACTIVE = ("queued", "running")
+
+
+def register(name, every=None):
+    def decorator(function):
+        HANDLERS[name] = function
+        if every is not None:
+            PERIODIC[name] = every
+        return function
+
+    return decorator
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None):
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        run_after=timezone.now() + timedelta(seconds=delay),
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS
+    )
+
+
+def enqueue_many(name, payloads):
+    if name not in HANDLERS:
+        raise ValueError(f"Unknown job: {name}")
+    now = timezone.now()
+    return Job.objects.bulk_create(
+        [
+            Job(
+                name=name,
+                payload=payload,
+                run_after=now,
+                max_attempts=settings.JOB_MAX_ATTEMPTS
+            )
+            for payload in payloads
+        ]
+    )
+
+
+def schedule_periodic():
+    now = timezone.now()
+    for name, setting in PERIODIC.items():
+        if Job.objects.filter(name=name, status__in=ACTIVE).exists():
+            continue
+        last_run = Job.objects.filter(name=name).aggregate(
+            Max("finished_at")
+        )["finished_at__max"]
+        interval = timedelta(seconds=getattr(settings, setting))
+        # Workers that both found nothing pending race to insert; the
+        # job_periodic_pending_unique constraint keeps only the first.
+        Job.objects.bulk_create(
+            [
+                Job(
+                    name=name,
+                    periodic=True,
+                    run_after=now if last_run is None else max(
+                        now, last_run + interval
+                    ),
+                    max_attempts=settings.JOB_MAX_ATTEMPTS
+                )
+            ],
+            ignore_conflicts=True
+        )
+
+
+def requeue_stale():
+    # A worker that died mid-job leaves it running; hand it to another,
+    # unless it has used up its attempts, as a job that kills its worker
+    # every time would.
+    now = timezone.now()
+    stale = Job.objects.filter(
+        status="running",
+        locked_at__lt=now - timedelta(
+            seconds=settings.JOB_LOCK_TIMEOUT
+        )
+    )
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status="failed",
+        finished_at=now,
+        last_error="The worker running the job stopped responding."
+    )
+    return stale.update(status="queued", locked_by="", locked_at=None)
+
+
+def purge_finished():
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.JOB_RETENTION
+    )
+    Job.objects.filter(status="done", finished_at__lt=cutoff).delete()
+
+
+def claim(worker_name, limit):
+    now = timezone.now()
+    with transaction.atomic():
+        # SKIP LOCKED lets workers claim side by side on PostgreSQL; the
+        # status guard on the update keeps backends without it correct.
+        job_ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status="queued", run_after__lte=now)
+            .order_by("run_after", "id")
+            .values_list("pk", flat=True)[:limit]
+        )
+        Job.objects.filter(pk__in=job_ids, status="queued").update(
+            status="running",
+            locked_by=worker_name,
+            locked_at=now,
+            attempts=F("attempts") + 1
+        )
+    return list(
+        Job.objects.filter(
+            pk__in=job_ids,
+            status="running",
+            locked_by=worker_name,
+            locked_at=now
+        )
+    )
+
+
+def run(job):
+    try:
+        handler = HANDLERS.get(job.name)
+        if handler is None:
+            raise LookupError(f"No handler registered for {job.name}")
+        handler(**job.payload)
+    except Exception:
+        fail(job, traceback.format_exc())
+        return False
+    Job.objects.filter(pk=job.pk).update(
+        status="done", finished_at=timezone.now(), last_error=""
+    )
+    return True
+
+
+def fail(job, error):
+    now = timezone.now()
+    logger.warning("Job %s failed (attempt %d)", job, job.attempts)
+    if job.attempts < job.max_attempts:
+        delay = settings.JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        Job.objects.filter(pk=job.pk).update(
+            status="queued",
+            run_after=now + timedelta(seconds=delay),
+            locked_by="",
+            locked_at=None,
+            last_error=error
+        )
+    else:
+        Job.objects.filter(pk=job.pk).update(
+            status="failed", finished_at=now, last_error=error
+        )
+
+
+class JobWorker:
+    def __init__(self, concurrency=None, batch_size=None, poll_interval=None):
+        self.concurrency = max(
+            concurrency or settings.JOB_CONCURRENCY, 1
+        )
+        self.batch_size = batch_size or settings.JOB_BATCH_SIZE
+        self.poll_interval = (
+            poll_interval or settings.JOB_POLL_INTERVAL
+        )
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.stopping = threading.Event()
+
+    def run_in_thread(self, job):
+        try:
+            return run(job)
+        finally:
+            connections.close_all()
+
+    def tick(self):
+        schedule_periodic()
+        requeue_stale()
+        jobs = claim(self.name, self.batch_size)
+        if self.concurrency == 1 or len(jobs) < 2:
+            for job in jobs:
+                run(job)
+        else:
+            with ThreadPoolExecutor(self.concurrency) as pool:
+                list(pool.map(self.run_in_thread, jobs))
+        return len(jobs)
+
+    def run_until_empty(self):
+        processed = 0
+        while ran := self.tick():
+            processed += ran
+        return processed
+
+    def run_forever(self):
+        while not self.stopping.is_set():
+            if not self.tick():
+                purge_finished()
+                self.stopping.wait(self.poll_interval)
+
+    def stop(self, *args):
+        self.stopping.set()
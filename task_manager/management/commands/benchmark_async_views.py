@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient
+from django.urls import reverse
+
+from task_manager.benchmarking import BenchmarkError, default_host, get_worker
+from task_manager.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests per second of the sync and async variants of the "
+        "read-only task pages under concurrent load. Requests go through "
+        "the ASGI handler in-process, so the network and the server are "
+        "left out of the numbers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--username",
+            help="Worker to log in as. Defaults to the one with most tasks."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=200,
+            help="Requests sent to each page."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Requests in flight at the same time."
+        )
+        parser.add_argument(
+            "--host",
+            help="Host header to send. Defaults to the first allowed host."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            worker = get_worker(options["username"])
+        except BenchmarkError as error:
+            raise CommandError(error)
+        task = Task.objects.filter(assignees=worker).first()
+        if task is None:
+            raise CommandError(f"{worker.username} has no tasks to show.")
+        if settings.DEBUG:
+            self.stderr.write(
+                "DEBUG is on; query logging and the debug toolbar skew "
+                "the results."
+            )
+
+        pages = [
+            ("index", "async-index", []),
+            ("user-tasks", "async-user-tasks", []),
+            ("task-detail", "async-task-detail", [task.pk]),
+            ("worker-detail", "async-worker-detail", [worker.pk]),
+            (
+                "task-type-detail",
+                "async-task-type-detail",
+                [task.task_type_id]
+            ),
+        ]
+        results = async_to_sync(self.run_pages)(
+            worker,
+            pages,
+            options["host"] or default_host(),
+            options["requests"],
+            max(options["concurrency"], 1)
+        )
+        self.stdout.write(
+            f"{'page':<18}{'sync req/s':>12}{'async req/s':>13}{'ratio':>8}"
+        )
+        for name, sync_rate, async_rate in results:
+            self.stdout.write(
+                f"{name:<18}{sync_rate:>12.1f}{async_rate:>13.1f}"
+                f"{async_rate / sync_rate:>8.2f}"
+            )
+
+    async def run_pages(self, worker, pages, host, total, concurrency):
+        client = AsyncClient(headers={"host": host})
+        await client.aforce_login(worker)
+        results = []
+        for name, async_name, args in pages:
+            rates = []
+            for url_name in (name, async_name):
+                url = reverse(f"task-manager:{url_name}", args=args)
+                # Warm the caches and connections before timing.
+                await self.fetch(client, url)
+                rates.append(
+                    await self.measure(client, url, total, concurrency)
+                )
+            results.append((name, *rates))
+        return results
+
+    async def fetch(self, client, url):
+        response = await client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"{url} returned {response.status_code}")
+
+    async def measure(self, client, url, total, concurrency):
+        pending = iter(range(total))
+
+        async def send():
+            for _ in pending:
+                await self.fetch(client, url)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
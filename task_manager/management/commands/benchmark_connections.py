@@ -0,0 +1,86 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from task_manager.benchmarking import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what a request pays for its database connection: a query "
+        "on a freshly opened connection (TCP and TLS handshakes, or a pool "
+        "checkout when DATABASE_POOL is on) against the same query on a "
+        "connection kept open between requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to measure."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Queries timed in each mode."
+        )
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if alias not in connections:
+            raise CommandError(f"Unknown database alias: {alias}")
+        connection = connections[alias]
+        total = max(options["requests"], 1)
+        pooled = "pool" in connection.settings_dict["OPTIONS"]
+        self.stdout.write(
+            f"{alias}: {connection.vendor}, "
+            f"sslmode={connection.settings_dict['OPTIONS'].get('sslmode')}, "
+            f"pool={'on' if pooled else 'off'}"
+        )
+
+        def reconnect():
+            connection.close()
+
+        def persistent():
+            connection.ensure_connection()
+
+        rows = [
+            ("pool checkout" if pooled else "new connection", reconnect),
+            ("persistent", persistent),
+        ]
+        results = []
+        for label, prepare in rows:
+            # Warm up imports and the server's plan cache before timing.
+            self.time_query(connection, prepare)
+            samples = [
+                self.time_query(connection, prepare) for _ in range(total)
+            ]
+            results.append((label, samples))
+
+        self.stdout.write(
+            f"{'mode':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+        )
+        for label, samples in results:
+            self.stdout.write(
+                f"{label:<16}"
+                f"{sum(samples) / len(samples) * 1000:>10.2f}"
+                f"{percentile(samples, 0.5) * 1000:>10.2f}"
+                f"{percentile(samples, 0.95) * 1000:>10.2f}"
+            )
+        (_, opened), (_, kept) = results
+        saved = (sum(opened) - sum(kept)) / total
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reusing connections saves {saved * 1000:.2f} ms per request"
+            )
+        )
+
+    def time_query(self, connection, prepare):
+        prepare()
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        return time.perf_counter() - started
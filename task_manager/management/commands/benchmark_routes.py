@@ -0,0 +1,179 @@
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarking import (
+    QUERY_STRINGS,
+    BenchmarkError,
+    RouteBenchmark,
+    compare,
+    get_worker,
+    peak_rss_mb,
+    route_targets,
+    routes
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test every named GET route of task_manager/urls.py through "
+        "the WSGI and ASGI handlers in-process, with concurrent logged-in "
+        "clients. Reports latency percentiles, requests per second, "
+        "queries per request and peak RSS, and compares them with a "
+        "baseline saved by an earlier run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            action="store_true",
+            help="Run generate_data first; see --workers and --tasks."
+        )
+        parser.add_argument("--positions", type=int, default=50)
+        parser.add_argument("--task-types", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=2000)
+        parser.add_argument("--tasks", type=int, default=100000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the generated dataset."
+        )
+        parser.add_argument(
+            "--username",
+            help="Worker to log in as. Defaults to the one with most tasks."
+        )
+        parser.add_argument(
+            "--host",
+            help="Host header to send. Defaults to the first allowed host."
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=100,
+            help="Requests sent to each route."
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=8,
+            help="Clients sending requests at the same time."
+        )
+        parser.add_argument(
+            "--interface",
+            choices=["wsgi", "asgi", "both"],
+            default="both"
+        )
+        parser.add_argument(
+            "--routes",
+            nargs="+",
+            help="Only these URL names."
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON file of an earlier run to compare with."
+        )
+        parser.add_argument(
+            "--save-baseline",
+            help="Write this run's results to a JSON file."
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed slowdown before a route counts as a regression."
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when a route regressed."
+        )
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write(
+                "DEBUG is on; query logging and the debug toolbar skew "
+                "the results."
+            )
+        if options["generate"]:
+            call_command(
+                "generate_data",
+                positions=options["positions"],
+                task_types=options["task_types"],
+                workers=options["workers"],
+                tasks=options["tasks"],
+                seed=options["seed"],
+                stdout=self.stdout
+            )
+
+        try:
+            worker = get_worker(options["username"])
+            targets = route_targets(worker)
+        except BenchmarkError as error:
+            raise CommandError(error)
+        benchmark = RouteBenchmark(
+            worker,
+            options["requests"],
+            options["concurrency"],
+            options["host"]
+        )
+        interfaces = (
+            ["wsgi", "asgi"] if options["interface"] == "both"
+            else [options["interface"]]
+        )
+
+        self.stdout.write(
+            f"{'route':<34}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+            f"{'p99 ms':>9}{'queries':>9}{'errors':>8}"
+        )
+        results = {}
+        for name, url in routes(targets, options["routes"]):
+            for interface in interfaces:
+                result = benchmark.measure(
+                    interface, name, url, QUERY_STRINGS.get(name)
+                )
+                results[f"{interface}:{name}"] = result
+                self.stdout.write(
+                    f"{interface + ':' + name:<34}{result['rps']:>9.1f}"
+                    f"{result['p50'] * 1000:>9.2f}"
+                    f"{result['p95'] * 1000:>9.2f}"
+                    f"{result['p99'] * 1000:>9.2f}"
+                    f"{result['queries']:>9.1f}{result['errors']:>8}"
+                )
+        peak = peak_rss_mb()
+        if peak is not None:
+            self.stdout.write(f"Peak RSS: {peak:.1f} MB")
+
+        if options["save_baseline"]:
+            with open(options["save_baseline"], "w") as stream:
+                json.dump(
+                    {"routes": results, "peak_rss_mb": peak},
+                    stream,
+                    indent=2
+                )
+        if options["baseline"]:
+            self.compare(results, peak, options)
+
+    def compare(self, results, peak, options):
+        try:
+            with open(options["baseline"]) as stream:
+                baseline = json.load(stream)
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Cannot read the baseline: {error}")
+        regressions = compare(
+            results, baseline.get("routes", {}), options["tolerance"]
+        )
+        before = baseline.get("peak_rss_mb")
+        if peak and before and peak > before * (1 + options["tolerance"]):
+            regressions.append(
+                f"peak RSS {before:.1f} -> {peak:.1f} MB"
+            )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions"))
+            return
+        for regression in regressions:
+            self.stdout.write(self.style.WARNING(f"Regression: {regression}"))
+        if options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regressions")
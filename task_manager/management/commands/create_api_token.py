@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue an API token for a worker and print it. Only a digest is "
+        "stored, so the key cannot be shown again; revoke it by deleting "
+        "the token in the admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username")
+        parser.add_argument(
+            "--name",
+            default="",
+            help="What the token is for, shown in the admin."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            worker = get_user_model().objects.get(
+                username=options["username"]
+            )
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"Unknown worker: {options['username']}")
+        self.stdout.write(ApiToken.issue(worker, options["name"]))
@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from task_manager.models import Task
+from task_manager.transfer import WRITERS, iter_task_records
+
+
+class Command(BaseCommand):
+    help = "Stream every task as JSON Lines or CSV with constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default="-",
+            help="Output file, or - for stdout."
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(WRITERS),
+            help="Defaults to the file extension, or jsonl."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of tasks fetched per query."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        output_format = options["format"] or (
+            "csv" if path.endswith(".csv") else "jsonl"
+        )
+        records = iter_task_records(
+            Task.objects.all(), chunk_size=options["chunk_size"]
+        )
+        if path == "-":
+            WRITERS[output_format](records, sys.stdout)
+            return
+        with open(path, "w", newline="", encoding="utf-8") as stream:
+            WRITERS[output_format](records, stream)
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.generators import PASSWORD, DatasetGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic dataset for scale testing: positions, "
+        "task types, workers and tasks with realistic priorities, "
+        "deadlines and assignee counts. The same --seed always produces "
+        "the same rows, and memory stays flat however many tasks are "
+        "generated."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--positions", type=int, default=50)
+        parser.add_argument("--task-types", type=int, default=200)
+        parser.add_argument("--workers", type=int, default=2000)
+        parser.add_argument("--tasks", type=int, default=100000)
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seeds the random choices and prefixes every name."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows inserted per transaction."
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+        if options["tasks"] and not (
+            options["workers"] and options["task_types"]
+        ):
+            raise CommandError("Tasks need at least one worker and type.")
+        generator = DatasetGenerator(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            progress=self.report_progress
+        )
+        if generator.exists():
+            raise CommandError(
+                f"Seed {options['seed']} was already generated; "
+                "pick another --seed."
+            )
+        self.started = time.perf_counter()
+        self.label = None
+        generator.generate(
+            options["positions"],
+            options["task_types"],
+            options["workers"],
+            options["tasks"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {options['tasks']} tasks for "
+                f"{options['workers']} workers in "
+                f"{time.perf_counter() - self.started:.1f}s. Workers log "
+                f"in as {generator.prefix}-worker<n> / {PASSWORD}"
+            )
+        )
+
+    def report_progress(self, label, done, total):
+        if label != self.label:
+            self.label, self.label_started = label, time.perf_counter()
+        elapsed = max(time.perf_counter() - self.label_started, 1e-6)
+        self.stdout.write(
+            f"\r{label}: {done}/{total} ({done / elapsed:.0f} rows/s)",
+            ending=""
+        )
+        if done == total:
+            self.stdout.write("")
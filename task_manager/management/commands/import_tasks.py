@@ -0,0 +1,48 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from task_manager.transfer import READERS, TaskImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream tasks from JSON Lines or CSV and insert them in batches. "
+        "Task types are created on demand; tasks whose name already exists "
+        "are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Defaults to the file extension, or jsonl."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tasks inserted per transaction."
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        input_format = options["format"] or (
+            "csv" if path.endswith(".csv") else "jsonl"
+        )
+        importer = TaskImporter(batch_size=options["batch_size"])
+        if path == "-":
+            importer.run(READERS[input_format](sys.stdin))
+        else:
+            with open(path, newline="", encoding="utf-8") as stream:
+                importer.run(READERS[input_format](stream))
+
+        for error in importer.errors:
+            self.stderr.write(error)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {importer.created} tasks, "
+                f"skipped {importer.skipped}"
+            )
+        )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from task_manager import counters, dashboard
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the open/completed task counters on workers and repair "
+        "the ones that drifted, e.g. after writes made outside the app."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of workers checked per transaction."
+        )
+
+    def handle(self, *args, **options):
+        repaired = counters.recount(batch_size=options["batch_size"])
+        if repaired:
+            dashboard.invalidate()
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired task counters of {repaired} workers")
+        )
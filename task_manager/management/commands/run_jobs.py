@@ -0,0 +1,51 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from task_manager.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs queued in the database, including the periodic "
+        "refresh of the task digests. Start as many as needed; they claim "
+        "jobs without stepping on each other."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            help="Jobs run in parallel threads. Defaults to JOB_CONCURRENCY."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            help="Jobs claimed at a time. Defaults to JOB_BATCH_SIZE."
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            help="Seconds to sleep when the queue is empty."
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run every job that is due, then exit."
+        )
+
+    def handle(self, *args, **options):
+        worker = JobWorker(
+            concurrency=options["concurrency"],
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"]
+        )
+        if options["once"]:
+            processed = worker.run_until_empty()
+            self.stdout.write(self.style.SUCCESS(f"Ran {processed} jobs"))
+            return
+        # Finish the jobs in hand before exiting on a deploy or Ctrl-C.
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        self.stdout.write(f"Worker {worker.name} waiting for jobs")
+        worker.run_forever()
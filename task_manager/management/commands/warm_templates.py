@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.templating import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile every project template and report how long each one took. "
+        "Production workers do the same at boot; this command shows what "
+        "that costs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--engine",
+            default="django",
+            help="Alias of the template engine in settings.TEMPLATES."
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_templates(options["engine"])
+        for name, seconds in sorted(
+            timings, key=lambda timing: timing[1], reverse=True
+        ):
+            self.stdout.write(f"{seconds * 1000:8.2f} ms  {name}")
+        total = sum(seconds for _, seconds in timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Compiled {len(timings)} templates in {total * 1000:.1f} ms"
+            )
+        )
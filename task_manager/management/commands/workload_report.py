@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from task_manager import analytics
+from task_manager.models import Task
+
+
+def percent(value):
+    return "-" if value is None else f"{value:.1f}%"
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh the workload rollup and print open, completed and overdue "
+        "tasks per position, task type and priority. Positions count "
+        "assignments, so a task with two assignees counts twice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recount every task instead of the changed groups only."
+        )
+
+    def handle(self, *args, **options):
+        full, written = analytics.refresh(full=options["full"])
+        self.stdout.write(
+            f"{'Full' if full else 'Incremental'} refresh wrote "
+            f"{written} rollup rows"
+        )
+        priorities = dict(Task.PRIORITY_CHOICES)
+        reports = [
+            ("Position", analytics.by_position(), "No position"),
+            ("Task type", analytics.by_task_type(), None),
+            ("Priority", analytics.by_priority(), None),
+        ]
+        for title, rows, empty in reports:
+            self.stdout.write("")
+            self.stdout.write(
+                f"{title:<24}{'tasks':>8}{'open':>8}{'done':>8}"
+                f"{'overdue':>9}{'done %':>9}{'late %':>9}"
+            )
+            for row in rows:
+                label = row.get("label") or empty
+                if "priority" in row:
+                    label = priorities.get(row["priority"], row["priority"])
+                self.stdout.write(
+                    f"{str(label)[:23]:<24}{row['tasks']:>8}"
+                    f"{row['open_tasks']:>8}{row['completed_tasks']:>8}"
+                    f"{row['overdue_tasks']:>9}"
+                    f"{percent(row['completion_percent']):>9}"
+                    f"{percent(row['overdue_percent']):>9}"
+                )
@@ -0,0 +1,99 @@
+import bisect
+import threading
+
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, view, value):
+        with self.lock:
+            counts, total = self.series.get(
+                view, ([0] * (len(self.buckets) + 1), 0)
+            )
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.series[view] = (counts, total + value)
+
+    def samples(self):
+        with self.lock:
+            series = {
+                view: (list(counts), total)
+                for view, (counts, total) in self.series.items()
+            }
+        for view, (counts, total) in sorted(series.items()):
+            label = view.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket{{view="{label}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            yield f'{self.name}_sum{{view="{label}"}} {total}'
+            yield f'{self.name}_count{{view="{label}"}} {cumulative}'
+
+    def exposition(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        yield from self.samples()
+
+    def reset(self):
+        with self.lock:
+            self.series.clear()
+
+
+# Histograms live in process memory, so every worker process exposes its
+# own series and Prometheus aggregates them across scrape targets.
+QUERIES = Histogram(
+    "task_manager_view_queries",
+    "SQL queries executed per request.",
+    QUERY_BUCKETS
+)
+DB_SECONDS = Histogram(
+    "task_manager_view_db_seconds",
+    "Time spent executing SQL per request.",
+    SECONDS_BUCKETS
+)
+TEMPLATE_SECONDS = Histogram(
+    "task_manager_view_template_seconds",
+    "Time spent rendering templates per request.",
+    SECONDS_BUCKETS
+)
+DURATION_SECONDS = Histogram(
+    "task_manager_view_duration_seconds",
+    "Time spent handling each request.",
+    SECONDS_BUCKETS
+)
+RESPONSE_BYTES = Histogram(
+    "task_manager_view_response_bytes",
+    "Size of the response body.",
+    BYTES_BUCKETS
+)
+HISTOGRAMS = [
+    QUERIES,
+    DB_SECONDS,
+    TEMPLATE_SECONDS,
+    DURATION_SECONDS,
+    RESPONSE_BYTES,
+]
+
+
+def exposition():
+    return "\n".join(
+        line
+        for histogram in HISTOGRAMS
+        for line in histogram.exposition()
+    ) + "\n"
+
+
+def reset():
+    for histogram in HISTOGRAMS:
+        histogram.reset()
@@ -0,0 +1,208 @@
+import logging
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from task_manager import events, metrics, routers
+
+logger = logging.getLogger(__name__)
+
+# Concurrent async requests can share a connection, and with it each
+# other's execute wrappers; a wrapper only counts its own request.
+_active_metrics = ContextVar("active_metrics", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.render_started = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if _active_metrics.get() is not self:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+    def render_finished(self, response):
+        self.template_seconds += time.perf_counter() - self.render_started
+
+
+# Records query count, DB time, template render time, duration and
+# response size per URL name, and enforces the query_budget a view
+# declares for reads; writes fan out to signals and are not budgeted.
+# Keep it first in MIDDLEWARE so the session and user lookups are counted.
+class QueryMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with self.recording(request):
+            response = self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with self.recording(request):
+            response = await self.get_response(request)
+        self.record(request, response, started)
+        return response
+
+    def recording(self, request):
+        request.metrics = RequestMetrics()
+        stack = ExitStack()
+        token = _active_metrics.set(request.metrics)
+        stack.callback(_active_metrics.reset, token)
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(request.metrics))
+        return stack
+
+    def process_template_response(self, request, response):
+        # Runs after every other middleware, right before rendering.
+        request.metrics.render_started = time.perf_counter()
+        response.add_post_render_callback(request.metrics.render_finished)
+        return response
+
+    def record(self, request, response, started):
+        match = request.resolver_match
+        if match is None:
+            return
+        view = match.view_name
+        recorded = request.metrics
+        metrics.QUERIES.observe(view, recorded.queries)
+        metrics.DB_SECONDS.observe(view, recorded.db_seconds)
+        metrics.TEMPLATE_SECONDS.observe(view, recorded.template_seconds)
+        metrics.DURATION_SECONDS.observe(view, time.perf_counter() - started)
+        # Streamed bodies are produced after the view returns.
+        if not response.streaming:
+            metrics.RESPONSE_BYTES.observe(view, len(response.content))
+        if request.method in ("GET", "HEAD"):
+            self.check_budget(match, view, recorded.queries)
+
+    def check_budget(self, match, view, queries):
+        budget = getattr(
+            getattr(match.func, "view_class", match.func),
+            "query_budget",
+            None
+        )
+        if budget is None or queries <= budget:
+            return
+        message = f"{view} ran {queries} queries, over its budget of {budget}"
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+
+# Sends the reads of GET and HEAD requests to the replica alias when one is
+# configured. A request that writes pins its client to the primary for
+# REPLICA_PIN_SECONDS through a cookie, so the page a form redirects to
+# never shows the replica's older copy of what was just saved.
+class ReplicaRoutingMiddleware:
+    sync_capable = True
+    async_capable = True
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        routing = self.routing(request)
+        token = routers.current.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.current.reset(token)
+        return self.pin(request, response, routing)
+
+    async def __acall__(self, request):
+        routing = self.routing(request)
+        token = routers.current.set(routing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            routers.current.reset(token)
+        return self.pin(request, response, routing)
+
+    def routing(self, request):
+        use_replica = (
+            request.method in self.safe_methods
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+            and routers.REPLICA in settings.DATABASES
+        )
+        return routers.Routing(routers.REPLICA if use_replica else None)
+
+    def pin(self, request, response, routing):
+        # Raw SQL escapes the router, so unsafe methods always pin.
+        wrote = routing.wrote or request.method not in self.safe_methods
+        if wrote and routers.REPLICA in settings.DATABASES:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax"
+            )
+        return response
+
+
+# Writes the TaskEvents recorded while handling a request with one INSERT
+# after the view returns, attributed to the requesting user.
+class TaskEventMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = events.collect()
+        try:
+            return self.get_response(request)
+        finally:
+            recorded = events.release(token)
+            if recorded:
+                events.save(recorded, self.actor_id(request.user))
+
+    async def __acall__(self, request):
+        token = events.collect()
+        try:
+            return await self.get_response(request)
+        finally:
+            recorded = events.release(token)
+            if recorded:
+                await events.asave(
+                    recorded, self.actor_id(await request.auser())
+                )
+
+    def actor_id(self, user):
+        return user.pk if user.is_authenticated else None
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0006_alter_task_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["-deadline", "id"], name="task_deadline_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["deadline", "id"],
+                name="task_open_deadline_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "priority", "-deadline"],
+                name="task_status_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["task_type", "-deadline", "id"], name="task_type_deadline_idx"
+            ),
+        ),
+        # The auto-created through table only has (task_id, worker_id);
+        # "my tasks" queries start from the worker side.
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX task_assignee_worker_task_idx "
+                "ON task_manager_task_assignees (worker_id, task_id);"
+            ),
+            reverse_sql="DROP INDEX task_assignee_worker_task_idx;",
+        ),
+    ]
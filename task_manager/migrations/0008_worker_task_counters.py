@@ -0,0 +1,77 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:35
+
+import django.db.models.expressions
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def populate_task_counters(apps, schema_editor):
+    Worker = apps.get_model("task_manager", "Worker")
+    Task = apps.get_model("task_manager", "Task")
+    links = Task.assignees.through.objects.filter(worker=OuterRef("pk"))
+
+    def count(**filters):
+        return Coalesce(
+            Subquery(
+                links.filter(**filters)
+                .values("worker")
+                .annotate(count=Count("*"))
+                .values("count")
+            ),
+            0,
+        )
+
+    Worker.objects.update(
+        open_task_count=count(task__is_completed=False),
+        completed_task_count=count(task__is_completed=True),
+        overdue_task_count=count(
+            task__is_completed=False,
+            task__deadline__lt=timezone.localdate(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("task_manager", "0007_task_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="worker",
+            name="completed_task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="open_task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="worker",
+            name="overdue_task_count",
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("open_task_count"),
+                        "+",
+                        models.F("completed_task_count"),
+                    ),
+                    descending=True,
+                ),
+                models.F("id"),
+                name="worker_task_total_idx",
+            ),
+        ),
+        migrations.RunPython(
+            populate_task_counters, migrations.RunPython.noop
+        ),
+    ]
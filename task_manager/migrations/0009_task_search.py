@@ -0,0 +1,72 @@
+# Generated by Django 5.1.1 on 2026-10-18 02:37
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+POSTGRES_FORWARDS = [
+    "CREATE INDEX task_search_vector_idx "
+    "ON task_manager_task USING gin (search_vector);",
+    "CREATE INDEX task_name_trgm_idx "
+    "ON task_manager_task USING gin (name gin_trgm_ops);",
+    "UPDATE task_manager_task AS task SET search_vector = "
+    "setweight(to_tsvector('english', task.name), 'A') || "
+    "setweight(to_tsvector('english', type.name), 'B') || "
+    "setweight(to_tsvector('english', task.description), 'C') "
+    "FROM task_manager_tasktype AS type "
+    "WHERE type.id = task.task_type_id;",
+]
+
+POSTGRES_BACKWARDS = [
+    "DROP INDEX task_name_trgm_idx;",
+    "DROP INDEX task_search_vector_idx;",
+]
+
+SQLITE_FORWARDS = [
+    "CREATE VIRTUAL TABLE task_manager_task_fts "
+    "USING fts5(name, task_type, description);",
+    "INSERT INTO task_manager_task_fts "
+    "(rowid, name, task_type, description) "
+    "SELECT task.id, task.name, type.name, task.description "
+    "FROM task_manager_task task "
+    "JOIN task_manager_tasktype type ON type.id = task.task_type_id;",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TABLE task_manager_task_fts;",
+]
+
+
+def run_for_vendor(postgres, sqlite):
+    def run(apps, schema_editor):
+        statements = {
+            "postgresql": postgres,
+            "sqlite": sqlite,
+        }.get(schema_editor.connection.vendor, [])
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0008_worker_task_counters"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="task",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(
+            run_for_vendor(POSTGRES_FORWARDS, SQLITE_FORWARDS),
+            run_for_vendor(POSTGRES_BACKWARDS, SQLITE_BACKWARDS),
+        ),
+    ]
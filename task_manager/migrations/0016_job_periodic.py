@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0015_workload_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="periodic",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddConstraint(
+            model_name="job",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("periodic", True), ("status__in", ["queued", "running"])
+                ),
+                fields=("name",),
+                name="job_periodic_pending_unique",
+            ),
+        ),
+    ]
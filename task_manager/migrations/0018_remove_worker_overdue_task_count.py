@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("task_manager", "0017_task_updated_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="worker",
+            name="overdue_task_count",
+        ),
+    ]
@@ -1,18 +1,232 @@
+import hashlib
+
+from django.contrib.auth.mixins import AccessMixin
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Max
+from django.db.models.functions import Coalesce, Greatest
+from django.middleware.csrf import get_token
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+
+from task_manager.pagination import CursorPaginator
+
+
+# Declares how a view's queryset is shaped: joins, prefetches (names or
+# Prefetch objects with their own filtered/ordered querysets) and the
+# column set its template reads. The declarations are validated by the
+# task_manager.E00x system checks, and the queryset is built once per
+# request.
 class QuerySetOptimizeMixin:
     select_related_fields = []
     prefetch_related_fields = []
+    only_fields = []
+    defer_fields = []
 
     def get_queryset(self):
-        queryset = super().get_queryset()
-        if hasattr(self, 'select_related_fields'):
+        if getattr(self, "_shaped_queryset", None) is None:
+            self._shaped_queryset = self.shape_queryset(
+                super().get_queryset()
+            )
+        return self._shaped_queryset
+
+    def shape_queryset(self, queryset):
+        if self.select_related_fields:
             queryset = queryset.select_related(*self.select_related_fields)
-        if hasattr(self, 'prefetch_related_fields'):
-            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(
+                *self.prefetch_related_fields
+            )
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        if self.defer_fields:
+            queryset = queryset.defer(*self.defer_fields)
+        return queryset
+
+    @classmethod
+    def check_query_shape(cls):
+        model = getattr(cls, "model", None)
+        if model is None:
+            return []
+        errors = []
+        for path in cls.select_related_fields:
+            errors += _check_path(cls, model, path, "select_related_fields")
+        for lookup in cls.prefetch_related_fields:
+            path = getattr(lookup, "prefetch_through", lookup)
+            errors += _check_path(
+                cls, model, path, "prefetch_related_fields"
+            )
+        for attribute in ("only_fields", "defer_fields"):
+            for path in getattr(cls, attribute):
+                errors += _check_path(cls, model, path, attribute)
+        return errors
+
+
+def _check_path(view_class, model, path, attribute):
+    parts = path.split("__")
+    for index, part in enumerate(parts):
+        last = index == len(parts) - 1
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return [checks.Error(
+                f"{attribute} refers to '{path}', but {model.__name__} has "
+                f"no field '{part}'.",
+                obj=view_class,
+                id="task_manager.E001",
+            )]
+        many = field.many_to_many or field.one_to_many
+        if attribute != "prefetch_related_fields" and many:
+            return [checks.Error(
+                f"{attribute} refers to '{path}', which follows the "
+                f"to-many relation '{part}'.",
+                hint="Load it through prefetch_related_fields instead.",
+                obj=view_class,
+                id="task_manager.E002",
+            )]
+        if not field.is_relation and (
+            not last or attribute in ("select_related_fields",
+                                      "prefetch_related_fields")
+        ):
+            return [checks.Error(
+                f"{attribute} refers to '{path}', but '{part}' is not a "
+                "relation.",
+                obj=view_class,
+                id="task_manager.E003",
+            )]
+        if field.is_relation:
+            model = field.related_model
+    return []
+
+
+class UserTaskFilterMixin:
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(assignees=self.request.user)
+
+        task_type_name = self.request.GET.get("task_type_name")
+        if task_type_name:
+            queryset = (
+                queryset.filter(task_type__name__icontains=task_type_name)
+            )
+
         return queryset
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        if hasattr(self, 'model'):
-            queryset = self.get_queryset()
-            context[self.get_context_object_name(queryset)] = queryset
-        return context
+
+class CursorPaginationMixin:
+    paginator_class = CursorPaginator
+    cursor_ordering = None
+    cursor_kwarg = "cursor"
+
+    def get_paginator(self, queryset, per_page, *args, **kwargs):
+        return self.paginator_class(
+            queryset,
+            per_page,
+            ordering=self.cursor_ordering
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = await paginator.aget_page(
+            self.request.GET.get(self.cursor_kwarg)
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    async def dispatch(self, request, *args, **kwargs):
+        # Resolve the user without blocking, so templates and the
+        # permission checks below never touch the database synchronously.
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+# Answers a repeated GET of a detail page with 304 Not Modified after one
+# primary key lookup of the object's updated_at (and the newest of the
+# tasks it lists, from an index), before the object is
+# loaded or any template renders. The pages show per-user controls and a
+# CSRF token, so the validators also cover the requesting user and the
+# CSRF secret, and caches are told to keep one copy per session.
+# Put it after the login mixin so anonymous requests never reach it.
+class ConditionalGetMixin:
+    last_modified_field = "updated_at"
+    # Relation to the tasks the page lists; the newest of them counts as
+    # a change to the object, so task writes never have to touch it.
+    listed_tasks = None
+
+    def get_last_modified(self):
+        objects = self.model._default_manager.filter(
+            pk=self.kwargs[self.pk_url_kwarg]
+        ).order_by()
+        if self.listed_tasks is None:
+            return objects.values_list(self.last_modified_field, flat=True)
+        own = F(self.last_modified_field)
+        return objects.annotate(
+            last_modified=Greatest(
+                own, Coalesce(Max(f"{self.listed_tasks}__updated_at"), own)
+            )
+        ).values_list("last_modified", flat=True)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        if self.view_is_async:
+            return self.adispatch(request, *args, **kwargs)
+        last_modified = self.get_last_modified().first()
+        response = self.not_modified(request, last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        return self.add_validators(response, last_modified)
+
+    async def adispatch(self, request, *args, **kwargs):
+        last_modified = await self.get_last_modified().afirst()
+        response = self.not_modified(request, last_modified)
+        if response is None:
+            response = await super().dispatch(request, *args, **kwargs)
+        return self.add_validators(response, last_modified)
+
+    def validators(self, request, last_modified):
+        last_modified = max(last_modified, request.user.updated_at)
+        # get_token settles the CSRF secret now rather than during the
+        # render, so the first response already carries the final ETag.
+        get_token(request)
+        key = ":".join([
+            str(request.user.pk),
+            last_modified.isoformat(),
+            request.META["CSRF_COOKIE"],
+        ])
+        digest = hashlib.md5(key.encode(), usedforsecurity=False)
+        return (
+            quote_etag(digest.hexdigest()),
+            int(last_modified.timestamp())
+        )
+
+    def not_modified(self, request, last_modified):
+        if last_modified is None:
+            # Let the view answer 404.
+            return None
+        self.etag, self.last_modified = self.validators(
+            request, last_modified
+        )
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def add_validators(self, response, last_modified):
+        if last_modified is None or response.status_code not in (200, 304):
+            return response
+        response.headers["ETag"] = self.etag
+        response.headers["Last-Modified"] = http_date(self.last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Cookie"])
+        return response
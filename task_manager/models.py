@@ -1,10 +1,21 @@
+import hashlib
+import secrets
+from datetime import date
+
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
 
 
 class TaskType(models.Model):
     name = models.CharField(max_length=63, unique=True)
+    # Last change to the type, or a task leaving it. With its tasks' own
+    # updated_at, the validator of conditional GETs of the detail page.
+    # See versions.touch_task_listings.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -15,6 +26,9 @@ class TaskType(models.Model):
 
 class Position(models.Model):
     name = models.CharField(max_length=63, unique=True)
+    # Also moved when a worker leaves the position, so the workload
+    # rollup knows to recount it.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["name"]
@@ -23,8 +37,40 @@ class Position(models.Model):
         return self.name
 
 
+class ResourceVersion(models.Model):
+    name = models.CharField(max_length=63, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name}@{self.version}"
+
+
 class Worker(AbstractUser):
     position = models.ForeignKey(Position, on_delete=models.CASCADE, null=True)
+    open_task_count = models.IntegerField(default=0, editable=False)
+    completed_task_count = models.IntegerField(default=0, editable=False)
+    # Moves with the worker's profile, position and tasks leaving the
+    # worker, but not with logins or task counters, which the detail page
+    # does not show. Changes to listed tasks show in their own updated_at.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(
+                (
+                    models.F("open_task_count")
+                    + models.F("completed_task_count")
+                ).desc(),
+                "id",
+                name="worker_task_total_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_position_id = instance.__dict__.get("position_id")
+        return instance
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -38,6 +84,17 @@ class Task(models.Model):
         ("low", "Low"),
     ]
 
+    # Fields whose changes are written to the TaskEvent log.
+    LOGGED_FIELDS = [
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type_id",
+        "created_by_id",
+    ]
+
     name = models.CharField(max_length=63, unique=True)
     description = models.TextField()
     deadline = models.DateField()
@@ -61,6 +118,299 @@ class Task(models.Model):
         settings.AUTH_USER_MODEL,
         related_name="tasks"
     )
+    # Maintained by task_manager.search; only populated on PostgreSQL.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Part of the cache key of the rendered task cards. Bumped on every
+    # save and by task_manager.versions.bump_tasks for set-based writes.
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Moves together with version, and on assignee changes.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-deadline", "id"]
+        indexes = [
+            models.Index(
+                fields=["-deadline", "id"],
+                name="task_deadline_id_idx"
+            ),
+            models.Index(
+                fields=["deadline", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_open_deadline_idx"
+            ),
+            models.Index(
+                fields=["is_completed", "priority", "-deadline"],
+                name="task_status_priority_idx"
+            ),
+            models.Index(
+                fields=["task_type", "-deadline", "id"],
+                name="task_type_deadline_idx"
+            ),
+            # The newest task of a type, and the tasks changed since the
+            # last workload refresh.
+            models.Index(
+                fields=["task_type", "updated_at"],
+                name="task_type_updated_idx"
+            ),
+            models.Index(fields=["updated_at"], name="task_updated_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = instance.counter_state()
+        instance._logged_state = instance.logged_state()
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            # Incremented in the database so concurrent saves never end up
+            # sharing a version.
+            self.version = models.F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {
+                    *kwargs["update_fields"], "version", "updated_at"
+                }
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if isinstance(self.version, models.Expression):
+                self.refresh_from_db(fields=["version"])
+        self._loaded_state = self.counter_state()
+        self._logged_state = self.logged_state()
+
+    def logged_state(self):
+        deferred = self.get_deferred_fields()
+        return {
+            name: getattr(self, name)
+            for name in self.LOGGED_FIELDS
+            if name not in deferred
+        }
+
+    def counter_state(self):
+        if "is_completed" in self.get_deferred_fields():
+            return None
+        return {
+            "open_task_count": int(not self.is_completed),
+            "completed_task_count": int(self.is_completed),
+        }
+
+
+class TaskEvent(models.Model):
+    KIND_CHOICES = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("completed", "Completed"),
+        ("reopened", "Reopened"),
+        ("assigned", "Assigned"),
+        ("unassigned", "Unassigned"),
+        ("deleted", "Deleted"),
+    ]
+
+    # Append-only: no database constraints, so the history of deleted
+    # tasks and workers stays, and deleting them never touches this table.
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="events"
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="task_events"
+    )
+    kind = models.CharField(max_length=15, choices=KIND_CHOICES)
+    # Only what changed: {"field": [old, new]}, or {"workers": [ids]} for
+    # assignee changes.
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
-        ordering = ["-deadline"]
+        # Ids grow with time, so the timelines are index range scans.
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["task", "-id"], name="taskevent_task_idx"),
+            models.Index(
+                fields=["actor", "-id"],
+                name="taskevent_actor_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} task {self.task_id} at {self.created_at}"
+
+
+class ApiToken(models.Model):
+    # Authenticates API clients with "Authorization: Token <key>". Only a
+    # digest of the key is stored; the key itself is shown once.
+    key_digest = models.CharField(max_length=64, unique=True, editable=False)
+    worker = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="api_tokens"
+    )
+    name = models.CharField(max_length=63, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, worker, name=""):
+        key = secrets.token_urlsafe(32)
+        cls.objects.create(
+            key_digest=cls.digest(key), worker=worker, name=name
+        )
+        return key
+
+    def __str__(self):
+        return f"{self.worker} ({self.name or self.pk})"
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ("queued", "Queued"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    name = models.CharField(max_length=63)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=15,
+        choices=STATUS_CHOICES,
+        default="queued"
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=63, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Enqueued by the worker itself; at most one per name is pending.
+    periodic = models.BooleanField(default=False)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=models.Q(
+                    periodic=True, status__in=["queued", "running"]
+                ),
+                name="job_periodic_pending_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_queued_idx"
+            ),
+            models.Index(
+                fields=["name", "status"],
+                name="job_name_status_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class TaskDigest(models.Model):
+    worker = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_digest"
+    )
+    overdue_count = models.PositiveIntegerField(default=0)
+    due_soon_count = models.PositiveIntegerField(default=0)
+    # The first few overdue/due-soon tasks as {"id", "name", "deadline"}.
+    overdue = models.JSONField(default=list)
+    due_soon = models.JSONField(default=list)
+    computed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Digest of {self.worker_id} at {self.computed_at}"
+
+    def _with_dates(self, items):
+        return [
+            {**item, "deadline": date.fromisoformat(item["deadline"])}
+            for item in items
+        ]
+
+    @property
+    def overdue_tasks(self):
+        return self._with_dates(self.overdue)
+
+    @property
+    def due_soon_tasks(self):
+        return self._with_dates(self.due_soon)
+
+
+# Workload rollups: the analytics reports read these instead of the task
+# tables. task_manager.analytics refreshes them from a checkpoint.
+class TaskTypeWorkload(models.Model):
+    # Per task type and priority; the type and the priority reports are
+    # both sums over these rows.
+    task_type = models.ForeignKey(
+        TaskType,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    priority = models.CharField(
+        max_length=63,
+        choices=Task.PRIORITY_CHOICES
+    )
+    total = models.PositiveIntegerField(default=0)
+    open = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task_type", "priority"],
+                name="tasktypeworkload_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_type_id}/{self.priority}: {self.total}"
+
+
+class PositionWorkload(models.Model):
+    # Counts assignments, so a task shared by two workers of a position
+    # counts twice. A null position holds the workers without one.
+    position = models.ForeignKey(
+        Position,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name="+"
+    )
+    total = models.PositiveIntegerField(default=0)
+    open = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.position_id}: {self.total}"
+
+
+class WorkloadCheckpoint(models.Model):
+    # The day the overdue counts were computed for, and when the last
+    # refresh started; rows changed since then are recounted.
+    day = models.DateField()
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Workload as of {self.refreshed_at}"
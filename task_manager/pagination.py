@@ -0,0 +1,165 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage:
+    is_cursor = True
+
+    def __init__(
+        self,
+        object_list,
+        paginator,
+        next_cursor=None,
+        previous_cursor=None
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage of {len(self.object_list)} objects>"
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+# Keyset pagination: each page is a range scan starting at the cursor,
+# so deep pages cost as much as the first one. The ordering must be
+# unique, hence the primary key tie-breaker.
+class CursorPaginator:
+    def __init__(self, queryset, per_page, ordering=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        ordering = list(
+            ordering
+            or queryset.query.order_by
+            or queryset.model._meta.ordering
+        )
+        if not {"pk", "id"} & {field.lstrip("-") for field in ordering}:
+            ordering.append("pk")
+        self.ordering = tuple(ordering)
+
+    def encode_cursor(self, obj, direction):
+        values = [
+            getattr(obj, field.lstrip("-")) for field in self.ordering
+        ]
+        payload = json.dumps([direction, values], cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            direction, values = json.loads(
+                base64.urlsafe_b64decode(cursor.encode())
+            )
+        except (binascii.Error, UnicodeError, TypeError, ValueError):
+            raise InvalidCursor(cursor)
+        if direction not in ("next", "prev") or not (
+            isinstance(values, list) and len(values) == len(self.ordering)
+        ):
+            raise InvalidCursor(cursor)
+        return direction, values
+
+    def _keyset_filter(self, values, reverse):
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            descending = field.startswith("-") != reverse
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def _reversed_ordering(self):
+        return [
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        ]
+
+    def _page_queryset(self, cursor):
+        direction, values = (
+            self.decode_cursor(cursor) if cursor else ("next", None)
+        )
+        reverse = direction == "prev"
+        queryset = self.queryset.order_by(
+            *(self._reversed_ordering() if reverse else self.ordering)
+        )
+        if values is not None:
+            try:
+                queryset = queryset.filter(
+                    self._keyset_filter(values, reverse)
+                )
+            except (ValidationError, TypeError, ValueError):
+                raise InvalidCursor(cursor)
+        return queryset[:self.per_page + 1], reverse, values is not None
+
+    def _build_page(self, object_list, reverse, has_cursor):
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+        if not object_list:
+            return CursorPage(object_list, self)
+
+        first, last = object_list[0], object_list[-1]
+        if reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, has_cursor
+        return CursorPage(
+            object_list,
+            self,
+            next_cursor=(
+                self.encode_cursor(last, "next") if has_next else None
+            ),
+            previous_cursor=(
+                self.encode_cursor(first, "prev") if has_previous else None
+            ),
+        )
+
+    def page(self, cursor=None):
+        queryset, reverse, has_cursor = self._page_queryset(cursor)
+        return self._build_page(list(queryset), reverse, has_cursor)
+
+    async def apage(self, cursor=None):
+        queryset, reverse, has_cursor = self._page_queryset(cursor)
+        return self._build_page(
+            [obj async for obj in queryset], reverse, has_cursor
+        )
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+    async def aget_page(self, cursor=None):
+        try:
+            return await self.apage(cursor)
+        except InvalidCursor:
+            return await self.apage()
@@ -0,0 +1,41 @@
+from contextvars import ContextVar
+
+REPLICA = "replica"
+
+# Routing state of the current request, set by ReplicaRoutingMiddleware.
+current = ContextVar("routing", default=None)
+
+
+class Routing:
+    def __init__(self, read_alias):
+        self.read_alias = read_alias
+        self.wrote = False
+
+
+class ReplicaRouter:
+    # Sessions are read right after login; a lagging replica would look
+    # like a logout.
+    primary_only_apps = {"sessions"}
+
+    def db_for_read(self, model, **hints):
+        routing = current.get()
+        if routing is None or model._meta.app_label in self.primary_only_apps:
+            return None
+        return routing.read_alias
+
+    def db_for_write(self, model, **hints):
+        routing = current.get()
+        if routing is not None and (
+            model._meta.app_label not in self.primary_only_apps
+        ):
+            # Later reads of this request must see the write too.
+            routing.read_alias = None
+            routing.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db == REPLICA else None
@@ -0,0 +1,160 @@
+import re
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity
+)
+from django.db import connections
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+
+from task_manager.models import Task, TaskType
+
+FTS_TABLE = "task_manager_task_fts"
+
+
+class PostgresSearchBackend:
+    config = "english"
+    trigram_threshold = 0.3
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    def vector(self):
+        task_type_name = Subquery(
+            TaskType.objects.filter(pk=OuterRef("task_type")).values("name")
+        )
+        return (
+            SearchVector("name", weight="A", config=self.config)
+            + SearchVector(task_type_name, weight="B", config=self.config)
+            + SearchVector("description", weight="C", config=self.config)
+        )
+
+    def index(self, task_ids):
+        Task.objects.using(self.using).filter(pk__in=task_ids).update(
+            search_vector=self.vector()
+        )
+
+    def remove(self, task_ids):
+        pass
+
+    def search(self, queryset, text):
+        query = SearchQuery(text, search_type="websearch", config=self.config)
+        ranked = queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F("search_vector"), query)
+        )
+        if ranked.exists():
+            return ranked.order_by("-rank", "-deadline", "id")
+        return (
+            queryset.filter(name__trigram_similar=text)
+            .annotate(rank=TrigramSimilarity("name", text))
+            .filter(rank__gte=self.trigram_threshold)
+            .order_by("-rank", "-deadline", "id")
+        )
+
+
+class SQLiteSearchBackend:
+    # bm25() weights for the name, task type and description columns.
+    weights = (10.0, 5.0, 1.0)
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    def index(self, task_ids):
+        task_ids = list(task_ids)
+        self.remove(task_ids)
+        with connections[self.using].cursor() as cursor:
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} "
+                    "(rowid, name, task_type, description) "
+                    "SELECT task.id, task.name, type.name, task.description "
+                    "FROM task_manager_task task "
+                    "JOIN task_manager_tasktype type "
+                    "ON type.id = task.task_type_id "
+                    f"WHERE task.id IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+
+    def remove(self, task_ids):
+        task_ids = list(task_ids)
+        with connections[self.using].cursor() as cursor:
+            for start in range(0, len(task_ids), 500):
+                chunk = task_ids[start:start + 500]
+                cursor.execute(
+                    f"DELETE FROM {FTS_TABLE} "
+                    f"WHERE rowid IN ({', '.join(['%s'] * len(chunk))})",
+                    chunk
+                )
+
+    def match_expression(self, text, prefix=False):
+        terms = re.findall(r"\w+", text)
+        suffix = "*" if prefix else ""
+        return " ".join(f'"{term}"{suffix}' for term in terms)
+
+    def ranked(self, queryset, match):
+        weights = ", ".join(str(weight) for weight in self.weights)
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s "
+            f"AND {FTS_TABLE}.rowid = task_manager_task.id",
+            (match,)
+        )
+        matching = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            (match,)
+        )
+        return (
+            queryset.filter(pk__in=matching)
+            .annotate(rank=rank)
+            .order_by("-rank", "-deadline", "id")
+        )
+
+    def search(self, queryset, text):
+        if not self.match_expression(text):
+            return queryset.none()
+        ranked = self.ranked(queryset, self.match_expression(text))
+        if ranked.exists():
+            return ranked
+        # Prefix matching stands in for trigram similarity.
+        return self.ranked(queryset, self.match_expression(text, prefix=True))
+
+
+class BasicSearchBackend:
+    def __init__(self, using="default"):
+        self.using = using
+
+    def index(self, task_ids):
+        pass
+
+    def remove(self, task_ids):
+        pass
+
+    def search(self, queryset, text):
+        return queryset.filter(
+            Q(name__icontains=text)
+            | Q(description__icontains=text)
+            | Q(task_type__name__icontains=text)
+        ).annotate(rank=Value(1.0))
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_backend(using="default"):
+    backend_class = BACKENDS.get(
+        connections[using].vendor, BasicSearchBackend
+    )
+    return backend_class(using)
+
+
+def search_tasks(text, queryset=None):
+    if queryset is None:
+        queryset = Task.objects.all()
+    return get_backend(queryset.db).search(queryset, text)
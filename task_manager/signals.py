@@ -0,0 +1,200 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager import (
+    analytics,
+    counters,
+    dashboard,
+    deadlines,
+    events,
+    search,
+    versions
+)
+from task_manager.models import Position, Task, TaskType
+
+# Task fields the search index is built from.
+SEARCH_FIELDS = ["name", "description", "task_type_id"]
+
+
+def _linked_ids(through, instance, reverse, pk_set=None):
+    source, target = ("worker", "task") if reverse else ("task", "worker")
+    links = through.objects.filter(**{source: instance})
+    if pk_set is not None:
+        # pk_set holds the requested ids, not only the linked ones.
+        links = links.filter(**{f"{target}__in": pk_set})
+    return set(links.values_list(target, flat=True))
+
+
+@receiver(m2m_changed, sender=Task.assignees.through)
+def track_assignee_changes(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs
+):
+    if action == "pre_remove":
+        instance._removed_assignee_links = _linked_ids(
+            sender, instance, reverse, pk_set
+        )
+    elif action == "pre_clear":
+        instance._removed_assignee_links = _linked_ids(
+            sender, instance, reverse
+        )
+
+    if action == "post_add":
+        changed, sign = pk_set, 1
+    elif action in ("post_remove", "post_clear"):
+        changed, sign = instance._removed_assignee_links, -1
+    else:
+        return
+    if not changed:
+        return
+
+    versions.bump("task")
+    versions.bump_tasks(changed if reverse else [instance.pk])
+    if sign < 0:
+        # The bumped tasks are gone from these workers' pages.
+        versions.touch(
+            get_user_model(), [instance.pk] if reverse else changed
+        )
+    kind = "assigned" if sign > 0 else "unassigned"
+    if reverse:
+        events.record_many(
+            (task_id, kind, {"workers": [instance.pk]})
+            for task_id in sorted(changed)
+        )
+    else:
+        events.record(instance.pk, kind, {"workers": sorted(changed)})
+    if reverse:
+        counters.apply_delta(
+            [instance.pk], counters.tasks_delta(changed, sign)
+        )
+        dashboard.change_task_counts([instance.pk])
+    else:
+        state = counters.stored_state(instance)
+        counters.apply_delta(
+            changed, state if sign > 0 else counters.negate(state)
+        )
+        dashboard.change_task_counts(changed)
+
+
+@receiver(post_save, sender=Task)
+def track_task_save(sender, instance, created, using, **kwargs):
+    if not created:
+        counters.task_changed(instance)
+    # _logged_state still holds the values loaded before this save.
+    before = getattr(instance, "_logged_state", {})
+    previous_type = before.get("task_type_id")
+    if previous_type not in (None, instance.task_type_id):
+        versions.touch(TaskType, [previous_type])
+    deadlines.invalidate([instance.deadline, before.get("deadline")])
+    dashboard.task_saved(instance)
+    # Completion toggles, priority edits and version bumps leave the
+    # index as it is; a field missing from before was never loaded, so
+    # its old value is unknown.
+    after = instance.logged_state()
+    if created or any(
+        name in after and (name not in before or before[name] != after[name])
+        for name in SEARCH_FIELDS
+    ):
+        search.get_backend(using).index([instance.pk])
+    events.task_saved(instance, created)
+
+
+@receiver(post_save, sender=TaskType)
+def track_task_type_save(sender, instance, created, using, **kwargs):
+    if not created:
+        task_ids = (
+            Task.objects.using(using)
+            .filter(task_type=instance)
+            .values_list("pk", flat=True)
+        )
+        search.get_backend(using).index(task_ids)
+        versions.bump_tasks(task_ids)
+
+
+@receiver(pre_delete, sender=Task)
+def remember_task_assignees(sender, instance, **kwargs):
+    instance._deleted_assignee_ids = list(
+        instance.assignees.values_list("pk", flat=True)
+    )
+    if instance._deleted_assignee_ids:
+        instance._deleted_state = counters.stored_state(instance)
+
+
+@receiver(post_delete, sender=Task)
+def track_task_delete(sender, instance, using, **kwargs):
+    search.get_backend(using).remove([instance.pk])
+    versions.touch(get_user_model(), instance._deleted_assignee_ids)
+    versions.touch(TaskType, [instance.task_type_id])
+    if instance._deleted_assignee_ids:
+        counters.apply_delta(
+            instance._deleted_assignee_ids,
+            counters.negate(instance._deleted_state)
+        )
+    dashboard.change_task_counts(instance._deleted_assignee_ids)
+    dashboard.task_deleted(instance.pk)
+    deadlines.invalidate([instance.deadline])
+    events.record(instance.pk, "deleted")
+
+
+@receiver(post_save, sender=Position)
+def track_position_save(sender, instance, created, **kwargs):
+    # Worker pages show the position's name.
+    if not created:
+        get_user_model().objects.filter(position=instance).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def track_worker_move(sender, instance, created, **kwargs):
+    # The position a worker left has to be recounted too.
+    previous = getattr(instance, "_loaded_position_id", None)
+    if previous is not None and previous != instance.position_id:
+        versions.touch(Position, [previous])
+    instance._loaded_position_id = instance.position_id
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def track_worker_save(sender, instance, created, update_fields, **kwargs):
+    if not created and update_fields is not None and update_fields.isdisjoint(
+        ("username", "first_name", "last_name")
+    ):
+        return
+    dashboard.worker_saved(instance)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def track_worker_delete(sender, instance, **kwargs):
+    dashboard.worker_deleted(instance.pk)
+    if instance.position_id is None:
+        # Nothing is left to mark the workers without a position as
+        # changed, so recount everything.
+        analytics.invalidate()
+    else:
+        versions.touch(Position, [instance.position_id])
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@receiver(post_save, sender=TaskType)
+@receiver(post_delete, sender=TaskType)
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_resource_version(sender, instance, **kwargs):
+    if kwargs.get("update_fields") == {"last_login"}:
+        return
+    versions.bump(sender._meta.model_name)
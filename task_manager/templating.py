@@ -0,0 +1,34 @@
+import logging
+import time
+from pathlib import Path
+
+from django.template import engines
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+
+def template_names(engine):
+    for directory in engine.engine.dirs:
+        root = Path(directory)
+        for path in sorted(root.rglob("*")):
+            if path.is_file() and path.suffix in TEMPLATE_SUFFIXES:
+                yield path.relative_to(root).as_posix()
+
+
+def warm_templates(using="django"):
+    # With the cached loader each template is parsed once per process;
+    # doing it here keeps the parsing out of the first requests.
+    engine = engines[using]
+    timings = []
+    for name in template_names(engine):
+        started = time.perf_counter()
+        engine.get_template(name)
+        timings.append((name, time.perf_counter() - started))
+    logger.info(
+        "Compiled %d templates in %.1f ms",
+        len(timings),
+        sum(seconds for _, seconds in timings) * 1000
+    )
+    return timings
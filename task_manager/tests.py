@@ -1,11 +1,63 @@
 import datetime
-from django.test import TestCase, Client
+import io
+import json
+import os
+import tempfile
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.http import HttpResponse
+from django.test import (
+    Client,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    tag
+)
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.views import generic
 
-from task_manager.models import Task, TaskType, Position
+from task_manager import (
+    analytics,
+    bulk,
+    counters,
+    dashboard,
+    jobs,
+    metrics,
+    routers
+)
+from task_manager.checks import check_query_shapes
+from task_manager.digests import compute_digests
+from task_manager.generators import DatasetGenerator
+from task_manager.middleware import (
+    QueryBudgetExceeded,
+    ReplicaRoutingMiddleware
+)
+from task_manager.mixins import QuerySetOptimizeMixin
+from task_manager.search import search_tasks
+from task_manager.templating import warm_templates
+from task_manager.models import (
+    ApiToken,
+    Job,
+    Position,
+    Task,
+    TaskDigest,
+    TaskEvent,
+    TaskType,
+    WorkloadCheckpoint
+)
 from task_manager.forms import TaskForm, WorkerCreationForm
+from task_manager.views import TaskListView
 
 User = get_user_model()
 
@@ -45,6 +97,7 @@ class TaskManagerModelTests(TestCase):
 
 class TaskListViewWithSearchTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.user = User.objects.create_user(
             username="testuser",
             password="password"
@@ -89,6 +142,24 @@ class TaskListViewWithSearchTests(TestCase):
         self.assertContains(response, "Task 1")
         self.assertNotContains(response, "Task 2")
 
+    def test_task_export_honours_filter(self):
+        response = self.client.get(
+            reverse("task-manager:user-tasks-export"),
+            {"task_type_name": "Type1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], (
+            "Name,Task type,Priority,Deadline,Completed,Created by,"
+            "Description"
+        ))
+        self.assertEqual(lines[1:], [
+            "Task 1,Type1,medium,2024-12-31,False,testuser,"
+            "Description for Task 1"
+        ])
+
     def test_task_list_view_with_no_results(self):
         response = self.client.get(
             reverse("task-manager:user-tasks"),
@@ -100,6 +171,7 @@ class TaskListViewWithSearchTests(TestCase):
 
 class TaskManagerViewTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.position = Position.objects.create(name="Manager")
         self.user = User.objects.create_user(
@@ -141,6 +213,23 @@ class TaskManagerViewTests(TestCase):
         self.assertContains(response, "View Test Task")
         self.assertTemplateUsed(response, "task_manager/task_detail.html")
 
+    def test_task_type_detail_lists_latest_deadline_first(self):
+        later = Task.objects.create(
+            name="Later Task",
+            description="Due after the view test task",
+            deadline=self.task.deadline + datetime.timedelta(days=1),
+            task_type=self.task_type,
+            created_by=self.user
+        )
+        self.client.login(username="testuser", password="testpass123")
+        response = self.client.get(
+            reverse("task-manager:task-type-detail", args=[self.task_type.pk])
+        )
+        self.assertEqual(
+            list(response.context["task_type"].tasks.all()),
+            [later, self.task]
+        )
+
     def test_task_create_view(self):
         self.client.login(username="testuser", password="testpass123")
         response = self.client.get(reverse("task-manager:task-create"))
@@ -288,6 +377,7 @@ class TaskManagerFormTests(TestCase):
 
 class TaskManagerIntegrationTests(TestCase):
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.position = Position.objects.create(name="Integration Tester")
         self.user = User.objects.create_user(
@@ -360,3 +450,2060 @@ class TaskManagerIntegrationTests(TestCase):
         )
         self.assertEqual(response.status_code, 302)
         self.assertFalse(Task.objects.filter(id=task.id).exists())
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="pageuser",
+            password="pagepass123"
+        )
+        self.task_type = TaskType.objects.create(name="Paging")
+        today = timezone.now().date()
+        for index in range(25):
+            task = Task.objects.create(
+                name=f"Paged Task {index}",
+                description="Paged",
+                deadline=today + datetime.timedelta(days=index % 3),
+                task_type=self.task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user)
+        self.client.login(username="pageuser", password="pagepass123")
+
+    def walk(self, url, params=None):
+        params = dict(params or {})
+        pages = []
+        while True:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            page = response.context["page_obj"]
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            params["cursor"] = page.next_cursor
+
+    def test_pages_follow_model_ordering_without_gaps(self):
+        pages = self.walk(reverse("task-manager:user-tasks"))
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        seen = [task.pk for page in pages for task in page]
+        expected = list(
+            Task.objects.order_by("-deadline", "id")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_previous_page(self):
+        url = reverse("task-manager:user-tasks")
+        first = self.client.get(url).context["page_obj"]
+        self.assertFalse(first.has_previous())
+        second = self.client.get(
+            url, {"cursor": first.next_cursor}
+        ).context["page_obj"]
+        back = self.client.get(
+            url, {"cursor": second.previous_cursor}
+        ).context["page_obj"]
+        self.assertEqual(list(back), list(first))
+
+    def test_cursor_links_keep_filters(self):
+        response = self.client.get(
+            reverse("task-manager:user-tasks"),
+            {"task_type_name": "Paging"}
+        )
+        page = response.context["page_obj"]
+        self.assertContains(response, "task_type_name=Paging")
+        self.assertContains(response, f"cursor={page.next_cursor}")
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        response = self.client.get(
+            reverse("task-manager:user-tasks"),
+            {"cursor": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["page_obj"].has_previous())
+
+    def test_worker_detail_tasks_are_paginated(self):
+        pages = self.walk(
+            reverse("task-manager:worker-detail", args=[self.user.pk])
+        )
+        self.assertEqual(sum(len(page) for page in pages), 25)
+
+
+@tag("explain")
+@skipUnless(
+    connection.vendor != "postgresql"
+    or os.getenv("TASK_MANAGER_EXPLAIN_ROWS"),
+    "set TASK_MANAGER_EXPLAIN_ROWS to seed the PostgreSQL plan check"
+)
+class TaskQueryPlanTests(TestCase):
+    # PostgreSQL only prefers indexes on realistically sized tables, so
+    # on it the check is opt-in: TASK_MANAGER_EXPLAIN_ROWS=1000000
+    # ``manage.py test --tag explain``. Elsewhere it runs on 5000 rows.
+    rows = int(os.getenv("TASK_MANAGER_EXPLAIN_ROWS", 5_000))
+    batch_size = 10_000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.task_type = TaskType.objects.create(name="Explain")
+        cls.workers = User.objects.bulk_create(
+            User(
+                username=f"explain{index}",
+                open_task_count=index % 7,
+                completed_task_count=index % 97
+            )
+            for index in range(max(cls.rows // 20, 50))
+        )
+        cls.worker = User.objects.get(username="explain0")
+        today = timezone.now().date()
+        through = Task.assignees.through
+        for start in range(0, cls.rows, cls.batch_size):
+            stop = min(start + cls.batch_size, cls.rows)
+            tasks = Task.objects.bulk_create(
+                Task(
+                    name=f"Explain Task {index}",
+                    description="",
+                    deadline=today + datetime.timedelta(days=index % 365),
+                    is_completed=index % 10 != 0,
+                    priority=Task.PRIORITY_CHOICES[index % 4][0],
+                    task_type=cls.task_type,
+                )
+                for index in range(start, stop)
+            )
+            through.objects.bulk_create(
+                through(task_id=task.pk, worker_id=cls.workers[
+                    index % len(cls.workers)
+                ].pk)
+                for index, task in enumerate(tasks, start)
+            )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} not used by:\n{plan}")
+
+    def test_task_list_ordering(self):
+        self.assertUsesIndex(
+            Task.objects.order_by("-deadline", "id")[:10],
+            "task_deadline_id_idx"
+        )
+
+    def test_nearest_open_deadlines(self):
+        self.assertUsesIndex(
+            Task.objects.filter(is_completed=False).order_by("deadline")[:10],
+            "task_open_deadline_idx"
+        )
+
+    def test_admin_status_priority_filter(self):
+        self.assertUsesIndex(
+            Task.objects.filter(
+                is_completed=True, priority="urgent"
+            ).order_by(),
+            "task_status_priority_idx"
+        )
+
+    def test_task_type_tasks(self):
+        self.assertUsesIndex(
+            Task.objects.filter(task_type=self.task_type)[:10],
+            "task_type_deadline_idx"
+        )
+
+    def test_top_workers(self):
+        self.assertUsesIndex(
+            dashboard._workers_queryset(), "worker_task_total_idx"
+        )
+
+    def test_worker_tasks(self):
+        self.assertUsesIndex(
+            Task.objects.filter(assignees=self.worker)[:10],
+            "task_assignee_worker_task_idx"
+        )
+
+
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.task_type = TaskType.objects.create(name="Dashboard")
+        self.alice = User.objects.create(
+            username="alice", first_name="Alice", last_name="Smith"
+        )
+        self.bob = User.objects.create(username="bob")
+        self.today = timezone.now().date()
+        self.task = self.create_task("First", days=5)
+        self.task.assignees.add(self.alice)
+
+    def create_task(self, name, days):
+        return Task.objects.create(
+            name=name,
+            description="",
+            deadline=self.today + datetime.timedelta(days=days),
+            task_type=self.task_type
+        )
+
+    def counts(self):
+        return {
+            member["name"]: member["task_count"]
+            for member in dashboard.team_members()
+        }
+
+    def test_dashboard_is_served_from_cache(self):
+        self.assertEqual(self.counts(), {"Alice Smith": 1, "bob": 0})
+        dashboard.nearest_tasks()
+        with self.assertNumQueries(0):
+            dashboard.team_members()
+            dashboard.nearest_tasks()
+
+    def test_assignee_changes_update_counts(self):
+        self.counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignees.add(self.bob)
+            self.bob.tasks.add(self.create_task("Second", days=3))
+        self.assertEqual(self.counts(), {"Alice Smith": 1, "bob": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assignees.remove(self.alice, self.alice)
+            self.bob.tasks.clear()
+        self.assertEqual(self.counts(), {"Alice Smith": 0, "bob": 0})
+
+    def test_only_the_top_workers_are_cached(self):
+        User.objects.bulk_create(
+            User(username=f"idle{index}") for index in range(12)
+        )
+        self.assertEqual(len(dashboard.team_members()), 10)
+        self.assertEqual(len(cache.get(dashboard.WORKERS_KEY)), 10)
+        idle = User.objects.get(username="idle11")
+        with self.captureOnCommitCallbacks(execute=True):
+            for days in (1, 2):
+                idle.tasks.add(self.create_task(f"Idle {days}", days=days))
+        self.assertEqual(
+            dashboard.team_members()[0],
+            {"pk": idle.pk, "name": "idle11", "task_count": 2}
+        )
+
+    def test_task_delete_updates_counts_and_nearest(self):
+        dashboard.nearest_tasks()
+        self.counts()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertEqual(self.counts(), {"Alice Smith": 0, "bob": 0})
+        self.assertEqual(dashboard.nearest_tasks(), [])
+
+    def test_nearest_tasks_follow_saves(self):
+        for days in range(10, 20):
+            self.create_task(f"Later {days}", days=days)
+        dashboard.nearest_tasks()
+        with self.captureOnCommitCallbacks(execute=True):
+            sooner = self.create_task("Sooner", days=1)
+            self.task.deadline = self.today + datetime.timedelta(days=30)
+            self.task.save()
+        nearest = [entry["pk"] for entry in dashboard.nearest_tasks()]
+        self.assertEqual(
+            nearest,
+            list(
+                Task.objects.order_by("deadline", "id")
+                .values_list("pk", flat=True)[:10]
+            )
+        )
+        self.assertEqual(nearest[0], sooner.pk)
+
+    def test_nearest_tasks_are_dropped_not_patched(self):
+        for days in range(10, 20):
+            self.create_task(f"Later {days}", days=days)
+        dashboard.nearest_tasks()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task("Much later", days=60)
+        self.assertIsNotNone(cache.get(dashboard.NEAREST_KEY))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task("Sooner", days=1)
+        self.assertIsNone(cache.get(dashboard.NEAREST_KEY))
+
+
+class WorkerTaskCounterTests(TestCase):
+    def setUp(self):
+        self.task_type = TaskType.objects.create(name="Counters")
+        self.worker = User.objects.create_user(
+            username="counted",
+            password="countedpass123"
+        )
+        self.other = User.objects.create_user(username="other")
+        today = timezone.now().date()
+        self.open_task = self.create_task("Open", today, days=3)
+        self.overdue_task = self.create_task("Late", today, days=-3)
+
+    def create_task(self, name, today, days):
+        return Task.objects.create(
+            name=name,
+            description="",
+            deadline=today + datetime.timedelta(days=days),
+            task_type=self.task_type
+        )
+
+    def assertCounters(self, worker, open, completed, overdue):
+        worker = User.objects.annotate(
+            overdue_task_count=counters.overdue_count()
+        ).get(pk=worker.pk)
+        self.assertEqual(
+            (
+                worker.open_task_count,
+                worker.completed_task_count,
+                worker.overdue_task_count,
+            ),
+            (open, completed, overdue)
+        )
+
+    def test_assignee_changes_update_counters(self):
+        self.open_task.assignees.add(self.worker, self.other)
+        self.worker.tasks.add(self.overdue_task)
+        self.assertCounters(self.worker, open=2, completed=0, overdue=1)
+        self.assertCounters(self.other, open=1, completed=0, overdue=0)
+
+        self.worker.tasks.remove(self.open_task)
+        self.assertCounters(self.worker, open=1, completed=0, overdue=1)
+        self.open_task.assignees.clear()
+        self.assertCounters(self.other, open=0, completed=0, overdue=0)
+
+    def test_completing_task_moves_counters(self):
+        self.overdue_task.assignees.add(self.worker)
+        self.client.login(username="counted", password="countedpass123")
+        self.client.post(
+            reverse("task-manager:task-detail", args=[self.overdue_task.pk])
+        )
+        self.assertCounters(self.worker, open=0, completed=1, overdue=0)
+
+    def test_tasks_become_overdue_without_a_write(self):
+        self.open_task.assignees.add(self.worker)
+        later = timezone.localdate() + datetime.timedelta(days=5)
+        with mock.patch("django.utils.timezone.localdate", return_value=later):
+            self.assertCounters(self.worker, open=1, completed=0, overdue=1)
+            self.open_task.is_completed = True
+            self.open_task.save()
+            self.assertCounters(self.worker, open=0, completed=1, overdue=0)
+
+    def test_deleting_task_releases_counters(self):
+        self.open_task.assignees.add(self.worker)
+        self.overdue_task.assignees.add(self.worker)
+        self.task_type.delete()
+        self.assertCounters(self.worker, open=0, completed=0, overdue=0)
+
+    def test_recount_command_repairs_drift(self):
+        self.open_task.assignees.add(self.worker)
+        User.objects.update(open_task_count=7, completed_task_count=2)
+        out = io.StringIO()
+        call_command("recount_task_counters", stdout=out)
+        self.assertIn("Repaired task counters of 2 workers", out.getvalue())
+        self.assertCounters(self.worker, open=1, completed=0, overdue=0)
+        self.assertCounters(self.other, open=0, completed=0, overdue=0)
+
+
+class TaskSearchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="searcher",
+            password="searchpass123"
+        )
+        self.task_type = TaskType.objects.create(name="Infrastructure")
+        deadline = timezone.now().date() + datetime.timedelta(days=3)
+        self.named = Task.objects.create(
+            name="Database migration",
+            description="Move the tables",
+            deadline=deadline,
+            task_type=self.task_type
+        )
+        self.described = Task.objects.create(
+            name="Cleanup",
+            description="Drop tables left over from the database move",
+            deadline=deadline,
+            task_type=self.task_type
+        )
+        self.other = Task.objects.create(
+            name="Landing page",
+            description="Marketing copy",
+            deadline=deadline,
+            task_type=TaskType.objects.create(name="Design")
+        )
+
+    def names(self, text):
+        return [task.name for task in search_tasks(text)]
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(
+            self.names("database"),
+            ["Database migration", "Cleanup"]
+        )
+
+    def test_task_type_name_is_searchable(self):
+        self.assertEqual(
+            set(self.names("infrastructure")),
+            {"Database migration", "Cleanup"}
+        )
+
+    def test_index_follows_saves_and_deletes(self):
+        self.other.name = "Database dashboard"
+        self.other.save()
+        self.assertIn("Database dashboard", self.names("database"))
+        self.task_type.name = "Operations"
+        self.task_type.save()
+        self.assertEqual(len(self.names("operations")), 2)
+        self.named.delete()
+        self.assertNotIn("Database migration", self.names("database"))
+
+    def test_only_searchable_changes_reindex(self):
+        with mock.patch("task_manager.search.get_backend") as get_backend:
+            self.other.is_completed = True
+            self.other.priority = "urgent"
+            self.other.save()
+            get_backend.return_value.index.assert_not_called()
+            self.other.description = "Marketing copy, second draft"
+            self.other.save()
+            get_backend.return_value.index.assert_called_once_with(
+                [self.other.pk]
+            )
+
+    def test_partial_words_fall_back_to_fuzzy_matching(self):
+        self.assertEqual(self.names("migr"), ["Database migration"])
+
+    def test_search_view(self):
+        self.client.login(username="searcher", password="searchpass123")
+        response = self.client.get(
+            reverse("task-manager:task-search"), {"q": "marketing"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Landing page")
+        self.assertNotContains(response, "Database migration")
+
+
+class TaskTransferCommandTests(TestCase):
+    def setUp(self):
+        self.worker = User.objects.create_user(username="exporter")
+        self.helper = User.objects.create_user(username="helper")
+        task_type = TaskType.objects.create(name="Transfer")
+        for index in range(5):
+            task = Task.objects.create(
+                name=f"Transfer {index}",
+                description=f"Row {index}, with \"quotes\"",
+                deadline=timezone.now().date(),
+                is_completed=index == 0,
+                priority="high",
+                task_type=task_type,
+                created_by=self.worker
+            )
+            task.assignees.add(self.worker)
+            if index % 2:
+                task.assignees.add(self.helper)
+
+    def round_trip(self, extension):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"tasks.{extension}")
+            call_command("export_tasks", path, chunk_size=2)
+            Task.objects.all().delete()
+            out = io.StringIO()
+            call_command("import_tasks", path, batch_size=2, stdout=out)
+        self.assertIn("Imported 5 tasks, skipped 0", out.getvalue())
+        self.assertEqual(Task.objects.count(), 5)
+        task = Task.objects.get(name="Transfer 1")
+        self.assertEqual(task.description, 'Row 1, with "quotes"')
+        self.assertEqual(task.created_by, self.worker)
+        self.assertEqual(
+            set(task.assignees.values_list("username", flat=True)),
+            {"exporter", "helper"}
+        )
+        self.assertTrue(Task.objects.get(name="Transfer 0").is_completed)
+        self.worker.refresh_from_db()
+        self.assertEqual(self.worker.open_task_count, 4)
+        self.assertEqual(self.worker.completed_task_count, 1)
+
+    def test_jsonl_round_trip(self):
+        self.round_trip("jsonl")
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv")
+
+    def test_import_skips_duplicates_and_invalid_rows(self):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".jsonl", delete=False
+        ) as stream:
+            stream.write(
+                '{"name": "Transfer 0", "description": "Copy", '
+                '"deadline": "2030-01-01", "task_type": "Transfer"}\n'
+                '{"name": "Bad", "description": "Typo", '
+                '"deadline": "2030-01-01", "task_type": "Transfer", '
+                '"priority": "someday"}\n'
+                '{"name": "New", "description": "Fresh", '
+                '"deadline": "2030-01-01", "task_type": "Imported", '
+                '"assignees": ["helper"]}\n'
+            )
+        self.addCleanup(os.remove, stream.name)
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_tasks", stream.name, stdout=out, stderr=err)
+        self.assertIn("Imported 1 tasks, skipped 2", out.getvalue())
+        self.assertIn("Transfer 0: already exists", err.getvalue())
+        self.assertIn("Bad: priority:", err.getvalue())
+        task = Task.objects.get(name="New")
+        self.assertEqual(task.task_type.name, "Imported")
+        self.assertEqual(list(task.assignees.all()), [self.helper])
+
+
+class TaskBulkActionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="bulkuser",
+            password="bulkpass123"
+        )
+        self.helper = User.objects.create_user(username="bulkhelper")
+        task_type = TaskType.objects.create(name="Bulk")
+        self.tasks = []
+        for index in range(6):
+            task = Task.objects.create(
+                name=f"Bulk {index}",
+                description="",
+                deadline=timezone.now().date() + datetime.timedelta(days=1),
+                task_type=task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user)
+            self.tasks.append(task)
+        self.task_ids = [task.pk for task in self.tasks]
+        self.client.login(username="bulkuser", password="bulkpass123")
+
+    def post(self, **data):
+        return self.client.post(
+            reverse("task-manager:task-bulk-action"),
+            {"tasks": self.task_ids, **data}
+        )
+
+    def test_complete_many_tasks(self):
+        response = self.post(action="complete")
+        self.assertRedirects(response, reverse("task-manager:user-tasks"))
+        self.assertFalse(Task.objects.filter(is_completed=False).exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.open_task_count, 0)
+        self.assertEqual(self.user.completed_task_count, 6)
+
+    def test_query_count_does_not_grow_with_selection(self):
+        with CaptureQueriesContext(connection) as few:
+            self.client.post(
+                reverse("task-manager:task-bulk-action"),
+                {"tasks": self.task_ids[:2], "action": "set_priority",
+                 "priority": "low"}
+            )
+        with CaptureQueriesContext(connection) as many:
+            self.post(action="set_priority", priority="urgent")
+        self.assertEqual(len(few), len(many))
+        self.assertEqual(
+            Task.objects.filter(priority="urgent").count(), 6
+        )
+
+    def test_reassign_tasks(self):
+        self.post(action="add_assignees", workers=[self.helper.pk])
+        self.post(action="remove_assignees", workers=[self.user.pk])
+        self.assertEqual(self.helper.tasks.count(), 6)
+        self.assertEqual(self.user.tasks.count(), 0)
+        self.helper.refresh_from_db()
+        self.user.refresh_from_db()
+        self.assertEqual(self.helper.open_task_count, 6)
+        self.assertEqual(self.user.open_task_count, 0)
+
+    def test_adding_existing_assignees_changes_nothing(self):
+        versions = dict(Task.objects.values_list("pk", "version"))
+        # The savepoint and the lookup of existing links.
+        with self.assertNumQueries(3):
+            added = bulk.add_assignees(self.task_ids, [self.user.pk])
+        self.assertEqual(added, 0)
+        self.assertEqual(
+            dict(Task.objects.values_list("pk", "version")), versions
+        )
+        self.assertEqual(
+            bulk.add_assignees(self.task_ids, [self.user.pk, self.helper.pk]),
+            6
+        )
+
+    def test_delete_tasks(self):
+        self.assertEqual(bulk.delete_tasks(self.task_ids[:2]), 2)
+        self.task_ids = self.task_ids[2:]
+        self.post(action="delete")
+        self.assertFalse(Task.objects.exists())
+        self.assertFalse(Task.assignees.through.objects.exists())
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.open_task_count, 0)
+
+    def test_rejects_tasks_outside_permission(self):
+        foreign = Task.objects.create(
+            name="Foreign",
+            description="",
+            deadline=timezone.now().date(),
+            task_type=self.tasks[0].task_type,
+            created_by=self.helper
+        )
+        self.task_ids.append(foreign.pk)
+        self.post(action="delete")
+        self.assertEqual(Task.objects.count(), 7)
+
+    def test_admin_mark_completed_action(self):
+        User.objects.create_superuser(username="root", password="rootpass123")
+        self.client.login(username="root", password="rootpass123")
+        self.client.post(
+            reverse("admin:task_manager_task_changelist"),
+            {"action": "mark_completed", "_selected_action": self.task_ids}
+        )
+        self.assertEqual(Task.objects.filter(is_completed=True).count(), 6)
+
+
+class TaskApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="apiuser",
+            password="apipass123",
+            first_name="Api",
+            last_name="User"
+        )
+        self.other = User.objects.create_user(
+            username="apiother",
+            password="apipass123"
+        )
+        self.task_type = TaskType.objects.create(name="Api")
+        for index in range(5):
+            task = Task.objects.create(
+                name=f"Api task {index}",
+                description="Api",
+                deadline=timezone.now().date() + datetime.timedelta(
+                    days=index
+                ),
+                task_type=self.task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user, self.other)
+        self.client.login(username="apiuser", password="apipass123")
+
+    def test_requires_authentication(self):
+        response = Client().get(reverse("task-manager:api-task-list"))
+        self.assertEqual(response.status_code, 401)
+
+    def test_worker_overdue_count_is_computed(self):
+        later = timezone.localdate() + datetime.timedelta(days=3)
+        with mock.patch("django.utils.timezone.localdate", return_value=later):
+            response = self.client.get(
+                reverse("task-manager:api-worker-detail", args=[self.user.pk]),
+                {"fields": "open_task_count,overdue_task_count"}
+            )
+        self.assertEqual(
+            response.json(),
+            {"id": self.user.pk, "open_task_count": 5, "overdue_task_count": 3}
+        )
+
+    def test_sparse_fields_and_relations(self):
+        response = self.client.get(
+            reverse("task-manager:api-task-list"),
+            {"fields": "name,task_type.name,assignees.username"}
+        )
+        result = response.json()["results"][0]
+        self.assertEqual(
+            set(result), {"id", "name", "task_type", "assignees"}
+        )
+        self.assertEqual(result["task_type"]["name"], "Api")
+        self.assertEqual(
+            {worker["username"] for worker in result["assignees"]},
+            {"apiuser", "apiother"}
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(
+            reverse("task-manager:api-task-list"), {"fields": "password"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_pagination(self):
+        url = reverse("task-manager:api-task-list")
+        first = self.client.get(url, {"limit": 3}).json()
+        self.assertEqual(len(first["results"]), 3)
+        self.assertIsNone(first["previous"])
+        second = self.client.get(first["next"]).json()
+        self.assertEqual(len(second["results"]), 2)
+        self.assertIsNone(second["next"])
+        self.assertEqual(
+            {task["id"] for task in first["results"] + second["results"]},
+            set(Task.objects.values_list("pk", flat=True))
+        )
+
+    def test_etag_revalidation(self):
+        url = reverse("task-manager:api-task-list")
+        etag = self.client.get(url)["ETag"]
+        # Session, user and the version lookup; nothing is serialized.
+        with self.assertNumQueries(3):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        task = Task.objects.first()
+        task.is_completed = True
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as saved:
+                task.save()
+        # The shared version row is only written after the commit.
+        self.assertFalse(
+            any("resourceversion" in query["sql"] for query in saved)
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_create_update_and_delete_task(self):
+        # Token clients send no CSRF token.
+        self.client = Client(
+            enforce_csrf_checks=True,
+            headers={"authorization": f"Token {ApiToken.issue(self.user)}"}
+        )
+        url = reverse("task-manager:api-task-list")
+        response = self.client.post(
+            url,
+            {
+                "name": "Created via API",
+                "description": "Body",
+                "deadline": str(
+                    timezone.now().date() + datetime.timedelta(days=3)
+                ),
+                "task_type": self.task_type.pk,
+                "assignees": [self.other.pk],
+                "priority": "high",
+            },
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 201)
+        task = Task.objects.get(name="Created via API")
+        self.assertEqual(task.created_by, self.user)
+
+        detail = reverse("task-manager:api-task-detail", args=[task.pk])
+        response = self.client.patch(
+            detail, {"name": "Renamed"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["name"], "Renamed")
+        self.assertEqual(
+            list(task.assignees.values_list("pk", flat=True)),
+            [self.other.pk]
+        )
+
+        response = self.client.delete(detail)
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Task.objects.filter(pk=task.pk).exists())
+
+    def test_session_writes_need_the_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.login(username="apiuser", password="apipass123")
+        url = reverse("task-manager:api-task-type-list")
+        response = client.post(
+            url, {"name": "Forged"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.json(), {"detail": "CSRF verification failed."}
+        )
+
+        client.get(reverse("task-manager:task-create"))
+        response = client.post(
+            url,
+            {"name": "Forged"},
+            content_type="application/json",
+            headers={"x-csrftoken": client.cookies["csrftoken"].value}
+        )
+        # Past the CSRF check, into the permission check.
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.json(),
+            {"detail": "You don't have permission to do this."}
+        )
+
+    def test_tokens(self):
+        out = io.StringIO()
+        call_command("create_api_token", "apiother", stdout=out)
+        key = out.getvalue().strip()
+        self.assertFalse(ApiToken.objects.filter(key_digest=key).exists())
+        url = reverse("task-manager:api-worker-list")
+        response = Client().get(url, headers={"authorization": f"Token {key}"})
+        self.assertEqual(response.status_code, 200)
+
+        response = Client().get(url, headers={"authorization": "Token nope"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"detail": "Invalid token."})
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+        with self.assertRaises(CommandError):
+            call_command("create_api_token", "nobody", stdout=io.StringIO())
+
+    def test_only_creator_can_modify_task(self):
+        task = Task.objects.first()
+        self.client.login(username="apiother", password="apipass123")
+        response = self.client.delete(
+            reverse("task-manager:api-task-detail", args=[task.pk])
+        )
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            reverse("task-manager:api-task-type-list"),
+            {"name": "Nope"},
+            content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="asyncuser",
+            password="asyncpass123",
+            position=Position.objects.create(name="Async")
+        )
+        self.task_type = TaskType.objects.create(name="Async type")
+        for index in range(12):
+            task = Task.objects.create(
+                name=f"Async task {index}",
+                description="Async",
+                deadline=timezone.now().date() + datetime.timedelta(
+                    days=index
+                ),
+                task_type=self.task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user)
+        self.task = task
+
+    async def test_async_pages_match_sync_pages(self):
+        await self.async_client.aforce_login(self.user)
+        pages = [
+            ("index", []),
+            ("user-tasks", []),
+            ("task-detail", [self.task.pk]),
+            ("worker-detail", [self.user.pk]),
+            ("task-type-detail", [self.task_type.pk]),
+        ]
+        for name, args in pages:
+            sync_response = await self.async_client.get(
+                reverse(f"task-manager:{name}", args=args)
+            )
+            async_response = await self.async_client.get(
+                reverse(f"task-manager:async-{name}", args=args)
+            )
+            self.assertEqual(async_response.status_code, 200)
+            self.assertEqual(
+                list(async_response.context.get("tasks", [])),
+                list(sync_response.context.get("tasks", []))
+            )
+            self.assertTemplateUsed(
+                async_response, sync_response.templates[0].name
+            )
+
+    async def test_async_pages_require_login(self):
+        response = await self.async_client.get(
+            reverse("task-manager:async-user-tasks")
+        )
+        self.assertEqual(response.status_code, 302)
+
+    async def test_async_task_list_follows_cursor(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse("task-manager:async-user-tasks")
+        first = await self.async_client.get(url)
+        page = first.context["page_obj"]
+        self.assertEqual(len(page), 10)
+        second = await self.async_client.get(
+            url, {"cursor": page.next_cursor}
+        )
+        self.assertEqual(len(second.context["tasks"]), 2)
+
+    def test_benchmark_command(self):
+        out = io.StringIO()
+        call_command(
+            "benchmark_async_views",
+            requests=2,
+            concurrency=2,
+            host="testserver",
+            stdout=out,
+            stderr=io.StringIO()
+        )
+        self.assertIn("task-type-detail", out.getvalue())
+
+
+class QueryMetricsMiddlewareTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.user = User.objects.create_user(
+            username="metricsuser",
+            password="metricspass123"
+        )
+        self.client.login(username="metricsuser", password="metricspass123")
+
+    def test_records_histograms_per_url_name(self):
+        self.client.get(reverse("task-manager:user-tasks"))
+        response = self.client.get(reverse("task-manager:metrics"))
+        body = response.content.decode()
+        view = 'view="task-manager:user-tasks"'
+        self.assertIn(f"task_manager_view_queries_count{{{view}}} 1", body)
+        self.assertIn(f"task_manager_view_response_bytes_sum{{{view}}}", body)
+        template_seconds = metrics.TEMPLATE_SECONDS.series[
+            "task-manager:user-tasks"
+        ][1]
+        self.assertGreater(template_seconds, 0)
+
+    def test_metrics_endpoint_is_local_only(self):
+        response = self.client.get(
+            reverse("task-manager:metrics"), REMOTE_ADDR="10.0.0.1"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_query_budget(self):
+        with mock.patch.object(TaskListView, "query_budget", 1):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("task-manager:user-tasks"))
+            with override_settings(QUERY_BUDGET_STRICT=False):
+                with self.assertLogs("task_manager.middleware", "WARNING"):
+                    self.client.get(reverse("task-manager:user-tasks"))
+
+
+class QueryCountRegressionTests(TestCase):
+    # Every GET route in task_manager/urls.py, with the object its pk
+    # points at. A new route fails test_every_route_is_covered until it
+    # is listed here or in SKIPPED.
+    PAGES = {
+        "index": None,
+        "user-tasks": None,
+        "user-tasks-export": None,
+        "task-board": None,
+        "task-board-column": None,
+        "task-calendar": None,
+        "task-calendar-month": None,
+        "task-calendar-week": None,
+        "task-calendar-day": None,
+        "workload-analytics": None,
+        "task-search": None,
+        "task-create": None,
+        "task-detail": "task",
+        "task-history": "task",
+        "task-update": "task",
+        "task-delete": "task",
+        "worker-list": None,
+        "worker-create": None,
+        "worker-detail": "worker",
+        "worker-activity": "worker",
+        "worker-update": "worker",
+        "worker-delete": "worker",
+        "task-type-list": None,
+        "task-type-detail": "task_type",
+        "task-type-update": "task_type",
+        "task-type-delete": "task_type",
+        "logout-confirmation": None,
+        "metrics": None,
+        "async-index": None,
+        "async-user-tasks": None,
+        "async-task-detail": "task",
+        "async-worker-detail": "worker",
+        "async-task-type-detail": "task_type",
+        "api-task-list": None,
+        "api-task-detail": "task",
+        "api-task-type-list": None,
+        "api-task-type-detail": "task_type",
+        "api-worker-list": None,
+        "api-worker-detail": "worker",
+        "api-position-list": None,
+        "api-position-detail": "position",
+    }
+    SKIPPED = {"task-bulk-action"}
+    TODAY = timezone.localdate()
+    ARGS = {
+        "task-board-column": ["open", "medium"],
+        "task-calendar-month": [TODAY.year, TODAY.month],
+        "task-calendar-week": list(TODAY.isocalendar()[:2]),
+        "task-calendar-day": [TODAY.year, TODAY.month, TODAY.day],
+    }
+    QUERY_STRINGS = {
+        "task-search": {"q": "seeded"},
+        "api-task-list": {
+            "fields": "name,task_type.name,created_by.username,"
+                      "assignees.username"
+        },
+        "api-task-detail": {
+            "fields": "name,task_type.name,assignees.username"
+        },
+        "api-worker-list": {
+            "fields": "username,position.name,overdue_task_count"
+        },
+    }
+    SMALL, LARGE = 3, 25
+
+    def setUp(self):
+        self.position = Position.objects.create(name="Seeded position")
+        self.user = User.objects.create_superuser(
+            username="seeded",
+            password="seededpass123",
+            position=self.position
+        )
+        self.task_type = TaskType.objects.create(name="Seeded type")
+        self.workers = []
+        self.seeded = 0
+        self.client.login(username="seeded", password="seededpass123")
+
+    def seed(self, total):
+        for index in range(self.seeded, total):
+            position = Position.objects.create(name=f"Position {index}")
+            self.workers.append(
+                User.objects.create_user(
+                    username=f"seeded{index}", position=position
+                )
+            )
+            TaskType.objects.create(name=f"Type {index}")
+            task = Task.objects.create(
+                name=f"Seeded task {index}",
+                description="seeded",
+                deadline=timezone.now().date() + datetime.timedelta(
+                    days=index
+                ),
+                task_type=self.task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user, *self.workers[-3:])
+        self.seeded = total
+        self.objects = {
+            "task": Task.objects.order_by("pk").first(),
+            "worker": self.user,
+            "task_type": self.task_type,
+            "position": self.position,
+        }
+
+    def url(self, name):
+        target = self.PAGES[name]
+        args = [self.objects[target].pk] if target else self.ARGS.get(
+            name, []
+        )
+        return reverse(f"task-manager:{name}", args=args)
+
+    def count_queries(self, name):
+        url = self.url(name)
+        data = self.QUERY_STRINGS.get(name, {})
+        self.client.get(url, data)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, data)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, name)
+        return len(queries)
+
+    def test_every_route_is_covered(self):
+        from task_manager.urls import urlpatterns
+
+        self.assertEqual(
+            {pattern.name for pattern in urlpatterns},
+            set(self.PAGES) | self.SKIPPED
+        )
+
+    def test_query_counts_do_not_grow_with_data(self):
+        self.seed(self.SMALL)
+        small = {name: self.count_queries(name) for name in self.PAGES}
+        self.seed(self.LARGE)
+        for name in self.PAGES:
+            with self.subTest(view=name):
+                self.assertEqual(self.count_queries(name), small[name])
+
+
+class QuerySetOptimizeMixinTests(TestCase):
+    def shape_errors(self, **attributes):
+        view_class = type(
+            "ShapedView",
+            (QuerySetOptimizeMixin, generic.ListView),
+            {"model": Task, **attributes}
+        )
+        return [error.id for error in view_class.check_query_shape()]
+
+    def test_routed_views_pass_checks(self):
+        self.assertEqual(check_query_shapes(None), [])
+
+    def test_rejects_many_to_many_select_related(self):
+        self.assertEqual(
+            self.shape_errors(select_related_fields=["assignees"]),
+            ["task_manager.E002"]
+        )
+
+    def test_rejects_unknown_and_non_relation_fields(self):
+        self.assertEqual(
+            self.shape_errors(
+                select_related_fields=["name"],
+                prefetch_related_fields=[Prefetch("missing")],
+                only_fields=["task_type__missing"],
+            ),
+            ["task_manager.E003", "task_manager.E001", "task_manager.E001"]
+        )
+
+    def test_queryset_is_built_once_per_request(self):
+        user = User.objects.create_user(username="shaped")
+        view = TaskListView()
+        view.setup(RequestFactory().get("/tasks/"))
+        view.request.user = user
+        with mock.patch.object(
+            TaskListView,
+            "shape_queryset",
+            autospec=True,
+            side_effect=lambda view, queryset: queryset
+        ) as shape:
+            self.assertIs(view.get_queryset(), view.get_queryset())
+        self.assertEqual(shape.call_count, 1)
+
+
+class TaskCardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="carduser",
+            password="cardpass123"
+        )
+        self.task = Task.objects.create(
+            name="Cached card",
+            description="Card body",
+            deadline=timezone.now().date() + datetime.timedelta(days=2),
+            task_type=TaskType.objects.create(name="Cards"),
+            created_by=self.user
+        )
+        self.task.assignees.add(self.user)
+        self.client.login(username="carduser", password="cardpass123")
+        self.url = reverse("task-manager:user-tasks")
+
+    def test_version_bumps(self):
+        version = Task.objects.get(pk=self.task.pk).version
+        self.task.save(update_fields=["is_completed"])
+        self.assertEqual(self.task.version, version + 1)
+        self.task.assignees.remove(self.user)
+        bulk.set_priority([self.task.pk], "urgent")
+        self.task.task_type.save()
+        self.assertEqual(
+            Task.objects.get(pk=self.task.pk).version, version + 4
+        )
+
+    def test_cards_are_served_from_cache_until_the_task_changes(self):
+        self.assertContains(self.client.get(self.url), "Cached card")
+        # A write that skips the version leaves the cached card in place.
+        Task.objects.filter(pk=self.task.pk).update(name="Renamed card")
+        self.assertContains(self.client.get(self.url), "Cached card")
+
+        task = Task.objects.get(pk=self.task.pk)
+        task.save()
+        response = self.client.get(self.url)
+        self.assertContains(response, "Renamed card")
+        self.assertNotContains(response, "Cached card")
+
+    def test_owner_actions_are_not_cached(self):
+        update_url = reverse("task-manager:task-update", args=[self.task.pk])
+        self.assertContains(self.client.get(self.url), update_url)
+        other = User.objects.create_user(username="cardpeer")
+        self.task.assignees.add(other)
+        self.client.force_login(other)
+        response = self.client.get(self.url)
+        self.assertContains(response, "Cached card")
+        self.assertNotContains(response, update_url)
+
+
+class TemplateWarmupTests(TestCase):
+    def test_warm_templates_compiles_project_templates(self):
+        timings = dict(warm_templates())
+        self.assertIn("task_manager/user_task_list.html", timings)
+        self.assertIn("includes/pagination.html", timings)
+
+    def test_command_reports_compile_times(self):
+        out = io.StringIO()
+        call_command("warm_templates", stdout=out)
+        self.assertIn("ms  base.html", out.getvalue())
+        self.assertIn("Compiled", out.getvalue())
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        handlers = {
+            "record": lambda **payload: self.calls.append(payload),
+            "explode": mock.Mock(side_effect=RuntimeError("boom")),
+        }
+        patcher = mock.patch.dict(jobs.HANDLERS, handlers)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_enqueue_rejects_unknown_jobs(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue("missing")
+
+    def test_claimed_jobs_are_not_claimed_twice(self):
+        jobs.enqueue("record", {"n": 1})
+        jobs.enqueue("record", {"n": 2}, delay=60)
+        claimed = jobs.claim("first", 10)
+        self.assertEqual([job.payload for job in claimed], [{"n": 1}])
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(jobs.claim("second", 10), [])
+
+    def test_failed_jobs_back_off_then_fail(self):
+        job = jobs.enqueue("explode", max_attempts=2)
+        worker = jobs.JobWorker()
+        with self.assertLogs("task_manager.jobs", "WARNING"):
+            worker.tick()
+        job.refresh_from_db()
+        self.assertEqual(job.status, "queued")
+        self.assertIn("boom", job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("task_manager.jobs", "WARNING"):
+            worker.tick()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = jobs.enqueue("record")
+        jobs.claim("dead", 1)
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(jobs.requeue_stale(), 1)
+        jobs.JobWorker().run_until_empty()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("done", 2))
+
+        # A job that takes its worker down every time is not retried
+        # forever.
+        crashing = jobs.enqueue("record", max_attempts=1)
+        jobs.claim("dead", 1)
+        Job.objects.filter(pk=crashing.pk).update(
+            locked_at=timezone.now() - datetime.timedelta(hours=1)
+        )
+        self.assertEqual(jobs.requeue_stale(), 0)
+        crashing.refresh_from_db()
+        self.assertEqual(crashing.status, "failed")
+
+    def test_periodic_jobs_are_scheduled_once(self):
+        with mock.patch.dict(jobs.PERIODIC, {"record": "RECORD_INTERVAL"}):
+            # Two workers that both saw no pending job.
+            with mock.patch(
+                "django.db.models.QuerySet.exists", return_value=False
+            ), override_settings(RECORD_INTERVAL=60):
+                jobs.schedule_periodic()
+                jobs.schedule_periodic()
+        self.assertEqual(
+            Job.objects.filter(name="record", periodic=True).count(), 1
+        )
+
+
+class TaskDigestTests(TestCase):
+    def setUp(self):
+        self.today = timezone.localdate()
+        self.user = User.objects.create_user(
+            username="digestuser",
+            password="digestpass123"
+        )
+        self.idle = User.objects.create_user(username="idleuser")
+        task_type = TaskType.objects.create(name="Digest")
+        for name, days, completed in [
+            ("Late", -2, False),
+            ("Later", -1, False),
+            ("Done late", -3, True),
+            ("Today", 0, False),
+            ("Soon", 3, False),
+            ("Far", 10, False),
+        ]:
+            task = Task.objects.create(
+                name=name,
+                description=name,
+                deadline=self.today + datetime.timedelta(days=days),
+                is_completed=completed,
+                task_type=task_type,
+                created_by=self.user
+            )
+            task.assignees.add(self.user)
+
+    def test_compute_digests_counts_and_ranks_open_tasks(self):
+        with override_settings(DIGEST_ITEMS=1, DIGEST_DUE_SOON_DAYS=3):
+            with self.assertNumQueries(3):
+                compute_digests([self.user.pk, self.idle.pk], self.today)
+        digest = TaskDigest.objects.get(worker=self.user)
+        self.assertEqual((digest.overdue_count, digest.due_soon_count), (2, 2))
+        self.assertEqual(
+            [item["name"] for item in digest.overdue_tasks], ["Late"]
+        )
+        self.assertEqual(digest.due_soon_tasks[0]["deadline"], self.today)
+        idle = TaskDigest.objects.get(worker=self.idle)
+        self.assertEqual((idle.overdue_count, idle.overdue), (0, []))
+
+    def test_run_jobs_refreshes_digests_shown_on_the_task_list(self):
+        out = io.StringIO()
+        call_command("run_jobs", once=True, stdout=out)
+        # The digest refresh, its batch and the workload rollup refresh.
+        self.assertIn("Ran 3 jobs", out.getvalue())
+        self.assertEqual(TaskDigest.objects.count(), 2)
+        # The next refresh waits for DIGEST_INTERVAL.
+        self.assertTrue(
+            Job.objects.filter(name="refresh_digests", status="queued")
+            .exclude(run_after__lte=timezone.now()).exists()
+        )
+
+        self.client.login(username="digestuser", password="digestpass123")
+        for url_name in ("user-tasks", "async-user-tasks"):
+            response = self.client.get(reverse(f"task-manager:{url_name}"))
+            self.assertContains(response, "2 overdue")
+            self.assertContains(
+                response,
+                reverse("task-manager:task-detail", args=[
+                    Task.objects.get(name="Late").pk
+                ])
+            )
+
+
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="replicauser",
+            password="replicapass123"
+        )
+        self.client.login(username="replicauser", password="replicapass123")
+        # An empty database: a replica that has not caught up at all.
+        replica = {**settings.DATABASES["default"], "NAME": ":memory:"}
+        patcher = mock.patch.dict(settings.DATABASES, {"replica": replica})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def route(self, request, get_response=None):
+        seen = []
+
+        def respond(request):
+            if get_response:
+                get_response()
+            seen.append(routers.current.get().read_alias)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(respond)(request)
+        self.assertIsNone(routers.current.get())
+        return seen[0], response
+
+    def test_safe_requests_read_from_the_replica(self):
+        factory = RequestFactory()
+        alias, response = self.route(factory.get("/"))
+        self.assertEqual(alias, "replica")
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        alias, response = self.route(factory.post("/"))
+        self.assertIsNone(alias)
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+        factory.cookies[settings.REPLICA_PIN_COOKIE] = "1"
+        self.assertEqual(self.route(factory.get("/"))[0], None)
+
+    def test_writes_switch_reads_to_the_primary(self):
+        router = routers.ReplicaRouter()
+        alias, response = self.route(
+            RequestFactory().get("/"), lambda: router.db_for_write(Task)
+        )
+        self.assertIsNone(alias)
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        # Session writes alone do not pin.
+        alias, response = self.route(
+            RequestFactory().get("/"), lambda: router.db_for_write(Session)
+        )
+        self.assertEqual(alias, "replica")
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_redirect_after_create_reads_from_the_primary(self):
+        # Any read routed to the empty replica would fail the request.
+        response = self.client.post(
+            reverse("task-manager:task-create"),
+            {
+                "name": "Pinned task",
+                "description": "Read your writes",
+                "deadline": timezone.localdate() + datetime.timedelta(days=1),
+                "task_type": TaskType.objects.create(name="Pinning").pk,
+                "priority": "medium",
+                "assignees": [self.user.pk],
+            },
+            follow=True
+        )
+        self.assertContains(response, "Pinned task")
+        self.assertEqual(
+            response.client.cookies[settings.REPLICA_PIN_COOKIE]["max-age"],
+            settings.REPLICA_PIN_SECONDS
+        )
+
+    def test_router(self):
+        router = routers.ReplicaRouter()
+        token = routers.current.set(routers.Routing("replica"))
+        try:
+            self.assertEqual(router.db_for_read(Task), "replica")
+            self.assertIsNone(router.db_for_read(Session))
+        finally:
+            routers.current.reset(token)
+        self.assertIsNone(router.db_for_read(Task))
+        self.assertFalse(router.allow_migrate("replica", "task_manager"))
+        self.assertIsNone(router.allow_migrate("default", "task_manager"))
+
+    def test_benchmark_connections_command(self):
+        out = io.StringIO()
+        call_command("benchmark_connections", requests=3, stdout=out)
+        self.assertIn("new connection", out.getvalue())
+        self.assertIn("per request", out.getvalue())
+
+
+class TaskBoardTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="boarduser",
+            password="boardpass123"
+        )
+        self.other = User.objects.create_user(username="boardother")
+        task_type = TaskType.objects.create(name="Board")
+        today = timezone.localdate()
+        for index in range(5):
+            for priority in ("urgent", "low"):
+                task = Task.objects.create(
+                    name=f"{priority} {index}",
+                    description="board",
+                    deadline=today + datetime.timedelta(days=index),
+                    priority=priority,
+                    is_completed=index == 4,
+                    task_type=task_type,
+                    created_by=self.user
+                )
+                task.assignees.add(self.user, self.other)
+        self.client.login(username="boarduser", password="boardpass123")
+
+    def test_columns_are_capped_in_one_query(self):
+        with mock.patch(
+            "task_manager.views.TaskBoardView.cards_per_column", 2
+        ):
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse("task-manager:task-board"))
+        columns = {
+            (column.state, column.priority): column
+            for column in response.context["columns"]
+        }
+        self.assertEqual(len(columns), 8)
+        urgent = columns["open", "urgent"]
+        self.assertEqual(
+            [task.name for task in urgent.cards], ["urgent 0", "urgent 1"]
+        )
+        self.assertIsNotNone(urgent.next_cursor)
+        self.assertEqual(
+            [task.name for task in columns["completed", "low"].cards],
+            ["low 4"]
+        )
+        self.assertIsNone(columns["completed", "low"].next_cursor)
+        self.assertEqual(columns["open", "high"].cards, [])
+        self.assertContains(response, "boardother", count=6)
+
+    def test_column_endpoint_continues_from_the_cursor(self):
+        with mock.patch(
+            "task_manager.views.TaskBoardView.cards_per_column", 2
+        ):
+            response = self.client.get(reverse("task-manager:task-board"))
+        cursor = response.context["columns"][0].next_cursor
+        url = reverse(
+            "task-manager:task-board-column", args=["open", "urgent"]
+        )
+        with mock.patch(
+            "task_manager.views.TaskBoardColumnView.paginate_by", 1
+        ):
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(
+                [task.name for task in response.context["cards"]],
+                ["urgent 2"]
+            )
+            # The board fetches the link as is, so it names the column.
+            more = f"{url}?cursor={response.context['page_obj'].next_cursor}"
+            self.assertContains(response, f'href="{more}"')
+            response = self.client.get(more)
+        self.assertEqual(
+            [task.name for task in response.context["cards"]],
+            ["urgent 3"]
+        )
+        self.assertNotContains(response, "data-board-more")
+        self.assertEqual(
+            self.client.get(
+                reverse("task-manager:task-board-column", args=["x", "low"])
+            ).status_code,
+            404
+        )
+
+
+# Events are kept on commit, which TestCase never reaches.
+class TaskEventTests(TransactionTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="eventuser",
+            password="eventpass123"
+        )
+        self.editor = User.objects.create_superuser(
+            username="eventeditor",
+            password="eventpass123"
+        )
+        self.helper = User.objects.create_user(username="eventhelper")
+        self.task_type = TaskType.objects.create(name="Events")
+        self.task = Task.objects.create(
+            name="Logged task",
+            description="Before",
+            deadline=timezone.localdate(),
+            task_type=self.task_type,
+            created_by=self.user
+        )
+        self.task.assignees.add(self.user)
+        self.client.login(username="eventeditor", password="eventpass123")
+
+    def kinds(self):
+        return list(
+            TaskEvent.objects.filter(task=self.task)
+            .order_by("id").values_list("kind", flat=True)
+        )
+
+    def test_update_writes_one_batch_and_keeps_the_creator(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("task-manager:task-update", args=[self.task.pk]),
+                {
+                    "name": "Logged task",
+                    "description": "After",
+                    "deadline": self.task.deadline,
+                    "task_type": self.task_type.pk,
+                    "priority": "medium",
+                    "assignees": [self.user.pk, self.helper.pk],
+                }
+            )
+        inserts = [
+            query for query in queries.captured_queries
+            if query["sql"].startswith('INSERT INTO "task_manager_taskevent"')
+        ]
+        self.assertEqual(len(inserts), 1)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.created_by, self.user)
+
+        updated, assigned = TaskEvent.objects.filter(
+            task=self.task, actor=self.editor
+        ).order_by("id")
+        self.assertEqual(
+            (updated.kind, updated.changes),
+            ("updated", {"description": ["Before", "After"]})
+        )
+        self.assertEqual(
+            (assigned.kind, assigned.changes),
+            ("assigned", {"workers": [self.helper.pk]})
+        )
+
+    def test_model_and_bulk_writes_are_logged(self):
+        self.task.is_completed = True
+        self.task.save()
+        bulk.set_priority([self.task.pk], "urgent")
+        bulk.remove_assignees([self.task.pk], [self.user.pk, self.helper.pk])
+        bulk.delete_tasks([self.task.pk])
+        self.assertEqual(
+            self.kinds(),
+            [
+                "created",
+                "assigned",
+                "completed",
+                "updated",
+                "unassigned",
+                "deleted",
+            ]
+        )
+        unassigned = TaskEvent.objects.get(kind="unassigned")
+        self.assertEqual(unassigned.changes, {"workers": [self.user.pk]})
+
+    def test_rolled_back_changes_are_not_logged(self):
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                bulk.complete_tasks([self.task.pk])
+                raise RuntimeError
+        self.assertNotIn("completed", self.kinds())
+
+    def test_timelines(self):
+        bulk.set_priority([self.task.pk], "low")
+        self.client.post(
+            reverse("task-manager:task-detail", args=[self.task.pk])
+        )
+        response = self.client.get(
+            reverse("task-manager:task-history", args=[self.task.pk])
+        )
+        self.assertEqual(
+            [event.kind for event in response.context["events"]],
+            ["updated", "assigned", "created"]
+        )
+        self.assertContains(response, "eventuser")
+
+        with mock.patch(
+            "task_manager.views.WorkerActivityView.paginate_by", 1
+        ):
+            TaskEvent.objects.filter(kind="updated").update(
+                actor=self.editor
+            )
+            response = self.client.get(
+                reverse("task-manager:worker-activity", args=[self.editor.pk])
+            )
+        self.assertEqual(len(response.context["events"]), 1)
+        self.assertContains(response, "Logged task")
+
+        bulk.delete_tasks([self.task.pk])
+        response = self.client.get(
+            reverse("task-manager:task-history", args=[self.task.pk])
+        )
+        self.assertContains(response, "deleted task")
+
+
+class RouteBenchmarkTests(TestCase):
+    def snapshot(self):
+        return [
+            (
+                task.name,
+                task.deadline,
+                task.priority,
+                task.is_completed,
+                sorted(worker.username for worker in task.assignees.all())
+            )
+            for task in Task.objects.prefetch_related("assignees")
+            .order_by("name")
+        ]
+
+    def test_generator_is_deterministic(self):
+        DatasetGenerator(seed=7, batch_size=4).generate(2, 3, 5, 10)
+        self.assertEqual(Position.objects.count(), 2)
+        self.assertEqual(TaskType.objects.count(), 3)
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Task.objects.count(), 10)
+        first = self.snapshot()
+        self.assertTrue(all(assignees for *_, assignees in first))
+
+        Task.objects.all().delete()
+        User.objects.all().delete()
+        Position.objects.all().delete()
+        TaskType.objects.all().delete()
+        DatasetGenerator(seed=7, batch_size=3).generate(2, 3, 5, 10)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_command_benchmarks_every_route_against_a_baseline(self):
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            call_command(
+                "benchmark_routes",
+                generate=True,
+                positions=2,
+                task_types=2,
+                workers=3,
+                tasks=20,
+                requests=2,
+                concurrency=1,
+                host="testserver",
+                save_baseline=path,
+                stdout=out,
+                stderr=io.StringIO()
+            )
+            self.assertIn("wsgi:task-board-column", out.getvalue())
+            self.assertIn("asgi:worker-activity", out.getvalue())
+            self.assertNotIn("task-bulk-action", out.getvalue())
+            with open(path) as stream:
+                baseline = json.load(stream)
+            self.assertEqual(
+                baseline["routes"]["wsgi:task-detail"]["errors"], 0
+            )
+
+            for result in baseline["routes"].values():
+                result["queries"] = 0
+            with open(path, "w") as stream:
+                json.dump(baseline, stream)
+            out = io.StringIO()
+            with self.assertRaises(CommandError):
+                call_command(
+                    "benchmark_routes",
+                    interface="wsgi",
+                    routes=["task-detail"],
+                    requests=2,
+                    concurrency=1,
+                    host="testserver",
+                    baseline=path,
+                    fail_on_regression=True,
+                    stdout=out,
+                    stderr=io.StringIO()
+                )
+        self.assertIn("queries per request", out.getvalue())
+
+
+class GenerateDataCommandTests(TestCase):
+    def test_generates_linked_rows_once_per_seed(self):
+        out = io.StringIO()
+        call_command(
+            "generate_data",
+            positions=2,
+            task_types=2,
+            workers=4,
+            tasks=25,
+            seed=3,
+            batch_size=10,
+            stdout=out
+        )
+        self.assertIn("tasks: 25/25", out.getvalue())
+        self.assertEqual(Task.objects.count(), 25)
+        self.assertFalse(Task.objects.filter(assignees=None).exists())
+        self.assertEqual(
+            Task.assignees.through.objects.count(),
+            sum(
+                worker.open_task_count + worker.completed_task_count
+                for worker in User.objects.all()
+            )
+        )
+        self.assertTrue(
+            self.client.login(
+                username="g3-worker0", password="generated-password"
+            )
+        )
+        with self.assertRaises(CommandError):
+            call_command("generate_data", seed=3, stdout=io.StringIO())
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="etaguser",
+            password="etagpass123"
+        )
+        self.other = User.objects.create_user(
+            username="etagother",
+            password="etagpass123"
+        )
+        self.task_type = TaskType.objects.create(name="Conditional")
+        self.task = Task.objects.create(
+            name="Cached task",
+            description="Unchanged",
+            deadline=timezone.localdate(),
+            task_type=self.task_type,
+            created_by=self.user
+        )
+        self.task.assignees.add(self.user)
+        self.client.login(username="etaguser", password="etagpass123")
+        self.urls = {
+            "task": reverse("task-manager:task-detail", args=[self.task.pk]),
+            "worker": reverse(
+                "task-manager:worker-detail", args=[self.user.pk]
+            ),
+            "task_type": reverse(
+                "task-manager:task-type-detail", args=[self.task_type.pk]
+            ),
+        }
+
+    def etags(self):
+        return {
+            page: self.client.get(url).headers["ETag"]
+            for page, url in self.urls.items()
+        }
+
+    def test_repeat_get_is_answered_before_rendering(self):
+        response = self.client.get(self.urls["task"])
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response.headers)
+        self.assertIn("private", response.headers["Cache-Control"])
+        self.assertIn("no-cache", response.headers["Cache-Control"])
+        self.assertIn("Cookie", response.headers["Vary"])
+
+        # The session, the user and the updated_at lookup.
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                self.urls["task"],
+                headers={"if-none-match": response.headers["ETag"]}
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(hasattr(response, "template_name"))
+        response = self.client.get(
+            self.urls["task"],
+            headers={"if-modified-since": response.headers["Last-Modified"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+        etag = response.headers["ETag"]
+        self.client.login(username="etagother", password="etagpass123")
+        response = self.client.get(
+            self.urls["task"], headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_writes_change_the_validators_of_every_page_showing_them(self):
+        before = self.etags()
+        touched = TaskType.objects.get(pk=self.task_type.pk).updated_at
+        bulk.complete_tasks([self.task.pk])
+        after = self.etags()
+        self.assertTrue(all(after[page] != before[page] for page in before))
+        # Pages derive the change from the task; its type is not written.
+        self.assertEqual(
+            TaskType.objects.get(pk=self.task_type.pk).updated_at, touched
+        )
+
+        before = after
+        self.task.assignees.add(self.other)
+        after = self.etags()
+        self.assertNotEqual(after["task"], before["task"])
+        # The worker page keys the task's card on its bumped version.
+        self.assertNotEqual(after["worker"], before["worker"])
+
+        # A task leaving the page moves nothing the page still lists.
+        before = after
+        self.task.assignees.remove(self.user)
+        self.assertNotEqual(self.etags()["worker"], before["worker"])
+        self.task.assignees.add(self.user)
+        before = self.etags()
+
+        before = after
+        TaskType.objects.get(pk=self.task_type.pk).save()
+        after = self.etags()
+        self.assertNotEqual(after["task"], before["task"])
+        self.assertNotEqual(after["task_type"], before["task_type"])
+
+        before = after
+        position = Position.objects.create(name="Tester")
+        User.objects.filter(pk=self.user.pk).update(position=position)
+        position.name = "Senior tester"
+        position.save()
+        self.assertNotEqual(self.etags()["worker"], before["worker"])
+
+    async def test_async_detail_answers_not_modified(self):
+        await self.async_client.aforce_login(self.user)
+        url = reverse("task-manager:async-task-detail", args=[self.task.pk])
+        response = await self.async_client.get(url)
+        response = await self.async_client.get(
+            url, headers={"if-none-match": response.headers["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+
+class TaskCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="calendaruser",
+            password="calendarpass123"
+        )
+        self.task_type = TaskType.objects.create(name="Calendar")
+        self.client.login(username="calendaruser", password="calendarpass123")
+
+    def create_task(self, name, deadline, **fields):
+        return Task.objects.create(
+            name=name,
+            description="Due",
+            deadline=deadline,
+            task_type=self.task_type,
+            created_by=self.user,
+            **fields
+        )
+
+    def day(self, response, deadline):
+        return next(
+            day for week in response.context["weeks"] for day in week
+            if day.date == deadline and not day.outside
+        )
+
+    def test_month_is_one_grouped_query(self):
+        today = timezone.localdate()
+        for index in range(3):
+            self.create_task(f"Urgent {index}", today, priority="urgent")
+        self.create_task("Done", today, is_completed=True)
+        other_day = today.replace(day=2 if today.day == 1 else 1)
+        self.create_task("Low", other_day, priority="low")
+
+        # The session, the user and the per-day counts.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("task-manager:task-calendar"))
+        day = self.day(response, today)
+        self.assertEqual(day.total, 4)
+        self.assertEqual(day.completed, 1)
+        self.assertEqual(day.by_priority(), [("urgent", "Urgent", 3)])
+        self.assertContains(response, "3 urgent")
+
+        year, week, _ = today.isocalendar()
+        response = self.client.get(
+            reverse("task-manager:task-calendar-week", args=[year, week])
+        )
+        self.assertEqual(len(response.context["weeks"][0]), 7)
+        self.assertEqual(self.day(response, today).total, 4)
+        response = self.client.get(
+            reverse("task-manager:task-calendar-week", args=[year, 60])
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_closed_months_are_cached_until_a_task_changes(self):
+        deadline = datetime.date(2024, 2, 29)
+        task = self.create_task("Leap", deadline)
+        url = reverse("task-manager:task-calendar-month", args=[2024, 2])
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(self.day(response, deadline).open, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.complete_tasks([task.pk])
+        response = self.client.get(url)
+        self.assertEqual(self.day(response, deadline).completed, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.refresh_from_db()
+            task.deadline = datetime.date(2024, 3, 1)
+            task.save()
+        response = self.client.get(url)
+        self.assertEqual(self.day(response, deadline).total, 0)
+
+    def test_day_details_load_separately(self):
+        deadline = datetime.date(2024, 5, 14)
+        for index in range(3):
+            self.create_task(f"Due {index}", deadline)
+        self.create_task("Other day", deadline + datetime.timedelta(days=1))
+        url = reverse("task-manager:task-calendar-day", args=[2024, 5, 14])
+        with mock.patch(
+            "task_manager.views.TaskCalendarDayView.paginate_by", 2
+        ):
+            response = self.client.get(url)
+            self.assertEqual(len(response.context["tasks"]), 2)
+            self.assertContains(response, f"{url}?cursor=")
+            response = self.client.get(
+                url, {"cursor": response.context["page_obj"].next_cursor}
+            )
+        self.assertEqual(
+            [task.name for task in response.context["tasks"]], ["Due 2"]
+        )
+        response = self.client.get(
+            reverse("task-manager:task-calendar-day", args=[2024, 2, 30])
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class WorkloadAnalyticsTests(TestCase):
+    def setUp(self):
+        self.developer = Position.objects.create(name="Analyst Developer")
+        self.tester = Position.objects.create(name="Analyst Tester")
+        self.user = User.objects.create_user(
+            username="analyticsuser",
+            password="analyticspass123",
+            position=self.developer
+        )
+        self.other = User.objects.create_user(
+            username="analyticsother",
+            password="analyticspass123",
+            position=self.tester
+        )
+        self.bug = TaskType.objects.create(name="Analytics Bug")
+        self.feature = TaskType.objects.create(name="Analytics Feature")
+        today = timezone.localdate()
+        self.late = self.create_task(
+            "Late", self.bug, today - datetime.timedelta(days=1), "urgent"
+        )
+        self.late.assignees.set([self.user, self.other])
+        self.done = self.create_task(
+            "Done", self.bug, today, "urgent", is_completed=True
+        )
+        self.done.assignees.set([self.user])
+        self.feature_task = self.create_task(
+            "Feature", self.feature, today, "low"
+        )
+        self.feature_task.assignees.set([self.other])
+        self.client.login(
+            username="analyticsuser", password="analyticspass123"
+        )
+
+    def create_task(self, name, task_type, deadline, priority, **fields):
+        return Task.objects.create(
+            name=name,
+            description="Counted",
+            deadline=deadline,
+            task_type=task_type,
+            priority=priority,
+            created_by=self.user,
+            **fields
+        )
+
+    def report(self, rows, key):
+        return {row[key]: row for row in rows}
+
+    def age_everything(self):
+        # Moves every group out of the overlap window of the next refresh.
+        now = timezone.now()
+        for model in (Task, TaskType, Position, User):
+            model.objects.update(updated_at=now - datetime.timedelta(hours=2))
+        WorkloadCheckpoint.objects.update(
+            refreshed_at=now - datetime.timedelta(hours=1)
+        )
+
+    def test_full_refresh_counts_every_group(self):
+        self.assertEqual(analytics.refresh(), (True, 4))
+
+        task_types = self.report(analytics.by_task_type(), "task_type_id")
+        bug = task_types[self.bug.pk]
+        self.assertEqual(bug["label"], "Analytics Bug")
+        self.assertEqual(
+            (bug["tasks"], bug["open_tasks"], bug["completed_tasks"]),
+            (2, 1, 1)
+        )
+        self.assertEqual(bug["overdue_tasks"], 1)
+        self.assertEqual(bug["completion_percent"], 50.0)
+        self.assertEqual(bug["overdue_percent"], 100.0)
+
+        # The shared overdue task counts once per assignee.
+        positions = self.report(analytics.by_position(), "position_id")
+        self.assertEqual(positions[self.developer.pk]["tasks"], 2)
+        self.assertEqual(positions[self.tester.pk]["tasks"], 2)
+        self.assertEqual(positions[self.tester.pk]["overdue_tasks"], 1)
+
+        priorities = self.report(analytics.by_priority(), "priority")
+        self.assertEqual(priorities["urgent"]["tasks"], 2)
+        self.assertEqual(priorities["low"]["overdue_percent"], 0.0)
+
+    def test_incremental_refresh_recounts_changed_groups(self):
+        analytics.refresh()
+        self.age_everything()
+        self.assertEqual(analytics.refresh(), (False, 0))
+
+        self.age_everything()
+        self.feature_task.is_completed = True
+        self.feature_task.save()
+        # The feature type and the tester position, nothing else.
+        self.assertEqual(analytics.refresh(), (False, 2))
+        task_types = self.report(analytics.by_task_type(), "task_type_id")
+        self.assertEqual(task_types[self.feature.pk]["completed_tasks"], 1)
+        self.assertEqual(task_types[self.bug.pk]["tasks"], 2)
+        positions = self.report(analytics.by_position(), "position_id")
+        self.assertEqual(positions[self.tester.pk]["completed_tasks"], 1)
+        self.assertEqual(positions[self.developer.pk]["tasks"], 2)
+
+        # A worker moving counts against both positions.
+        self.age_everything()
+        self.other.position = self.developer
+        self.other.save()
+        self.assertEqual(analytics.refresh(), (False, 1))
+        positions = self.report(analytics.by_position(), "position_id")
+        self.assertEqual(positions[self.developer.pk]["tasks"], 4)
+        self.assertNotIn(self.tester.pk, positions)
+
+        self.age_everything()
+        self.user.delete()
+        self.assertEqual(analytics.refresh(), (False, 1))
+        positions = self.report(analytics.by_position(), "position_id")
+        self.assertEqual(positions[self.developer.pk]["tasks"], 2)
+
+    def test_new_day_recounts_everything(self):
+        analytics.refresh()
+        self.age_everything()
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        self.assertEqual(analytics.refresh(today=tomorrow), (True, 4))
+        task_types = self.report(analytics.by_task_type(), "task_type_id")
+        self.assertEqual(task_types[self.bug.pk]["overdue_tasks"], 1)
+        self.assertEqual(task_types[self.feature.pk]["overdue_tasks"], 1)
+
+    def test_page_reads_the_rollup_only(self):
+        analytics.refresh()
+        url = reverse("task-manager:workload-analytics")
+        # The session, the user, the checkpoint and one query per report.
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+        self.assertContains(response, "Analyst Developer")
+        self.assertContains(response, "Analytics Feature")
+        self.assertContains(response, "Urgent")
+        self.assertEqual(len(response.context["priorities"]), 2)
+
+    def test_report_command(self):
+        out = io.StringIO()
+        call_command("workload_report", "--full", stdout=out)
+        output = out.getvalue()
+        self.assertIn("Full refresh wrote 4 rollup rows", output)
+        self.assertIn("Analytics Bug", output)
+        self.assertIn("Urgent", output)
+        self.assertIn("50.0%", output)
+        out = io.StringIO()
+        call_command("workload_report", stdout=out)
+        self.assertIn("Incremental refresh", out.getvalue())
@@ -0,0 +1,217 @@
+import csv
+import itertools
+import json
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from task_manager import counters, dashboard, deadlines, search, versions
+from task_manager.models import Task, TaskType
+
+FIELDS = [
+    "name",
+    "description",
+    "deadline",
+    "is_completed",
+    "priority",
+    "task_type",
+    "created_by",
+    "assignees",
+]
+ASSIGNEE_SEPARATOR = "|"
+
+
+def iter_task_records(queryset, chunk_size=2000):
+    rows = queryset.order_by("pk").values_list(
+        "pk",
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "priority",
+        "task_type__name",
+        "created_by__username",
+    )
+    through = Task.assignees.through
+    last_pk = 0
+    while True:
+        chunk = list(rows.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        last_pk = chunk[-1][0]
+        assignees = defaultdict(list)
+        for task_id, username in (
+            through.objects.filter(task_id__in=[row[0] for row in chunk])
+            .order_by("task_id", "worker_id")
+            .values_list("task_id", "worker__username")
+        ):
+            assignees[task_id].append(username)
+        for row in chunk:
+            yield dict(zip(FIELDS, row[1:]), assignees=assignees[row[0]])
+
+
+def write_jsonl(records, stream):
+    for record in records:
+        stream.write(json.dumps(record, cls=DjangoJSONEncoder) + "\n")
+
+
+def write_csv(records, stream):
+    writer = csv.DictWriter(stream, fieldnames=FIELDS)
+    writer.writeheader()
+    for record in records:
+        writer.writerow(
+            dict(
+                record,
+                assignees=ASSIGNEE_SEPARATOR.join(record["assignees"])
+            )
+        )
+
+
+def read_jsonl(stream):
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        row["is_completed"] = row.get("is_completed", "").lower() in (
+            "1", "true", "yes"
+        )
+        row["assignees"] = [
+            username
+            for username in row.get("assignees", "").split(
+                ASSIGNEE_SEPARATOR
+            )
+            if username
+        ]
+        yield row
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+
+class LookupCache:
+    def __init__(self, queryset, field, create_missing=False):
+        self.queryset = queryset
+        self.field = field
+        self.create_missing = create_missing
+        self.pks = {}
+
+    def load(self, keys):
+        missing = {key for key in keys if key and key not in self.pks}
+        if not missing:
+            return
+        if self.create_missing:
+            self.queryset.bulk_create(
+                [self.queryset.model(**{self.field: key}) for key in missing],
+                ignore_conflicts=True
+            )
+        self.pks.update(
+            self.queryset.filter(**{f"{self.field}__in": missing})
+            .values_list(self.field, "pk")
+        )
+
+    def get(self, key):
+        return self.pks.get(key)
+
+
+class TaskImporter:
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.task_types = LookupCache(
+            TaskType.objects.all(), "name", create_missing=True
+        )
+        self.workers = LookupCache(get_user_model().objects.all(), "username")
+        self.touched_workers = set()
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+
+    def skip(self, name, reason):
+        self.skipped += 1
+        if len(self.errors) < 100:
+            self.errors.append(f"{name}: {reason}")
+
+    def build(self, record):
+        task = Task(
+            name=record.get("name") or "",
+            description=record.get("description") or "",
+            deadline=record.get("deadline"),
+            is_completed=bool(record.get("is_completed")),
+            priority=record.get("priority") or "medium",
+            task_type_id=self.task_types.get(record.get("task_type")),
+            created_by_id=self.workers.get(record.get("created_by")),
+        )
+        task.full_clean(
+            exclude=["created_by", "search_vector"],
+            validate_unique=False,
+            validate_constraints=False
+        )
+        return task
+
+    def import_batch(self, records):
+        self.task_types.load(record.get("task_type") for record in records)
+        self.workers.load(
+            itertools.chain.from_iterable(
+                [record.get("created_by"), *record.get("assignees", [])]
+                for record in records
+            )
+        )
+        existing = set(
+            Task.objects.filter(
+                name__in=[record.get("name") for record in records]
+            ).values_list("name", flat=True)
+        )
+
+        tasks, assignees = [], []
+        for record in records:
+            name = record.get("name")
+            if name in existing:
+                self.skip(name, "already exists")
+                continue
+            try:
+                tasks.append(self.build(record))
+            except ValidationError as error:
+                self.skip(name, "; ".join(
+                    f"{field}: {' '.join(messages)}"
+                    for field, messages in error.message_dict.items()
+                ))
+                continue
+            existing.add(name)
+            assignees.append([
+                self.workers.get(username)
+                for username in record.get("assignees", [])
+                if self.workers.get(username)
+            ])
+
+        through = Task.assignees.through
+        with transaction.atomic():
+            tasks = Task.objects.bulk_create(tasks)
+            through.objects.bulk_create(
+                [
+                    through(task_id=task.pk, worker_id=worker_id)
+                    for task, worker_ids in zip(tasks, assignees)
+                    for worker_id in set(worker_ids)
+                ],
+                ignore_conflicts=True
+            )
+            search.get_backend().index([task.pk for task in tasks])
+            deadlines.invalidate(task.deadline for task in tasks)
+        for worker_ids in assignees:
+            self.touched_workers.update(worker_ids)
+        self.created += len(tasks)
+
+    def run(self, records):
+        records = iter(records)
+        while batch := list(itertools.islice(records, self.batch_size)):
+            self.import_batch(batch)
+        # bulk_create skips the signals that maintain derived state.
+        counters.recount(self.touched_workers)
+        versions.bump("task", "tasktype")
+        dashboard.invalidate()
+        return self.created
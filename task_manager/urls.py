@@ -1,22 +1,47 @@
 from django.urls import path
 
+from task_manager.api import (
+    ApiCollectionView,
+    ApiDetailView,
+    PositionResource,
+    TaskResource,
+    TaskTypeResource,
+    WorkerResource
+)
 from task_manager.views import (
+    AsyncIndex,
+    AsyncTaskDetailView,
+    AsyncTaskListView,
+    AsyncTaskTypeDetailView,
+    AsyncWorkerDetailView,
     Index,
     TaskCreateView,
     TaskUpdateView,
     TaskDetailView,
     TaskDeleteView,
     TaskListView,
+    TaskBulkActionView,
+    TaskBoardColumnView,
+    TaskBoardView,
+    TaskCalendarDayView,
+    TaskCalendarView,
+    TaskCalendarWeekView,
+    TaskExportView,
+    TaskHistoryView,
+    TaskSearchView,
     WorkersListView,
     WorkerCreateView,
     WorkerUpdateView,
+    WorkerActivityView,
     WorkerDetailView,
     WorkerDeleteView,
+    WorkloadAnalyticsView,
     TaskTypeListView,
     TaskTypeDetailView,
     TaskTypeUpdateView,
     TaskTypeDeleteView,
-    logout_confirmation
+    logout_confirmation,
+    metrics_endpoint
 )
 
 urlpatterns = [
@@ -26,6 +51,51 @@ urlpatterns = [
         TaskListView.as_view(),
         name="user-tasks"
     ),
+    path(
+        "tasks/bulk/",
+        TaskBulkActionView.as_view(),
+        name="task-bulk-action"
+    ),
+    path(
+        "tasks/export/",
+        TaskExportView.as_view(),
+        name="user-tasks-export"
+    ),
+    path(
+        "tasks/board/",
+        TaskBoardView.as_view(),
+        name="task-board"
+    ),
+    path(
+        "tasks/board/<str:state>/<str:priority>/",
+        TaskBoardColumnView.as_view(),
+        name="task-board-column"
+    ),
+    path(
+        "tasks/calendar/",
+        TaskCalendarView.as_view(),
+        name="task-calendar"
+    ),
+    path(
+        "tasks/calendar/<int:year>/<int:month>/",
+        TaskCalendarView.as_view(),
+        name="task-calendar-month"
+    ),
+    path(
+        "tasks/calendar/<int:year>/week/<int:week>/",
+        TaskCalendarWeekView.as_view(),
+        name="task-calendar-week"
+    ),
+    path(
+        "tasks/calendar/<int:year>/<int:month>/<int:day>/",
+        TaskCalendarDayView.as_view(),
+        name="task-calendar-day"
+    ),
+    path(
+        "tasks/search/",
+        TaskSearchView.as_view(),
+        name="task-search"
+    ),
     path(
         "tasks/create/",
         TaskCreateView.as_view(),
@@ -36,6 +106,11 @@ urlpatterns = [
         TaskDetailView.as_view(),
         name="task-detail"
     ),
+    path(
+        "tasks/<int:pk>/history/",
+        TaskHistoryView.as_view(),
+        name="task-history"
+    ),
     path(
         "tasks/<int:pk>/update/",
         TaskUpdateView.as_view(),
@@ -46,6 +121,11 @@ urlpatterns = [
         TaskDeleteView.as_view(),
         name="task-delete"
     ),
+    path(
+        "analytics/",
+        WorkloadAnalyticsView.as_view(),
+        name="workload-analytics"
+    ),
     path(
         "workers/",
         WorkersListView.as_view(),
@@ -61,6 +141,11 @@ urlpatterns = [
         WorkerDetailView.as_view(),
         name="worker-detail"
     ),
+    path(
+        "workers/<int:pk>/activity/",
+        WorkerActivityView.as_view(),
+        name="worker-activity"
+    ),
     path(
         "workers/<int:pk>/update/",
         WorkerUpdateView.as_view(),
@@ -96,6 +181,53 @@ urlpatterns = [
         logout_confirmation,
         name="logout-confirmation"
     ),
+    path("metrics/", metrics_endpoint, name="metrics"),
 ]
 
+# Async variants of the read-only pages; see AsyncIndex.
+urlpatterns += [
+    path("async/", AsyncIndex.as_view(), name="async-index"),
+    path(
+        "async/tasks/",
+        AsyncTaskListView.as_view(),
+        name="async-user-tasks"
+    ),
+    path(
+        "async/tasks/<int:pk>/",
+        AsyncTaskDetailView.as_view(),
+        name="async-task-detail"
+    ),
+    path(
+        "async/workers/<int:pk>/",
+        AsyncWorkerDetailView.as_view(),
+        name="async-worker-detail"
+    ),
+    path(
+        "async/tasktypes/<int:pk>/",
+        AsyncTaskTypeDetailView.as_view(),
+        name="async-task-type-detail"
+    ),
+]
+
+api_resources = [
+    ("tasks", "task", TaskResource()),
+    ("task-types", "task-type", TaskTypeResource()),
+    ("workers", "worker", WorkerResource()),
+    ("positions", "position", PositionResource()),
+]
+
+for prefix, name, resource in api_resources:
+    urlpatterns += [
+        path(
+            f"api/{prefix}/",
+            ApiCollectionView.as_view(resource=resource),
+            name=f"api-{name}-list"
+        ),
+        path(
+            f"api/{prefix}/<int:pk>/",
+            ApiDetailView.as_view(resource=resource),
+            name=f"api-{name}-detail"
+        ),
+    ]
+
 app_name = "task-manager"
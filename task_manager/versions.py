@@ -0,0 +1,60 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from task_manager.models import ResourceVersion, Task, TaskType
+
+
+def bump(*names):
+    # Every write of a model bumps the same row. Deferred to after the
+    # commit, the UPDATE runs on its own, so writers never wait on each
+    # other's open transactions for the row lock.
+    transaction.on_commit(partial(_bump, names))
+
+
+def _bump(names):
+    updated = ResourceVersion.objects.filter(name__in=names).update(
+        version=F("version") + 1
+    )
+    if updated < len(names):
+        ResourceVersion.objects.bulk_create(
+            [ResourceVersion(name=name, version=1) for name in names],
+            ignore_conflicts=True
+        )
+
+
+def current(*names):
+    versions = dict(
+        ResourceVersion.objects.filter(name__in=names)
+        .values_list("name", "version")
+    )
+    return tuple(versions.get(name, 0) for name in names)
+
+
+def bump_tasks(task_ids):
+    # Invalidates the cached task cards and the conditional GETs of the
+    # task pages after writes that skip Task.save.
+    return Task.objects.filter(pk__in=task_ids).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+
+
+def touch(model, pks):
+    # Moves updated_at forward without saving, so no signals fire.
+    return model.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+
+
+def touch_task_listings(task_ids):
+    # Worker and task type pages take their validator from the newest
+    # task they list (see ConditionalGetMixin.listed_tasks), which only
+    # misses tasks leaving the list; for those the owner's updated_at has
+    # to move. Call it before deleting the tasks.
+    through = Task.assignees.through
+    touch(
+        get_user_model(),
+        through.objects.filter(task_id__in=task_ids).values("worker_id")
+    )
+    touch(TaskType, Task.objects.filter(pk__in=task_ids).values("task_type"))
@@ -1,34 +1,74 @@
+import asyncio
+import csv
+import itertools
+from datetime import date, timedelta
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.db.models import Count
-from django.shortcuts import redirect, render
-from django.urls import reverse_lazy
+from django.core.exceptions import PermissionDenied
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import (
+    aget_object_or_404,
+    get_object_or_404,
+    redirect,
+    render
+)
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
 from django.views import generic
-
+from django.views.generic.detail import SingleObjectMixin
+from django.views.generic.list import MultipleObjectMixin
+
+from task_manager import (
+    analytics,
+    board,
+    bulk,
+    counters,
+    dashboard,
+    deadlines,
+    events,
+    metrics
+)
 from task_manager.forms import (
+    TaskBulkActionForm,
     TaskForm,
     WorkerCreationForm,
     TaskTypeForm,
     WorkerUpdateForm
 )
-from task_manager.models import Task, TaskType, Worker
-from task_manager.mixins import QuerySetOptimizeMixin
+from task_manager.models import (
+    Task,
+    TaskDigest,
+    TaskEvent,
+    TaskType,
+    Worker,
+    WorkloadCheckpoint
+)
+from task_manager.mixins import (
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    CursorPaginationMixin,
+    QuerySetOptimizeMixin,
+    UserTaskFilterMixin
+)
+from task_manager.pagination import CursorPaginator
+from task_manager.search import search_tasks
 
 User = get_user_model()
 
 
 class Index(generic.TemplateView):
     template_name = "task_manager/index.html"
+    query_budget = 5
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["tasks"] = Task.objects.order_by("deadline")[:10]
+        context["tasks"] = dashboard.nearest_tasks()
         context["task_types"] = TaskType.objects.all()[:10]
-        context["team_members"] = (
-            User.objects.annotate(task_count=Count("tasks"))
-            .order_by("-task_count")[:10]
-        )
+        context["team_members"] = dashboard.team_members()
         return context
 
 
@@ -44,15 +84,32 @@ class TaskCreateView(LoginRequiredMixin, generic.CreateView):
         return reverse_lazy("task-manager:user-tasks")
 
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskDetailView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    generic.DetailView
+):
     model = Task
-    select_related_fields = ["assignees", "task_type", "created_by"]
+    query_budget = 6
+    select_related_fields = ["task_type"]
+    prefetch_related_fields = [
+        Prefetch("assignees", queryset=User.objects.only("pk"))
+    ]
+    only_fields = [
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "created_by",
+        "task_type__name",
+    ]
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
-        if request.user in self.object.assignees.all():
+        if self.object.assignees.filter(pk=request.user.pk).exists():
             self.object.is_completed = True
-            self.object.save()
+            self.object.save(update_fields=["is_completed"])
             return redirect("task-manager:task-detail", pk=self.object.pk)
         else:
             messages.error(
@@ -62,18 +119,48 @@ class TaskDetailView(LoginRequiredMixin, generic.DetailView):
             return redirect("task-manager:task-detail", pk=self.object.pk)
 
 
-class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
-    model = Task
-    form_class = TaskForm
+class TaskBulkActionView(LoginRequiredMixin, generic.FormView):
+    form_class = TaskBulkActionForm
+    http_method_names = ["post"]
     success_url = reverse_lazy("task-manager:user-tasks")
 
     def form_valid(self, form):
-        task = form.save(commit=False)
-        task.created_by = self.request.user
-        task.save()
-        form.save_m2m()
+        action = form.cleaned_data["action"]
+        task_ids = form.cleaned_data["tasks"]
+        permitted = bulk.permitted_task_ids(
+            self.request.user, task_ids, action
+        )
+        if permitted != set(task_ids):
+            messages.error(
+                self.request,
+                "You don't have permission to change some of these tasks."
+            )
+            return redirect(self.success_url)
+
+        bulk.run(
+            action,
+            task_ids,
+            priority=form.cleaned_data["priority"],
+            worker_ids=[
+                worker.pk for worker in form.cleaned_data["workers"]
+            ]
+        )
+        messages.success(
+            self.request,
+            f"{bulk.ACTIONS[action]}: {len(task_ids)} tasks updated."
+        )
         return super().form_valid(form)
 
+    def form_invalid(self, form):
+        messages.error(self.request, "Select tasks and a valid action.")
+        return redirect(self.success_url)
+
+
+class TaskUpdateView(LoginRequiredMixin, generic.UpdateView):
+    model = Task
+    form_class = TaskForm
+    success_url = reverse_lazy("task-manager:user-tasks")
+
 
 class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Task
@@ -83,43 +170,348 @@ class TaskDeleteView(LoginRequiredMixin, generic.DeleteView):
 class TaskListView(
     LoginRequiredMixin,
     QuerySetOptimizeMixin,
+    UserTaskFilterMixin,
+    CursorPaginationMixin,
     generic.ListView
 ):
     model = Task
     template_name = "task_manager/user_task_list.html"
     context_object_name = "tasks"
-    select_related_fields = ["task_type", "created_by"]
-    prefetch_related_fields = ["assignees"]
+    paginate_by = 10
+    query_budget = 7
+    select_related_fields = ["task_type"]
+    only_fields = [
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "version",
+        "created_by",
+        "task_type__name",
+    ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["task_type_name"] = self.request.GET.get("task_type_name", "")
+        context["bulk_form"] = TaskBulkActionForm()
+        context["digest"] = TaskDigest.objects.filter(
+            worker=self.request.user
+        ).first()
+        return context
+
+
+class TaskHistoryView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
+    model = TaskEvent
+    template_name = "task_manager/task_history.html"
+    context_object_name = "events"
+    paginate_by = 25
+    query_budget = 5
+    select_related_fields = ["actor"]
+    only_fields = [
+        "kind",
+        "changes",
+        "created_at",
+        "task",
+        "actor__username",
+        "actor__first_name",
+        "actor__last_name",
+    ]
 
     def get_queryset(self):
-        queryset = (
-            super().get_queryset()
-            .prefetch_related("assignees")
-            .filter(assignees=self.request.user)
+        return super().get_queryset().filter(task_id=self.kwargs["pk"])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # The history outlives the task, so a deleted one is not a 404.
+        context["task"] = Task.objects.only("name").filter(
+            pk=self.kwargs["pk"]
+        ).first()
+        context["task_id"] = self.kwargs["pk"]
+        events.attach_workers(context["events"])
+        return context
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class TaskExportView(
+    LoginRequiredMixin,
+    UserTaskFilterMixin,
+    MultipleObjectMixin,
+    generic.View
+):
+    model = Task
+    chunk_size = 2000
+    columns = [
+        ("name", "Name"),
+        ("task_type__name", "Task type"),
+        ("priority", "Priority"),
+        ("deadline", "Deadline"),
+        ("is_completed", "Completed"),
+        ("created_by__username", "Created by"),
+        ("description", "Description"),
+    ]
+
+    def get(self, request, *args, **kwargs):
+        rows = (
+            self.get_queryset()
+            .values_list(*(field for field, _ in self.columns))
+            .iterator(chunk_size=self.chunk_size)
+        )
+        writer = csv.writer(Echo())
+        response = StreamingHttpResponse(
+            (
+                writer.writerow(row)
+                for row in itertools.chain(
+                    [[title for _, title in self.columns]], rows
+                )
+            ),
+            content_type="text/csv"
         )
+        response["Content-Disposition"] = 'attachment; filename="tasks.csv"'
+        return response
 
-        task_type_name = self.request.GET.get("task_type_name")
-        if task_type_name:
-            queryset = (
-                queryset.filter(task_type__name__icontains=task_type_name)
-            )
 
-        return queryset
+class TaskSearchView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    generic.ListView
+):
+    model = Task
+    template_name = "task_manager/task_search.html"
+    context_object_name = "tasks"
+    paginate_by = 20
+    query_budget = 7
+    select_related_fields = ["task_type"]
+    only_fields = [
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "task_type__name",
+    ]
+
+    def shape_queryset(self, queryset):
+        query = self.request.GET.get("q", "").strip()
+        if not query:
+            return queryset.none()
+        return search_tasks(query, super().shape_queryset(queryset))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context["query"] = self.request.GET.get("q", "")
+        return context
+
+
+class TaskBoardView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    UserTaskFilterMixin,
+    generic.ListView
+):
+    model = Task
+    template_name = "task_manager/task_board.html"
+    cards_per_column = 10
+    query_budget = 4
+    select_related_fields = ["task_type"]
+    prefetch_related_fields = [
+        Prefetch(
+            "assignees",
+            queryset=User.objects.only("username", "first_name", "last_name")
+        ),
+    ]
+    only_fields = [
+        "name",
+        "deadline",
+        "priority",
+        "is_completed",
+        "task_type__name",
+    ]
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["columns"] = board.columns(
+            self.object_list, self.cards_per_column
+        )
         context["task_type_name"] = self.request.GET.get("task_type_name", "")
         return context
 
 
-class WorkersListView(LoginRequiredMixin, generic.ListView):
+# The rest of one board column, rendered as a fragment the board appends.
+class TaskBoardColumnView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    UserTaskFilterMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
+    model = Task
+    template_name = "task_manager/task_board_column.html"
+    context_object_name = "cards"
+    paginate_by = TaskBoardView.cards_per_column
+    query_budget = 4
+    cursor_ordering = board.ORDERING
+    select_related_fields = TaskBoardView.select_related_fields
+    prefetch_related_fields = TaskBoardView.prefetch_related_fields
+    only_fields = TaskBoardView.only_fields
+
+    def get_queryset(self):
+        state, priority = self.kwargs["state"], self.kwargs["priority"]
+        if state not in board.STATES or (
+            priority not in dict(Task.PRIORITY_CHOICES)
+        ):
+            raise Http404("No such board column.")
+        return board.column_queryset(super().get_queryset(), state, priority)
+
+
+class TaskCalendarView(LoginRequiredMixin, generic.TemplateView):
+    template_name = "task_manager/task_calendar.html"
+    query_budget = 3
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["today"] = timezone.localdate()
+        context.update(self.get_calendar(context["today"]))
+        return context
+
+    def get_calendar(self, today):
+        year = self.kwargs.get("year", today.year)
+        month = self.kwargs.get("month", today.month)
+        if not 1 <= month <= 12 or not date.min.year < year < date.max.year:
+            raise Http404("No such month.")
+        first = date(year, month, 1)
+        previous = first - timedelta(days=1)
+        following = first + timedelta(days=31)
+        return {
+            "weeks": deadlines.month(year, month, today),
+            "heading": first.strftime("%B %Y"),
+            "previous_url": reverse(
+                "task-manager:task-calendar-month",
+                args=[previous.year, previous.month]
+            ),
+            "next_url": reverse(
+                "task-manager:task-calendar-month",
+                args=[following.year, following.month]
+            ),
+        }
+
+
+class TaskCalendarWeekView(TaskCalendarView):
+    def get_calendar(self, today):
+        year, number = self.kwargs["year"], self.kwargs["week"]
+        try:
+            first = date.fromisocalendar(year, number, 1)
+            previous = (first - timedelta(days=7)).isocalendar()
+            following = (first + timedelta(days=7)).isocalendar()
+        except (ValueError, OverflowError):
+            raise Http404("No such week.")
+        return {
+            "weeks": deadlines.week(year, number),
+            "heading": f"Week {number}, {year}",
+            "previous_url": reverse(
+                "task-manager:task-calendar-week",
+                args=[previous.year, previous.week]
+            ),
+            "next_url": reverse(
+                "task-manager:task-calendar-week",
+                args=[following.year, following.week]
+            ),
+            "month_url": reverse(
+                "task-manager:task-calendar-month",
+                args=[first.year, first.month]
+            ),
+        }
+
+
+# The tasks due on one calendar day, rendered as a fragment the calendar
+# loads when the day is selected.
+class TaskCalendarDayView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
+    model = Task
+    template_name = "task_manager/task_calendar_day.html"
+    context_object_name = "tasks"
+    paginate_by = 20
+    query_budget = 3
+    cursor_ordering = deadlines.DAY_ORDERING
+    select_related_fields = ["task_type"]
+    only_fields = [
+        "name",
+        "deadline",
+        "priority",
+        "is_completed",
+        "task_type__name",
+    ]
+
+    def get_queryset(self):
+        try:
+            self.day = date(
+                self.kwargs["year"], self.kwargs["month"], self.kwargs["day"]
+            )
+        except ValueError:
+            raise Http404("No such day.")
+        return super().get_queryset().filter(deadline=self.day)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["day"] = self.day
+        return context
+
+
+# Team workload read from the rollup tables, which the job worker keeps
+# fresh; the page never aggregates tasks itself.
+class WorkloadAnalyticsView(LoginRequiredMixin, generic.TemplateView):
+    template_name = "task_manager/workload_analytics.html"
+    query_budget = 6
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["checkpoint"] = WorkloadCheckpoint.objects.first()
+        context["positions"] = analytics.by_position()
+        context["task_types"] = analytics.by_task_type()
+        context["priorities"] = [
+            {**row, "label": dict(Task.PRIORITY_CHOICES)[row["priority"]]}
+            for row in analytics.by_priority()
+        ]
+        return context
+
+
+class WorkersListView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
     model = User
     template_name = "task_manager/workers_list.html"
     context_object_name = "worker_list"
     paginate_by = 7
-
-    def get_queryset(self):
-        return User.objects.select_related("position").all()
+    query_budget = 5
+    cursor_ordering = ["username"]
+    select_related_fields = ["position"]
+    only_fields = [
+        "username",
+        "first_name",
+        "last_name",
+        "open_task_count",
+        "completed_task_count",
+        "position__name",
+    ]
+
+    def shape_queryset(self, queryset):
+        return super().shape_queryset(queryset).annotate(
+            overdue_task_count=counters.overdue_count()
+        )
 
 
 class WorkerCreateView(
@@ -147,18 +539,76 @@ class WorkerUpdateView(
         return self.request.user == worker or self.request.user.is_superuser
 
 
-class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
+class WorkerDetailView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    generic.DetailView
+):
     model = User
     template_name = "task_manager/worker_detail.html"
     context_object_name = "worker"
+    tasks_paginate_by = 10
+    query_budget = 7
+    listed_tasks = "tasks"
+    select_related_fields = ["position"]
+    only_fields = [
+        "username",
+        "first_name",
+        "last_name",
+        "email",
+        "position__name",
+    ]
+    task_fields = [
+        "name",
+        "description",
+        "deadline",
+        "is_completed",
+        "version",
+    ]
+
+    def get_tasks(self):
+        return Task.objects.filter(assignees=self.object).only(
+            *self.task_fields
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["tasks"] = (
-            Task.objects
-            .prefetch_related("assignees")
-            .filter(assignees=self.object)
+        paginator = CursorPaginator(self.get_tasks(), self.tasks_paginate_by)
+        page = paginator.get_page(self.request.GET.get("cursor"))
+        context["tasks"] = page.object_list
+        context["paginator"] = paginator
+        context["page_obj"] = page
+        context["is_paginated"] = page.has_other_pages()
+        return context
+
+
+class WorkerActivityView(
+    LoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    CursorPaginationMixin,
+    generic.ListView
+):
+    model = TaskEvent
+    template_name = "task_manager/worker_activity.html"
+    context_object_name = "events"
+    paginate_by = 25
+    query_budget = 6
+    prefetch_related_fields = [
+        Prefetch("task", queryset=Task.objects.only("name")),
+    ]
+    only_fields = ["kind", "changes", "created_at", "task", "actor"]
+
+    def get_queryset(self):
+        return super().get_queryset().filter(actor_id=self.kwargs["pk"])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["worker"] = get_object_or_404(
+            User.objects.only("username", "first_name", "last_name"),
+            pk=self.kwargs["pk"]
         )
+        events.attach_workers(context["events"])
         return context
 
 
@@ -177,19 +627,38 @@ class WorkerDeleteView(
         return self.request.user == worker or self.request.user.is_superuser
 
 
-class TaskTypeListView(generic.ListView):
+class TaskTypeListView(QuerySetOptimizeMixin, generic.ListView):
     model = TaskType
     template_name = "task_manager/tasktype_list.html"
     context_object_name = "task_type_list"
+    query_budget = 4
+    only_fields = ["name"]
 
 
-class TaskTypeDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskTypeDetailView(
+    LoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    generic.DetailView
+):
     model = TaskType
     template_name = "task_manager/tasktype_detail.html"
     context_object_name = "task_type"
-
-    def get_queryset(self):
-        return super().get_queryset().prefetch_related("tasks")
+    query_budget = 6
+    listed_tasks = "tasks"
+    prefetch_related_fields = [
+        Prefetch(
+            "tasks",
+            queryset=Task.objects.only(
+                "name",
+                "description",
+                "deadline",
+                "is_completed",
+                "version",
+                "task_type",
+            ).order_by("-deadline", "id")
+        )
+    ]
 
 
 class TaskTypeUpdateView(LoginRequiredMixin, generic.UpdateView):
@@ -207,5 +676,149 @@ class TaskTypeDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("task-manager:task-type-list")
 
 
+# Async variants of the read-only pages, for deployments under uvicorn.
+# They resolve everything the templates need up front with the async ORM,
+# so rendering never queries the database.
+class AsyncIndex(generic.base.TemplateResponseMixin, generic.View):
+    template_name = "task_manager/index.html"
+    query_budget = 5
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        tasks, task_types, team_members = await asyncio.gather(
+            dashboard.anearest_tasks(),
+            self.task_types(),
+            dashboard.ateam_members(),
+        )
+        return self.render_to_response({
+            "tasks": tasks,
+            "task_types": task_types,
+            "team_members": team_members,
+        })
+
+    async def task_types(self):
+        return [task_type async for task_type in TaskType.objects.all()[:10]]
+
+
+class AsyncTaskListView(
+    AsyncLoginRequiredMixin,
+    QuerySetOptimizeMixin,
+    UserTaskFilterMixin,
+    CursorPaginationMixin,
+    MultipleObjectMixin,
+    generic.base.TemplateResponseMixin,
+    generic.View
+):
+    model = Task
+    template_name = "task_manager/user_task_list.html"
+    paginate_by = 10
+    query_budget = 7
+    select_related_fields = TaskListView.select_related_fields
+    only_fields = TaskListView.only_fields
+
+    async def get(self, request, *args, **kwargs):
+        paginator, page, tasks, is_paginated = (
+            await self.apaginate_queryset(
+                self.get_queryset(), self.paginate_by
+            )
+        )
+        return self.render_to_response({
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": is_paginated,
+            "object_list": tasks,
+            "tasks": tasks,
+            "task_type_name": request.GET.get("task_type_name", ""),
+            "bulk_form": TaskBulkActionForm(),
+            "digest": await TaskDigest.objects.filter(
+                worker=request.user
+            ).afirst(),
+        })
+
+
+class AsyncTaskDetailView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    SingleObjectMixin,
+    generic.base.TemplateResponseMixin,
+    generic.View
+):
+    model = Task
+    template_name = "task_manager/task_detail.html"
+    query_budget = 6
+    select_related_fields = TaskDetailView.select_related_fields
+    prefetch_related_fields = TaskDetailView.prefetch_related_fields
+    only_fields = TaskDetailView.only_fields
+
+    async def get(self, request, pk):
+        task = await aget_object_or_404(self.get_queryset(), pk=pk)
+        return self.render_to_response({"object": task, "task": task})
+
+
+class AsyncWorkerDetailView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    SingleObjectMixin,
+    generic.base.TemplateResponseMixin,
+    generic.View
+):
+    model = User
+    template_name = "task_manager/worker_detail.html"
+    tasks_paginate_by = 10
+    query_budget = 7
+    listed_tasks = "tasks"
+    select_related_fields = WorkerDetailView.select_related_fields
+    only_fields = WorkerDetailView.only_fields
+    task_fields = WorkerDetailView.task_fields
+    get_tasks = WorkerDetailView.get_tasks
+
+    async def get(self, request, pk):
+        self.object = worker = await aget_object_or_404(
+            self.get_queryset(), pk=pk
+        )
+        paginator = CursorPaginator(self.get_tasks(), self.tasks_paginate_by)
+        page = await paginator.aget_page(request.GET.get("cursor"))
+        return self.render_to_response({
+            "object": worker,
+            "worker": worker,
+            "tasks": page.object_list,
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+        })
+
+
+class AsyncTaskTypeDetailView(
+    AsyncLoginRequiredMixin,
+    ConditionalGetMixin,
+    QuerySetOptimizeMixin,
+    SingleObjectMixin,
+    generic.base.TemplateResponseMixin,
+    generic.View
+):
+    model = TaskType
+    template_name = "task_manager/tasktype_detail.html"
+    query_budget = 6
+    listed_tasks = "tasks"
+    prefetch_related_fields = TaskTypeDetailView.prefetch_related_fields
+
+    async def get(self, request, pk):
+        task_type = await aget_object_or_404(self.get_queryset(), pk=pk)
+        return self.render_to_response(
+            {"object": task_type, "task_type": task_type}
+        )
+
+
 def logout_confirmation(request):
     return render(request, "registration/logout_confirmation.html")
+
+
+def metrics_endpoint(request):
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(
+        metrics.exposition(),
+        content_type="text/plain; version=0.0.4; charset=utf-8"
+    )